@@ -0,0 +1,309 @@
+"""
+Complexity regression check.
+
+Runs key operations (the load of each section, batch citations, type
+grouping, author lookup, rendering) on synthetic CVs of doubling sizes,
+fits the growth exponent of each operation (time ~ size ** exponent) and
+fails when an exponent exceeds the declared complexity of the operation.
+Each size is measured in several fresh interpreters and the median timing
+is kept, so that one slow process does not bend the fit.
+
+Each run can be recorded, with its commit, in a versioned baseline file
+(benchmarks/complexity_baseline.json), and compared with the recorded runs
+to show how the exponents and timings drift across commits.
+
+Usage: python benchmarks/complexity.py [--start N] [--steps N] [--trials N]
+       [--record] [--compare] [--baseline FILE]
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from scaling import timed
+from synthetic import write_cv
+
+from cvprocessor.lazy import LazyModule
+
+# Imported by measure, in the interpreter loading the CV.
+cv_module = LazyModule("cvprocessor.cv")
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "complexity_baseline.json")
+
+# Version of the baseline file format: 2 records the trials per size.
+BASELINE_VERSION = 2
+
+# Operation: declared growth exponent. load_<section> is the load of a
+# section, the other operations run over the whole CV.
+COMPLEXITY = {
+    "load_publications": 1,
+    "load_authors": 1,
+    "load_institutes": 1,
+    "load_education": 1,
+    "load_experience": 1,
+    "load_teaching": 1,
+    "load_supervision": 1,
+    "load_grants_awards": 1,
+    "load_news": 1,
+    "load_software": 1,
+    "load_skills": 1,
+    "load_service": 1,
+    "load_memberships": 1,
+    "load_presentations": 1,
+    "link": 1,
+    "citations": 1,
+    "types_ordered": 1,
+    "author_lookup": 1,
+    "str": 1,
+}
+
+# Margin above the declared exponent before an operation fails: halfway to
+# the next power, above the noise of the timings, the log factors of sorts
+# and indexes and the cache misses of larger CVs.
+TOLERANCE = 0.5
+
+# Series whose smallest timing is below NOISE_SECONDS are dominated by
+# timer and scheduling noise at the small sizes, and get NOISY_TOLERANCE.
+NOISE_SECONDS = 0.01
+NOISY_TOLERANCE = 0.75
+
+# Exponent change between runs reported as drift: the exponents of the
+# same code vary by up to about 0.3 between runs on a busy machine.
+DRIFT = 0.4
+
+# Operations faster than this at the largest size are not checked: their
+# timings are dominated by noise.
+MIN_SECONDS = 0.005
+
+
+def get_sizes(size):
+    """
+    Get the Generator sizes of a CV: every section grows with size.
+    """
+    return {"publications": size, "authors": max(2, size // 10),
+            "institutes": max(2, size // 25), "entries": max(2, size // 20)}
+
+
+def measure(filename, repeat=3):
+    """
+    Time the operations on a CV file, in seconds.
+    """
+    seconds = {}
+    for _ in range(repeat):
+        cv = cv_module.CV(filename, engine="xlsx", stats=True)
+        for section in cv.load_stats.sections.values():
+            name = section.name if section.name == "link" else f"load_{section.name}"
+            seconds[name] = min(seconds.get(name, float("inf")), section.seconds)
+    publications = cv.academic.publications
+    titles = [publication.details.get_title() for publication in publications]
+    authors = cv.personal.authors
+    author_ids = [author.get_id() for author in authors.authors]
+    seconds["citations"] = timed(
+        lambda: [cv.get_publications_apa_citation(title) for title in titles], repeat)
+    seconds["types_ordered"] = timed(publications.get_types_ordered, repeat)
+    seconds["author_lookup"] = timed(
+        lambda: [authors.get_author(author_id) for author_id in author_ids], repeat)
+    seconds["str"] = timed(lambda: str(cv), repeat)
+    return {name: seconds[name] for name in COMPLEXITY if name in seconds}
+
+
+def fit_exponent(sizes, seconds):
+    """
+    Fit the exponent of seconds ~ size ** exponent by least squares on the
+    logarithms.
+    """
+    points = [(math.log(size), math.log(max(value, 1e-9)))
+              for size, value in zip(sizes, seconds)]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def measure_median(filename, repeat=3, trials=3):
+    """
+    Measure the operations on a CV file in trials fresh interpreters and
+    keep the median timing of each operation.
+    """
+    timings = {}
+    for _ in range(trials):
+        process = subprocess.run(
+            [sys.executable, __file__, "--measure", filename, "--repeat", str(repeat)],
+            capture_output=True, text=True, check=True)
+        for name, value in json.loads(process.stdout.splitlines()[-1]).items():
+            timings.setdefault(name, []).append(value)
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def run(start, steps, repeat=3, trials=3):
+    """
+    Measure the operations at start, 2 * start, ... and fit their exponents.
+    """
+    sizes = [start * 2 ** step for step in range(steps)]
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            filename = os.path.join(directory, f"cv-{size}.xlsx")
+            write_cv(filename, **get_sizes(size))
+            for name, value in measure_median(filename, repeat, trials).items():
+                timings.setdefault(name, []).append(value)
+    return {
+        "sizes": sizes,
+        "trials": trials,
+        "seconds": timings,
+        "exponents": {name: fit_exponent(sizes, values) for name, values in timings.items()},
+    }
+
+
+def get_tolerance(result, name):
+    """
+    Get the margin of an operation above its declared exponent.
+    """
+    return TOLERANCE if result["seconds"][name][0] >= NOISE_SECONDS else NOISY_TOLERANCE
+
+
+def exceeds(result, name):
+    """
+    Check whether an operation exceeds its declared complexity.
+    """
+    return (result["seconds"][name][-1] >= MIN_SECONDS
+            and result["exponents"][name] > COMPLEXITY[name] + get_tolerance(result, name))
+
+
+def check(result):
+    """
+    Get the (operation, exponent, declared) of the operations exceeding
+    their declared complexity.
+    """
+    return [(name, exponent, COMPLEXITY[name])
+            for name, exponent in result["exponents"].items() if exceeds(result, name)]
+
+
+def git_commit():
+    """
+    Get the short hash of the current commit, with a -dirty suffix when the
+    tree has changes, None outside a git checkout.
+    """
+    try:
+        process = subprocess.run(["git", "describe", "--always", "--dirty"],
+                                 capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def load_baseline(path):
+    """
+    Read the baseline file, an empty one if it does not exist.
+    """
+    if not os.path.exists(path):
+        return {"version": BASELINE_VERSION, "runs": []}
+    with open(path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version {baseline.get('version')} in {path}")
+    return baseline
+
+
+def record(result, path):
+    """
+    Append a run to the baseline file, replacing a run of the same commit.
+    """
+    baseline = load_baseline(path)
+    entry = {
+        "commit": git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        **result,
+    }
+    baseline["runs"] = [run_ for run_ in baseline["runs"]
+                        if entry["commit"] is None or run_["commit"] != entry["commit"]]
+    baseline["runs"].append(entry)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2)
+        file.write("\n")
+
+
+def report(result, out=sys.stdout):
+    """
+    Print the exponent and timings of each operation.
+    """
+    print("operation\tdeclared\texponent\t" + "\t".join(
+        f"n={size}" for size in result["sizes"]), file=out)
+    for name, declared in COMPLEXITY.items():
+        if name not in result["exponents"]:
+            continue
+        exponent = result["exponents"][name]
+        status = "FAIL" if exceeds(result, name) else "ok"
+        print(f"{name}\t{declared}\t{exponent:.2f} {status}\t" + "\t".join(
+            f"{value * 1000:.2f} ms" for value in result["seconds"][name]), file=out)
+
+
+def compare(result, baseline, out=sys.stdout):
+    """
+    Print the exponents of the recorded runs and of this one, one column per
+    run, flagging the operations whose exponent drifted since the last run.
+    Returns the operations which drifted.
+    """
+    runs = baseline["runs"]
+    print("operation\t" + "\t".join(run_["commit"] or "?" for run_ in runs)
+          + "\tcurrent\tdrift", file=out)
+    drifted = []
+    for name, exponent in result["exponents"].items():
+        previous = [run_["exponents"].get(name) for run_ in runs]
+        last = next((value for value in reversed(previous) if value is not None), None)
+        drift = "" if last is None else f"{exponent - last:+.2f}"
+        if last is not None and exponent - last > DRIFT:
+            drift += " DRIFT"
+            drifted.append(name)
+        print(f"{name}\t" + "\t".join("" if value is None else f"{value:.2f}"
+                                      for value in previous)
+              + f"\t{exponent:.2f}\t{drift}", file=out)
+    return drifted
+
+
+def main(argv=None):
+    """
+    Run the check; exit with 1 when an operation exceeds its complexity.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--start", type=int, default=2000,
+                        help="number of publications of the smallest CV")
+    parser.add_argument("--steps", type=int, default=4, help="number of doublings")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per operation, the best one is kept")
+    parser.add_argument("--trials", type=int, default=3,
+                        help="fresh interpreters per size, the median is kept")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--record", action="store_true",
+                        help="append this run to the baseline file")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare this run with the baseline file")
+    parser.add_argument("--measure", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.measure is not None:
+        print(json.dumps(measure(args.measure, args.repeat)))
+        return 0
+    result = run(args.start, args.steps, args.repeat, args.trials)
+    report(result)
+    if args.compare:
+        print()
+        compare(result, load_baseline(args.baseline))
+    if args.record:
+        record(result, args.baseline)
+    failures = check(result)
+    for name, exponent, declared in failures:
+        print(f"{name}: exponent {exponent:.2f} exceeds the declared {declared}",
+              file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Import-time budget check.
+
+Imports each module in a fresh interpreter with ``python -X importtime``,
+keeps the best cumulative time over several runs and fails when a module
+exceeds its budget or imports one of the heavy modules (pandas, numpy)
+that the package only loads on demand.
+
+Usage: python benchmarks/importtime.py [--runs N] [--scale X]
+"""
+import argparse
+import subprocess
+import sys
+
+# Module: budget in milliseconds for the cumulative import time.
+BUDGETS = {
+    "cvprocessor.cv": 150,
+    "cvprocessor.cli": 100,
+}
+
+# Modules which must not be imported by ``import <module>``.
+FORBIDDEN = ("pandas", "numpy")
+
+
+def measure(module):
+    """
+    Import the module in a fresh interpreter and return its cumulative
+    import time in milliseconds and the names of all imported modules.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True)
+    cumulative = None
+    imported = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative = int(cumulative_us) / 1000
+    return cumulative, imported
+
+
+def main(argv=None):
+    """
+    Check every module against its budget and return the exit status.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="runs per module, the best one is kept")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every budget, for slow machines")
+    args = parser.parse_args(argv)
+    failed = False
+    for module, budget in BUDGETS.items():
+        budget *= args.scale
+        best = None
+        imported = set()
+        for _ in range(args.runs):
+            elapsed, imported = measure(module)
+            best = elapsed if best is None else min(best, elapsed)
+        heavy = [name for name in FORBIDDEN if name in imported]
+        status = "ok"
+        if best > budget or heavy:
+            status = "FAIL"
+            failed = True
+        print(f"{status}\t{module}\t{best:.1f} ms (budget {budget:.0f} ms)"
+              + (f"\timports {', '.join(heavy)}" if heavy else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
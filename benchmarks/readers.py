@@ -0,0 +1,93 @@
+"""
+Reader engine comparison.
+
+Loads a CV workbook in a fresh interpreter with each reader engine and
+reports the cold-start wall time (imports included) and the peak resident
+set size of the process. Without a filename, a synthetic workbook with
+every sheet is generated (see synthetic.py); the sections of a workbook
+lacking some sheets, such as the sample cv.xlsx, are given with --sections.
+
+Usage: python benchmarks/readers.py [FILENAME] [--sections NAME [NAME ...]]
+       [--publications N] [--runs N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from scaling import get_sizes
+from synthetic import write_cv
+
+ENGINES = ("pandas", "xlsx")
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+from cvprocessor.cv import CV
+CV(sys.argv[1], engine=sys.argv[2], sections=json.loads(sys.argv[3]))
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"elapsed": elapsed, "peak_kb": peak,
+                  "pandas": "pandas" in sys.modules}))
+"""
+
+
+def measure(filename, engine, sections=None):
+    """
+    Load the CV in a fresh interpreter and return its wall time in seconds,
+    its peak RSS in kilobytes and whether pandas was imported.
+    """
+    process = subprocess.run(
+        [sys.executable, "-c", CHILD, filename, engine, json.dumps(sections)],
+        capture_output=True, text=True, check=False)
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()
+        raise RuntimeError(f"Loading {filename} with {engine} failed: "
+                           f"{error[-1] if error else process.returncode}")
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def compare(filename, sections=None, runs=3, out=sys.stdout):
+    """
+    Compare the reader engines on a workbook and print one line per engine.
+    """
+    for engine in ENGINES:
+        results = [measure(filename, engine, sections) for _ in range(runs)]
+        elapsed = min(result["elapsed"] for result in results)
+        peak = min(result["peak_kb"] for result in results)
+        print(f"{engine}\t{elapsed * 1000:.0f} ms\t{peak / 1024:.1f} MiB"
+              + ("\timports pandas" if results[0]["pandas"] else ""), file=out)
+
+
+def main(argv=None):
+    """
+    Compare the reader engines.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("filename", nargs="?", default=None,
+                        help="CV workbook (default: a synthetic workbook)")
+    parser.add_argument("--sections", nargs="+", default=None,
+                        help="sections to load (default: all)")
+    parser.add_argument("--publications", type=int, default=1000,
+                        help="publications of the synthetic workbook")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="runs per engine, the best one is kept")
+    args = parser.parse_args(argv)
+    try:
+        if args.filename is not None:
+            compare(args.filename, args.sections, args.runs)
+            return 0
+        with tempfile.TemporaryDirectory() as directory:
+            filename = write_cv(os.path.join(directory, "cv.xlsx"),
+                               **get_sizes(args.publications))
+            compare(filename, args.sections, args.runs)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
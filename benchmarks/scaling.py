@@ -0,0 +1,179 @@
+"""
+Scaling benchmark suite.
+
+Generates synthetic CV workbooks of several sizes (see synthetic.py) and, in
+a fresh interpreter for each size, times the load of each section, the APA
+citations and the query methods. Reports rows per second of each section,
+operations per second of the citations and queries, and the peak resident
+set size of the process.
+
+Usage: python benchmarks/scaling.py [--sizes N [N ...]] [--engine ENGINE]
+       [--columnar] [--json FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import write_cv
+
+from cvprocessor.lazy import LazyModule
+
+# Imported by measure, in the interpreter loading the CV.
+cv_module = LazyModule("cvprocessor.cv")
+
+# Number of publications of each benchmarked CV.
+SIZES = (1000, 5000, 20000)
+
+# Authors and institutes per publication, 5k authors and 2k institutes for
+# 50k publications.
+AUTHORS_RATIO = 0.1
+INSTITUTES_RATIO = 0.04
+
+
+def get_sizes(publications):
+    """
+    Get the Generator sizes of a CV with the given number of publications.
+    """
+    return {
+        "publications": publications,
+        "authors": max(10, int(publications * AUTHORS_RATIO)),
+        "institutes": max(5, int(publications * INSTITUTES_RATIO)),
+        "entries": min(1000, max(20, publications // 50)),
+    }
+
+
+def timed(function, repeat=1):
+    """
+    Call function repeat times and return the best wall time in seconds.
+    The garbage collector is disabled while timing, as timeit does: its full
+    collections walk every live object, so they cost more the larger the CV.
+    """
+    best = float("inf")
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+
+def run_queries(cv, repeat=5):
+    """
+    Time the query methods of a loaded CV, in calls per second.
+    """
+    publications = cv.academic.publications
+    first = publications.get_publications_by_index(0)
+    keyword = first.details.get_keywords().split(";")[0].strip()
+    author = first.get_auth_id_aff_id()[0].get_author_id()
+    queries = {
+        "query_type": lambda: publications.query(doc_type="Journal Article"),
+        "query_author": lambda: publications.query(author=author),
+        "query_keyword": lambda: publications.query(keyword=keyword),
+        "query_years": lambda: publications.query(year=(2010, 2020)),
+        "query_combined": lambda: publications.query(
+            doc_type="Journal Article", author=author, year=(2005, None)),
+        "types_ordered": publications.get_types_ordered,
+        "count_by_author": lambda: publications.get_num_publications_by_author(author),
+        "latest": lambda: publications.latest(20),
+        "timeline_active_on": lambda: cv.timeline.active_on("2015-06-01"),
+        "timeline_gaps": cv.timeline.gaps,
+    }
+    return {name: 1 / max(timed(query, repeat), 1e-9) for name, query in queries.items()}
+
+
+def measure(filename, engine, columnar, citations=200):
+    """
+    Load a CV and time its citations and queries. Run in a fresh interpreter
+    by main, so that the peak RSS is the one of this CV.
+    """
+    start = time.perf_counter()
+    cv = cv_module.CV(filename, engine=engine, columnar=columnar, stats=True)
+    seconds = time.perf_counter() - start
+    sections = {section.name: {"rows": section.rows, "seconds": section.seconds,
+                               "rows_per_second": section.get_rows_per_second()}
+                for section in cv.load_stats.sections.values()}
+    publications = cv.academic.publications
+    titles = [publications.get_publications_by_index(i).details.get_title()
+              for i in range(min(citations, publications.get_publications_count()))]
+    citation_seconds = timed(lambda: [cv.get_publications_apa_citation(title)
+                                      for title in titles])
+    return {
+        "load_seconds": seconds,
+        "sections": sections,
+        "citations_per_second": len(titles) / max(citation_seconds, 1e-9),
+        "queries_per_second": run_queries(cv),
+        "peak_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_size(directory, publications, engine, columnar):
+    """
+    Generate the CV of a size and measure it in a fresh interpreter.
+    """
+    extension = ".json" if engine == "json" else ".xlsx"
+    filename = os.path.join(directory, f"cv-{publications}{extension}")
+    write_cv(filename, **get_sizes(publications))
+    command = [sys.executable, __file__, "--measure", filename, "--engine", engine]
+    if columnar:
+        command.append("--columnar")
+    process = subprocess.run(command, capture_output=True, text=True, check=True)
+    result = json.loads(process.stdout.splitlines()[-1])
+    result["sizes"] = get_sizes(publications)
+    return result
+
+
+def report(results, out=sys.stdout):
+    """
+    Print the results, one block per size.
+    """
+    for result in results:
+        sizes = result["sizes"]
+        print(f"{sizes['publications']} publications, {sizes['authors']} authors, "
+              f"{sizes['institutes']} institutes: load {result['load_seconds'] * 1000:.0f} ms, "
+              f"peak {result['peak_kb'] / 1024:.1f} MiB", file=out)
+        for name, section in result["sections"].items():
+            print(f"  {name}\t{section['rows']} rows\t{section['seconds'] * 1000:.1f} ms\t"
+                  f"{section['rows_per_second']:.0f} rows/s", file=out)
+        print(f"  citations\t{result['citations_per_second']:.0f} /s", file=out)
+        for name, rate in result["queries_per_second"].items():
+            print(f"  {name}\t{rate:.0f} /s", file=out)
+
+
+def main(argv=None):
+    """
+    Run the benchmark at each size and print the report.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="numbers of publications")
+    parser.add_argument("--engine", choices=["pandas", "xlsx", "json"], default="xlsx")
+    parser.add_argument("--columnar", action="store_true")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    parser.add_argument("--measure", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.measure is not None:
+        print(json.dumps(measure(args.measure, args.engine, args.columnar)))
+        return 0
+    with tempfile.TemporaryDirectory() as directory:
+        results = [run_size(directory, size, args.engine, args.columnar)
+                   for size in args.sizes]
+    report(results)
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
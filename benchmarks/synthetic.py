@@ -0,0 +1,458 @@
+"""
+Synthetic CV workbooks.
+
+Writes a CV workbook with every sheet the loaders read, filled with random
+but well-formed rows: multi-range dates, author strings with affiliations,
+keywords, links and long abstracts. The number of publications, authors and
+institutes, and of the rows of the other sections, are parameters, so that
+the benchmarks can load CVs far larger than the sample cv.xlsx.
+
+The workbook is written with the standard library only (a minimal xlsx with
+inline strings), or as a JSON document.
+
+Usage: python benchmarks/synthetic.py OUTPUT [--publications N] [--authors N]
+       [--institutes N] [--entries N] [--seed N]
+"""
+import argparse
+import datetime
+import json
+import random
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "adaptive aware routing network networks wireless sensor software defined "
+    "energy efficient learning machine deep reinforcement distributed embedded "
+    "systems internet things edge computing control protocol optimization "
+    "framework scheduling resource management low power multihop mobile "
+    "secure scalable federated inference runtime industrial time series data "
+    "analysis model models approach evaluation performance latency throughput"
+).split()
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+DOCUMENT_TYPES = ("Journal Article", "Conference Paper", "Book Chapter",
+                  "Preprint", "Thesis")
+
+FIRST_NAMES = ("Ana", "Bo", "Carlos", "Dana", "Emil", "Fatima", "Guo", "Hana",
+               "Ivan", "Julia", "Kofi", "Lena", "Mateo", "Nora", "Omar", "Priya")
+
+LAST_NAMES = ("Andersen", "Baker", "Chen", "Diaz", "Eriksen", "Fischer", "Garcia",
+              "Hansen", "Ito", "Jensen", "Kumar", "Lopez", "Moreno", "Nielsen")
+
+# Sheet name: columns, in the order of the sample workbook.
+COLUMNS = {
+    "Intro": ["Welcome", "Short summary", "Tagline"],
+    "Research_Interests": ["Keywords", "Interests"],
+    "Education": ["Dates", "Degree", "Advisor ids", "Thesis", "Thesis Link",
+                  "Award", "Institution id"],
+    "References": ["Author id"],
+    "Supervision": ["Students", "Dates", "Thesis", "Degree", "Type",
+                    "Institution id", "Supervisor ids"],
+    "Experience": ["Dates", "Position", "Institution id", "Description",
+                   "Responsibilities", "Achievements"],
+    "Teaching": ["Dates", "Position", "Degree", "Course Link", "Type",
+                 "Institution id", "Supervisor ids", "Responsibilities"],
+    "Grants_awards": ["Dates", "Description", "Institution id", "Value"],
+    "Publications": ["Authors", "Title", "Dates", "Source", "Volume", "Issue",
+                     "Art. No.", "Page start", "Page end", "DOI", "PDF", "URL",
+                     "Document Type", "Code", "Slides", "Abstract", "Keywords",
+                     "JCR", "License", "Copyright"],
+    "Authors": ["id", "Name", "Lastname", "Preferred Name", "Alias", "Job Title",
+                "Website", "Affiliations", "Fingerprint", "Public Key", "Email",
+                "LinkedIn", "GitHub", "Google Scholar", "ORCID", "ResearchGate",
+                "Address", "Location", "Telephone"],
+    "Institutes": ["id", "Name", "Name Abbreviation", "Department",
+                   "Department Abbreviation", "Address", "Group",
+                   "Group Abbreviation", "City", "Country", "Website", "Coordinates"],
+    "Professional_services": ["Type", "Venue", "Link"],
+    "Skills": ["Type", "Skill", "Level"],
+    "Professional_memberships": ["Dates", "Membership"],
+    "Software": ["id", "Name", "Version", "Description", "Code", "Demo",
+                 "Website", "Summary", "License"],
+    "News": ["Date", "Title", "Description", "PDF", "Code", "DOI"],
+    "Presentations": ["Title", "Date", "Institution id", "Event", "Slides"],
+}
+
+
+class Generator:
+    """
+    A class to generate the rows of a synthetic CV, of the sizes given as
+    keyword arguments.
+
+    Attributes:
+    publications (int): The number of publications.
+    authors (int): The number of authors.
+    institutes (int): The number of institutes.
+    entries (int): The number of rows of each other section.
+    random (random.Random): The random generator.
+    """
+
+    def __init__(self, seed=0, **sizes):
+        self.publications = sizes.pop("publications", 1000)
+        self.authors = max(1, sizes.pop("authors", 100))
+        self.institutes = max(1, sizes.pop("institutes", 50))
+        self.entries = sizes.pop("entries", 20)
+        if sizes:
+            raise TypeError(f"Unknown sizes: {', '.join(sorted(sizes))}")
+        self.random = random.Random(seed)
+
+    def words(self, count):
+        """
+        Get count random words as a sentence fragment.
+        """
+        return " ".join(self.random.choice(WORDS) for _ in range(count))
+
+    def sentence(self, low=8, high=20):
+        """
+        Get a random sentence.
+        """
+        return self.words(self.random.randint(low, high)).capitalize() + "."
+
+    def month(self, year):
+        """
+        Get a random "Mon YYYY" date of a year.
+        """
+        return f"{self.random.choice(MONTHS)} {year}"
+
+    def dates(self, ranges=None):
+        """
+        Get a "Mon YYYY - Mon YYYY;" dates cell of one or more ranges, or of
+        a single year.
+        """
+        if ranges is None:
+            ranges = self.random.choice((1, 1, 1, 2, 3))
+        if self.random.random() < 0.2:
+            return f"{self.random.randint(2000, 2024)};"
+        month = self.random.randint(1995, 2020) * 12
+        cells = []
+        for _ in range(ranges):
+            end = month + self.random.randint(0, 48)
+            cells.append(f"{MONTHS[month % 12]} {month // 12} - {MONTHS[end % 12]} {end // 12}")
+            month = end + self.random.randint(1, 12)
+        return ";".join(cells) + ";"
+
+    def ids(self, limit, low=1, high=4):
+        """
+        Get a "1,5,7" cell of random ids up to limit.
+        """
+        count = min(limit, self.random.randint(low, high))
+        return ",".join(str(i) for i in self.random.sample(range(1, limit + 1), count))
+
+    def institution_id(self):
+        """
+        Get a random institute id.
+        """
+        return self.random.randint(1, self.institutes)
+
+    def author_string(self):
+        """
+        Get the authors of a publication: author ids, some with their
+        affiliation ids as "(author;affiliation;affiliation)".
+        """
+        authors = []
+        for author_id in self.random.sample(range(1, self.authors + 1),
+                                            min(self.authors, self.random.randint(1, 8))):
+            if self.random.random() < 0.3:
+                affiliations = ";".join(str(self.institution_id())
+                                        for _ in range(self.random.randint(1, 2)))
+                authors.append(f"({author_id};{affiliations})")
+            else:
+                authors.append(str(author_id))
+        return ",".join(authors)
+
+    def publication(self, number):
+        """
+        Get the row of a publication.
+        """
+        year = self.random.randint(2000, 2024)
+        start = self.random.randint(1, 9000)
+        return {
+            "Authors": self.author_string(),
+            "Title": f"{self.sentence(6, 14)[:-1]} {number}",
+            "Dates": str(year) if self.random.random() < 0.5 else self.month(year),
+            "Source": f"Journal of {self.words(3).title()}",
+            "Volume": self.random.randint(1, 80),
+            "Issue": self.random.randint(1, 12),
+            "Art. No.": None,
+            "Page start": start,
+            "Page end": start + self.random.randint(4, 20),
+            "DOI": f"10.1000/synthetic.{number}",
+            "PDF": f"paper-{number}.pdf",
+            "URL": f"https://example.org/papers/{number}",
+            "Document Type": self.random.choice(DOCUMENT_TYPES),
+            "Code": f"https://github.com/example/paper-{number}"
+                    if self.random.random() < 0.2 else None,
+            "Slides": None,
+            "Abstract": " ".join(self.sentence() for _ in range(self.random.randint(5, 10))),
+            "Keywords": "; ".join(self.words(2) for _ in range(self.random.randint(3, 6))),
+            "JCR": None,
+            "License": None,
+            "Copyright": f"© {year} Example Publisher.",
+        }
+
+    def author(self, number):
+        """
+        Get the row of an author.
+        """
+        first = self.random.choice(FIRST_NAMES)
+        last = self.random.choice(LAST_NAMES)
+        return {
+            "id": number, "Name": first, "Lastname": last,
+            "Preferred Name": f"{first} {last}", "Alias": f"{last}, {first[0]}.",
+            "Job Title": self.sentence(3, 8)[:-1],
+            "Website": f"https://example.org/~{number}",
+            "Affiliations": self.ids(self.institutes, 1, 2),
+            "Fingerprint": None, "Public Key": None,
+            "Email": f"author{number}@example.org",
+            "LinkedIn": f"author{number}", "GitHub": f"author{number}",
+            "Google Scholar": None, "ORCID": f"0000-0000-0000-{number:04d}"[-19:],
+            "ResearchGate": None, "Address": None,
+            "Location": "Copenhagen, Denmark", "Telephone": None,
+        }
+
+    def institute(self, number):
+        """
+        Get the row of an institute.
+        """
+        name = f"University of {self.words(2).title()} {number}"
+        return {
+            "id": number, "Name": name, "Name Abbreviation": f"U{number}",
+            "Department": f"Department of {self.words(2).title()}",
+            "Department Abbreviation": "DEP", "Address": None,
+            "Group": f"{self.words(2).title()} Group"
+                     if self.random.random() < 0.5 else None,
+            "Group Abbreviation": None, "City": "Lyngby", "Country": "Denmark",
+            "Website": f"https://u{number}.example.edu/",
+            "Coordinates": "55.7856° N, 12.5214° E",
+        }
+
+    def sheets(self):
+        """
+        Get sheet name: list of row dictionaries, for every sheet.
+        """
+        entries = range(1, self.entries + 1)
+        return {
+            "Intro": [{"Welcome": " ".join(self.sentence() for _ in range(20)),
+                       "Short summary": self.sentence(), "Tagline": self.sentence(4, 8)}],
+            "Research_Interests": [{"Keywords": self.words(3).title(),
+                                    "Interests": self.sentence(30, 60)}
+                                   for _ in range(min(self.entries, 5))],
+            "Education": [{
+                "Dates": self.dates(1), "Degree": f"PhD in {self.words(2).title()}",
+                "Advisor ids": self.ids(self.authors, 1, 2), "Thesis": self.sentence(),
+                "Thesis Link": f"https://example.org/thesis/{number}",
+                "Award": None, "Institution id": self.institution_id()}
+                for number in entries],
+            "References": [{"Author id": self.random.randint(1, self.authors)}
+                           for _ in range(min(self.entries, 5))],
+            "Supervision": [{
+                "Students": f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}",
+                "Dates": self.dates(1), "Thesis": self.sentence(),
+                "Degree": "Master of Science", "Type": self.random.choice(("Master", "Bachelor")),
+                "Institution id": self.institution_id(),
+                "Supervisor ids": self.ids(self.authors, 1, 2)}
+                for _ in entries],
+            "Experience": [{
+                "Dates": self.dates(), "Position": self.words(2).title(),
+                "Institution id": self.institution_id(), "Description": self.sentence(20, 40),
+                "Responsibilities": ";".join(self.sentence() for _ in range(5)),
+                "Achievements": self.sentence() + ";"}
+                for _ in entries],
+            "Teaching": [{
+                "Dates": self.dates(), "Position": "Tutor",
+                "Degree": self.words(3).title(),
+                "Course Link": f"https://example.edu/course/{number}",
+                "Type": "Undergraduate coursework", "Institution id": self.institution_id(),
+                "Supervisor ids": self.random.randint(1, self.authors),
+                "Responsibilities": ";".join(self.sentence() for _ in range(4))}
+                for number in entries],
+            "Grants_awards": [{
+                "Dates": f"{self.random.randint(2000, 2024)};",
+                "Description": self.sentence(), "Institution id": self.institution_id(),
+                "Value": f"EUR {self.random.randint(1, 500) * 1000:,}"}
+                for _ in entries],
+            "Publications": [self.publication(number)
+                             for number in range(1, self.publications + 1)],
+            "Authors": [self.author(number) for number in range(1, self.authors + 1)],
+            "Institutes": [self.institute(number) for number in range(1, self.institutes + 1)],
+            "Professional_services": [{
+                "Type": self.random.choice(("Journal", "Conference")),
+                "Venue": f"{self.words(3).title()} {number}",
+                "Link": f"https://venue{number}.example.org/"} for number in entries],
+            "Skills": [{"Type": self.random.choice(("Language", "Programming", "Tool")),
+                        "Skill": f"{self.words(1).title()} {number}",
+                        "Level": float(self.random.randint(1, 5))} for number in entries],
+            "Professional_memberships": [{"Dates": self.dates(1),
+                                          "Membership": f"{self.words(2).title()} Member"}
+                                         for _ in entries],
+            "Software": [{
+                "id": number, "Name": f"{self.words(1)}-{number}", "Version": None,
+                "Description": self.sentence(), "Code": f"https://github.com/example/{number}",
+                "Demo": None, "Website": None, "Summary": self.sentence(),
+                "License": "MIT"} for number in entries],
+            "News": [{
+                "Date": datetime.datetime(self.random.randint(2010, 2024),
+                                          self.random.randint(1, 12), 1),
+                "Title": self.sentence(3, 6), "Description": self.sentence(20, 40),
+                "PDF": None, "Code": None, "DOI": None} for _ in entries],
+            "Presentations": [{
+                "Title": self.sentence(4, 8)[:-1],
+                "Date": self.month(self.random.randint(2010, 2024)),
+                "Institution id": self.institution_id(), "Event": self.words(2).title(),
+                "Slides": f"talk-{number}.pdf"} for number in entries],
+        }
+
+
+def column_name(index):
+    """
+    Get the letters of a zero-based column index, "A" for 0.
+    """
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+EPOCH = datetime.datetime(1899, 12, 30)
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/'
+    'vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}</Types>')
+
+SHEET_TYPE = ('<Override PartName="/xl/worksheets/sheet{number}.xml" ContentType="application/'
+              'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Cell style 1 shows dates (number format 14), so that readers return datetimes.
+STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8"?><styleSheet xmlns="{MAIN}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" xfId="0"/>'
+    '<xf numFmtId="14" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>')
+
+
+def cell_xml(reference, value):
+    """
+    Get the XML of a cell, empty for missing values.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        serial = (value - EPOCH).total_seconds() / 86400
+        return f'<c r="{reference}" s="1"><v>{serial}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    text = escape(str(value))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def sheet_xml(columns, rows):
+    """
+    Yield the XML of a worksheet, a header row then one row per dictionary.
+    """
+    letters = [column_name(index) for index in range(len(columns))]
+    yield f'<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns="{MAIN}"><sheetData>'
+    for number, values in enumerate([dict(zip(columns, columns))] + rows, 1):
+        cells = "".join(cell_xml(f"{letter}{number}", values.get(column))
+                        for letter, column in zip(letters, columns))
+        yield f'<row r="{number}">{cells}</row>'
+    yield "</sheetData></worksheet>"
+
+
+def write_xlsx(sheets, path):
+    """
+    Write sheet name: rows as an xlsx workbook.
+    """
+    names = list(sheets)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr("[Content_Types].xml", CONTENT_TYPES.format(sheets="".join(
+            SHEET_TYPE.format(number=number) for number in range(1, len(names) + 1))))
+        workbook.writestr("_rels/.rels", ROOT_RELS)
+        workbook.writestr("xl/workbook.xml", (
+            f'<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="{MAIN}" '
+            f'xmlns:r="{RELS}"><sheets>' + "".join(
+                f'<sheet name="{escape(name)}" sheetId="{number}" r:id="rId{number}"/>'
+                for number, name in enumerate(names, 1)) + "</sheets></workbook>"))
+        workbook.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://'
+            'schemas.openxmlformats.org/package/2006/relationships">' + "".join(
+                f'<Relationship Id="rId{number}" Type="{RELS}/worksheet" '
+                f'Target="worksheets/sheet{number}.xml"/>'
+                for number in range(1, len(names) + 1))
+            + f'<Relationship Id="rId{len(names) + 1}" Type="{RELS}/styles" '
+              'Target="styles.xml"/></Relationships>'))
+        workbook.writestr("xl/styles.xml", STYLES)
+        for number, name in enumerate(names, 1):
+            with workbook.open(f"xl/worksheets/sheet{number}.xml", "w") as file:
+                for chunk in sheet_xml(COLUMNS[name], sheets[name]):
+                    file.write(chunk.encode("utf-8"))
+
+
+def write_json(sheets, path):
+    """
+    Write sheet name: rows as a JSON document, with ISO dates.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(sheets, file, default=lambda value: value.isoformat())
+
+
+def write_cv(path, **sizes):
+    """
+    Write a synthetic CV to path, as JSON if it ends with .json and as an
+    xlsx workbook otherwise. The sizes are the Generator arguments.
+    """
+    sheets = Generator(**sizes).sheets()
+    if str(path).endswith(".json"):
+        write_json(sheets, path)
+    else:
+        write_xlsx(sheets, path)
+    return path
+
+
+def main(argv=None):
+    """
+    Write a synthetic CV.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output", help="the .xlsx or .json file to write")
+    parser.add_argument("--publications", type=int, default=1000)
+    parser.add_argument("--authors", type=int, default=100)
+    parser.add_argument("--institutes", type=int, default=50)
+    parser.add_argument("--entries", type=int, default=20,
+                        help="rows of each other section")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_cv(args.output, publications=args.publications, authors=args.authors,
+             institutes=args.institutes, entries=args.entries, seed=args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
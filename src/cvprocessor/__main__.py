@@ -0,0 +1,8 @@
+"""
+Run the cvprocessor command with python -m cvprocessor.
+"""
+import sys
+
+from cvprocessor.cli import main
+
+sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+This module contains the asyncio support: loading the sections of a CV in a
+thread pool without blocking the event loop, and iterating over sections
+asynchronously while they load.
+
+asyncio is imported on first use, like pandas, so that synchronous users do
+not pay for it.
+"""
+import concurrent.futures
+import os
+import threading
+import weakref
+
+from cvprocessor.lazy import LazyModule
+from cvprocessor.reader.reader import open_reader
+
+asyncio = LazyModule("asyncio")
+
+# CV or section: the future of its load, while it is loaded with aopen.
+LOADING = weakref.WeakKeyDictionary()
+
+
+def open_sheets(filename, engine=None):
+    """
+    Open the reader of a CV file and its sheets, so that its sections can
+    then be read concurrently.
+    """
+    reader = open_reader(filename, engine)
+    reader.get_sheet_names()
+    return reader
+
+
+def close_when_done(reader, futures):
+    """
+    Close the reader once the section loads using it are done, so that a
+    cancelled load does not close it under a running one.
+    """
+    pending = [future for future in futures if not future.done()]
+    if not pending:
+        reader.close()
+        return
+    lock = threading.Lock()
+    remaining = [len(pending)]
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            reader.close()
+
+    for future in pending:
+        future.add_done_callback(done)
+
+
+async def load_sections(cv, filename, ready, options, executor=None):
+    """
+    Load the sections of a CV concurrently in an executor, then build its
+    timeline and joins, with the columnar and engine load options. The ready
+    futures of the sections are resolved as each one is loaded.
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        # Sized as the default ThreadPoolExecutor: the loads also wait on the
+        # file and release the GIL in zlib, so they overlap on one CPU too.
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(len(cv.sections), 32, (os.cpu_count() or 1) + 4)))
+    futures = []
+    reader = None
+    try:
+        reader = await loop.run_in_executor(executor, open_sheets, filename, options.engine)
+        # Readers which cannot be shared between threads load one section at a time.
+        limit = asyncio.Semaphore(len(cv.sections) if reader.thread_safe else 1)
+
+        async def load_section(name):
+            async with limit:
+                future = executor.submit(cv.load_section, name, reader, options.columnar)
+                futures.append(future)
+                try:
+                    await asyncio.wrap_future(future)
+                except Exception as error:
+                    ready[name].set_exception(error)
+                    # Retrieved here so that an error nobody waits for is not logged.
+                    ready[name].exception()
+                    raise
+            ready[name].set_result(None)
+            LOADING.pop(cv.get_section(name), None)
+
+        await asyncio.gather(*[load_section(name) for name in cv.sections])
+        await loop.run_in_executor(executor, cv.link_sections, cv.sections)
+    finally:
+        for future in futures:
+            future.cancel()
+        for future in ready.values():
+            future.cancel()
+        if reader is not None and reader is not filename:
+            close_when_done(reader, futures)
+        if own_executor:
+            # The pending loads were cancelled above; cancel_futures needs Python 3.9.
+            executor.shutdown(wait=False)
+
+
+def start_loading(cv, filename, options, executor=None):
+    """
+    Start loading a CV in a task of the running event loop, with the given
+    LoadOptions.
+    """
+    loop = asyncio.get_running_loop()
+    ready = {name: loop.create_future() for name in cv.sections}
+    for name, future in ready.items():
+        LOADING[cv.get_section(name)] = future
+    task = asyncio.ensure_future(load_sections(cv, filename, ready, options, executor))
+    LOADING[cv] = task
+    return task
+
+
+async def wait_loaded(obj):
+    """
+    Wait until a CV or section started with CV.aopen is loaded.
+    """
+    future = LOADING.get(obj)
+    if future is not None:
+        await future
+
+
+async def aiter_section(section, batch_size=100):
+    """
+    Iterate asynchronously over the items of a section once it is loaded,
+    giving control back to the event loop every batch_size items.
+    """
+    await wait_loaded(section)
+    for position, item in enumerate(section, 1):
+        yield item
+        if position % batch_size == 0:
+            await asyncio.sleep(0)
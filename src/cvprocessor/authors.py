@@ -7,7 +7,9 @@
     AuthorsData: A class to represent an author.
     Authors: A class to represent a list of authors.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_lines
+from cvprocessor.aio import aiter_section
 from cvprocessor.security.security import Security
 from cvprocessor.personal.personal import Personal
 from cvprocessor.contact.contact import Contact
@@ -96,6 +98,7 @@ class Authors:
 
     Attributes:
     authors (list): The list of authors.
+    authors_by_id (dict): The authors with each ID, in load order.
 
     Methods:
     get_author(author_id, affiliation_id): Gets the author.
@@ -106,6 +109,7 @@ class Authors:
 
     def __init__(self):
         self.authors = []
+        self.authors_by_id = {}
 
     def get_author(self, author_id, affiliation_id=None):
         """
@@ -113,13 +117,8 @@ class Authors:
         """
         if isinstance(author_id, str):
             author_id = int(author_id)
-        if affiliation_id is None:
-            for author in self.authors:
-                if author.get_id() == author_id:
-                    return author
-            return None
-        for author in self.authors:
-            if author.get_id() == author_id and affiliation_id in author.get_affiliation_ids():
+        for author in self.authors_by_id.get(author_id, ()):
+            if affiliation_id is None or affiliation_id in author.get_affiliation_ids():
                 return author
         return None
 
@@ -127,16 +126,22 @@ class Authors:
         """
         Loads the authors from the file.
         """
-        authors_df = pd.read_excel(filename, sheet_name="Authors")
-        for _, row in authors_df.iterrows():
+        self.authors = []
+        self.authors_by_id = {}
+        for row in read_rows(filename, "Authors"):
             self.authors.append(AuthorsData())
             self.authors[-1].load(row)
+            self.authors_by_id.setdefault(self.authors[-1].get_id(), []).append(
+                self.authors[-1])
 
     def __str__(self):
-        string = ""
-        for author in self.authors:
-            string += str(author) + "\n"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one line per author.
+        """
+        return iter_lines(self.authors)
 
     def __repr__(self):
         string = (
@@ -147,3 +152,10 @@ class Authors:
 
     def __iter__(self):
         return iter(self.authors)
+
+    def aiter(self, batch_size=100):
+        """
+        Iterate asynchronously over the authors, waiting for them when the
+        CV is being loaded with CV.aopen.
+        """
+        return aiter_section(self, batch_size)
@@ -0,0 +1,416 @@
+"""
+This module contains the functions to load many CV files with a process pool.
+
+The CVs are yielded as soon as they are loaded, so memory does not grow
+with the number of files, and a failing file does not stop the batch.
+
+Each worker process loads one file at a time, and the parent process
+enforces the timeout: a worker still loading a file past its deadline is
+killed and replaced, so a file stuck in C code (zipfile, lxml or pandas)
+only fails itself.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
+import time
+import traceback
+from multiprocessing.connection import wait
+
+from cvprocessor.cv import CV
+from cvprocessor.reader.reader import WORKBOOK_EXTENSIONS
+
+# Errors of pickling an object which cannot be sent to the parent process.
+PICKLE_ERRORS = (pickle.PicklingError, TypeError, AttributeError, RecursionError)
+
+
+class BatchResult:
+    """
+    The BatchResult class is used to store the outcome of loading one CV file.
+
+    Attributes:
+    path (str): The path of the CV file.
+    cv (CV): The loaded CV, None if loading failed.
+    error (str): The error raised while loading, None if loading succeeded.
+    elapsed (float): The time spent loading the file, in seconds.
+    """
+
+    def __init__(self, path, cv=None, error=None, elapsed=0.0):
+        self.path = path
+        self.cv = cv
+        self.error = error
+        self.elapsed = elapsed
+
+    def get_path(self):
+        """
+        Get the path of the CV file.
+        """
+        return self.path
+
+    def get_cv(self):
+        """
+        Get the loaded CV.
+        """
+        return self.cv
+
+    def get_error(self):
+        """
+        Get the error raised while loading the CV file.
+        """
+        return self.error
+
+    def get_elapsed(self):
+        """
+        Get the time spent loading the CV file.
+        """
+        return self.elapsed
+
+    def is_ok(self):
+        """
+        Check whether the CV file was loaded.
+        """
+        return self.error is None
+
+    def __repr__(self):
+        string = (
+            f"BatchResult("
+            f"path={self.path}, "
+            f"ok={self.is_ok()}, "
+            f"error={self.error}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+        return string
+
+
+def is_workbook(path):
+    """
+    Check whether a path is a CV workbook: a file with the extension of a
+    reader engine, or a directory holding CSV sheets.
+    """
+    if os.path.isdir(path):
+        return any(name.lower().endswith(".csv") for name in os.listdir(path))
+    return path.lower().endswith(WORKBOOK_EXTENSIONS)
+
+
+def expand_paths(source, pattern=None):
+    """
+    Get the CV files of a directory (searched recursively), a glob or a list
+    of paths. A directory is searched for the workbooks of every reader
+    engine (xlsx, json, ods and directories of CSV sheets), or for the
+    files matching pattern when given.
+    """
+    if isinstance(source, (list, tuple)):
+        paths = []
+        for item in source:
+            paths.extend(expand_paths(item, pattern))
+        return paths
+    source = os.fspath(source)
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "**", pattern or "*"), recursive=True)
+        if pattern is None:
+            paths = [path for path in paths + [source] if is_workbook(path)]
+        return sorted(paths)
+    if glob.has_magic(source):
+        return sorted(glob.glob(source, recursive=True))
+    return [source]
+
+
+def _raise_timeout(signum, frame):
+    """
+    Signal handler raising a TimeoutError when a file takes too long.
+    """
+    raise TimeoutError("loading took longer than the timeout")
+
+
+def load_one(path, timeout=None, **kwargs):
+    """
+    Load one CV file, returning a BatchResult instead of raising.
+
+    The timeout is enforced with SIGALRM where it is available (not on
+    Windows). The signal is only handled between Python bytecodes, so it
+    cannot interrupt a long call into C code, such as pandas parsing a
+    sheet: the load then fails when that call returns. load_cvs enforces
+    its timeout from the parent process instead.
+    """
+    start = time.perf_counter()
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        cv = CV(path, **kwargs)
+        return BatchResult(path, cv=cv, elapsed=time.perf_counter() - start)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return BatchResult(path, error=traceback.format_exc(limit=-1).strip(),
+                           elapsed=time.perf_counter() - start)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _work(connection, kwargs):
+    """
+    Load the paths received on connection, sending back a BatchResult for
+    each, until None is received.
+    """
+    while True:
+        try:
+            path = connection.recv()
+        except EOFError:
+            return
+        if path is None:
+            return
+        result = load_one(path, **kwargs)
+        try:
+            connection.send(result)
+        except PICKLE_ERRORS:
+            connection.send(BatchResult(path, error=traceback.format_exc(limit=-1).strip(),
+                                        elapsed=result.elapsed))
+
+
+class Worker:
+    """
+    A class to represent a worker process of load_cvs, which loads the
+    files it is sent one at a time.
+
+    Attributes:
+    process (multiprocessing.Process): The worker process.
+    connection (multiprocessing.connection.Connection): The parent end of
+        its pipe.
+    path (str): The path being loaded, None when the worker is idle.
+    started (float): The time.monotonic() at which the path was sent.
+    """
+
+    def __init__(self, context, kwargs):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_work, args=(child, kwargs), daemon=True)
+        self.process.start()
+        child.close()
+        self.path = None
+        self.started = None
+
+    def send(self, path):
+        """
+        Send a path to load.
+        """
+        self.connection.send(path)
+        self.path = path
+        self.started = time.monotonic()
+
+    def receive(self):
+        """
+        Get the BatchResult of the path being loaded, or an error result if
+        the worker died, and mark the worker idle.
+        """
+        try:
+            result = self.connection.recv()
+        except (EOFError, OSError):
+            self.process.join()
+            result = BatchResult(self.path, error=(
+                f"RuntimeError: the worker exited with code {self.process.exitcode}"),
+                                 elapsed=self.get_elapsed())
+        self.path = None
+        return result
+
+    def expire(self, timeout):
+        """
+        Kill the worker, whose path took longer than timeout, and get the
+        error result of the path.
+        """
+        result = BatchResult(self.path, error=(
+            f"TimeoutError: loading took longer than {timeout} s"),
+                             elapsed=self.get_elapsed())
+        self.kill()
+        self.path = None
+        return result
+
+    def get_elapsed(self):
+        """
+        Get the time spent on the path being loaded, in seconds.
+        """
+        return time.monotonic() - self.started
+
+    def is_alive(self):
+        """
+        Check whether the worker process is running.
+        """
+        return self.process.is_alive()
+
+    def close(self):
+        """
+        Ask an idle worker to exit, and kill it if it does not.
+        """
+        if self.path is None and not self.connection.closed:
+            try:
+                self.connection.send(None)
+                self.process.join(1)
+            except OSError:
+                pass
+        self.kill()
+
+    def kill(self):
+        """
+        Terminate the worker, killing it if it does not exit, and close its pipe.
+        """
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def __repr__(self):
+        return f"Worker(pid={self.process.pid}, path={self.path})"
+
+
+class WorkerPool:
+    """
+    A class to represent the worker processes of a batch, loading one file
+    each and replaced when they die or are killed at their deadline.
+
+    Attributes:
+    context (multiprocessing.context.BaseContext): The context starting
+        the workers.
+    kwargs (dict): The keyword arguments passed to CV.
+    workers (list): The workers.
+    idle (list): The workers waiting for a file.
+    busy (dict): The workers loading a file, by connection.
+
+    Methods:
+    assign: Send files to the idle workers.
+    collect: Wait for the results of the busy workers.
+    close: Stop the workers.
+    """
+
+    def __init__(self, context, size, kwargs):
+        self.context = context
+        self.kwargs = kwargs
+        self.workers = []
+        self.busy = {}
+        try:
+            for _ in range(size):
+                self.workers.append(Worker(context, kwargs))
+        except BaseException:
+            self.close()
+            raise
+        self.idle = list(self.workers)
+
+    def assign(self, paths):
+        """
+        Send the next files of the paths iterator to the idle workers, and
+        return whether any worker is loading a file.
+        """
+        for worker, path in zip(list(self.idle), paths):
+            self.idle.remove(worker)
+            worker.send(path)
+            self.busy[worker.connection] = worker
+        return bool(self.busy)
+
+    def collect(self, timeout=None):
+        """
+        Wait for a worker to finish or reach its deadline, timeout seconds
+        after it started, and return the BatchResults of the workers which
+        did.
+        """
+        wait_time = None
+        if timeout is not None:
+            wait_time = max(0.0, min(timeout - worker.get_elapsed()
+                                     for worker in self.busy.values()))
+        results = [self.busy.pop(connection).receive()
+                   for connection in wait(list(self.busy), wait_time)]
+        for connection, worker in list(self.busy.items()):
+            if timeout is not None and worker.get_elapsed() >= timeout:
+                del self.busy[connection]
+                results.append(worker.expire(timeout))
+        for index, worker in enumerate(self.workers):
+            if worker.path is None and worker not in self.idle:
+                if not worker.is_alive():
+                    # Replace the workers which died or were killed at their deadline.
+                    worker.kill()
+                    self.workers[index] = worker = Worker(self.context, self.kwargs)
+                self.idle.append(worker)
+        return results
+
+    def close(self):
+        """
+        Stop the workers, killing those still loading a file.
+        """
+        for worker in self.workers:
+            worker.close()
+
+    def __repr__(self):
+        return f"WorkerPool(workers={self.workers})"
+
+
+def load_cvs(source, workers=None, timeout=None, progress=None, **kwargs):
+    """
+    Load the CV files of source in worker processes, yielding a BatchResult
+    per file as soon as it finishes.
+
+    :param source: A directory, a glob or a list of paths.
+    :param workers: The number of worker processes, os.cpu_count() if None.
+    :param timeout: The maximum time in seconds to load one file. A worker
+        still loading a file past it is killed and replaced, and the file
+        fails with a TimeoutError.
+    :param progress: A callable called with (done, total, result).
+    :param kwargs: Extra keyword arguments passed to CV.
+    """
+    paths = expand_paths(source)
+    total = len(paths)
+    remaining = iter(paths)
+    done = 0
+    pool = WorkerPool(multiprocessing.get_context(),
+                      min(workers or os.cpu_count() or 1, total), kwargs)
+    try:
+        while pool.assign(remaining):
+            for result in pool.collect(timeout):
+                done += 1
+                if progress is not None:
+                    progress(done, total, result)
+                yield result
+    finally:
+        pool.close()
+
+
+def report(results, out=None):
+    """
+    Print one line per BatchResult and return the number of failures.
+    """
+    out = out or sys.stdout
+    failures = 0
+    for result in results:
+        if result.is_ok():
+            print(f"ok\t{result.elapsed:.3f}s\t{result.path}", file=out)
+        else:
+            failures += 1
+            error = result.error.splitlines()[-1]
+            print(f"error\t{result.elapsed:.3f}s\t{result.path}\t{error}",
+                  file=out)
+    return failures
+
+
+def main(argv=None):
+    """
+    Load the CV files given on the command line and print one line per file.
+    """
+    parser = argparse.ArgumentParser(
+        description="Load many CV files with a process pool.")
+    parser.add_argument("source", nargs="+",
+                        help="CV files, directories or globs")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of worker processes")
+    parser.add_argument("-t", "--timeout", type=float, default=None,
+                        help="timeout in seconds per file")
+    args = parser.parse_args(argv)
+    failures = report(load_cvs(args.source, workers=args.workers,
+                               timeout=args.timeout))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+This module contains the caches of loaded CVs: the snapshot cache, which
+keeps them as pickle files so that later loads of an unchanged workbook
+skip parsing it, and CVCache, an in-process LRU cache for serving many CVs
+from one process.
+"""
+from collections import OrderedDict
+import concurrent.futures
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from cvprocessor.cv import CV
+from cvprocessor.memory import estimate_size
+from cvprocessor.snapshot import freeze
+
+# Bump when the pickled layout of the CV classes changes.
+SNAPSHOT_VERSION = 2
+
+
+def file_stats(filename):
+    """
+    Get the (modification time, size) of a workbook, or of each file of a
+    directory of CSV files.
+    """
+    if os.path.isdir(filename):
+        stats = [os.stat(entry.path) for entry in sorted(
+            os.scandir(filename), key=lambda entry: entry.name) if entry.is_file()]
+    else:
+        stats = [os.stat(filename)]
+    return [(stat.st_mtime_ns, stat.st_size) for stat in stats]
+
+
+def snapshot_key(filename, **kwargs):
+    """
+    Get the cache key of a workbook: its path, modification time, size and
+    the CV keyword arguments. A directory of CSV files is keyed by the
+    modification times and sizes of its files.
+    """
+    key = repr((SNAPSHOT_VERSION, os.path.abspath(filename), file_stats(filename),
+                sorted(kwargs.items())))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def snapshot_path(cache_dir, filename, **kwargs):
+    """
+    Get the path of the snapshot of a workbook in the cache directory.
+    """
+    return os.path.join(cache_dir, snapshot_key(filename, **kwargs) + ".pickle")
+
+
+def save_snapshot(cv, path):
+    """
+    Write the snapshot of a CV, atomically replacing any previous one.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        pickle.dump(cv, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(file.name, path)
+
+
+def load_snapshot(filename, cache_dir, **kwargs):
+    """
+    Load a CV from its snapshot in the cache directory, parsing the workbook
+    and writing the snapshot when there is no valid one.
+    """
+    path = snapshot_path(cache_dir, filename, **kwargs)
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+        pass
+    cv = CV(filename, **kwargs)
+    save_snapshot(cv, path)
+    return cv
+
+
+class CacheEntry:
+    """
+    A class to represent a CV held by a CVCache.
+
+    Attributes:
+    filename (str): The absolute filename of the CV file.
+    stats (list): The (modification time, size) the CV was loaded from.
+    cv (CV): The loaded CV.
+    size (int): The estimated bytes held by the CV.
+    hits (int): The number of times the entry was returned from the cache.
+    """
+
+    def __init__(self, filename, stats, cv, size):
+        self.filename = filename
+        self.stats = stats
+        self.cv = cv
+        self.size = size
+        self.hits = 0
+
+    def get_cv(self):
+        """
+        Get the loaded CV.
+        """
+        return self.cv
+
+    def get_size(self):
+        """
+        Get the estimated bytes held by the CV.
+        """
+        return self.size
+
+    def __repr__(self):
+        return f"CacheEntry(filename={self.filename}, size={self.size}, hits={self.hits})"
+
+
+class CVCache:
+    """
+    A class to represent an in-process LRU cache of loaded CVs.
+
+    CVs are keyed by their absolute filename, the CV keyword arguments and
+    the modification time and size of the file, so a changed file is loaded
+    again. The least recently used CVs are evicted beyond max_entries or
+    beyond max_bytes of estimated memory. Concurrent gets of a file which is
+    not cached load it once, the other callers waiting for that load.
+
+    The cached CVs are shared between callers; with frozen=True they are
+    frozen so that no caller can change them.
+
+    Attributes:
+    max_entries (int): The maximum number of CVs, unbounded if None.
+    max_bytes (int): The maximum estimated bytes of the CVs, unbounded if None.
+    frozen (bool): Freeze the CVs before caching them.
+    stats (dict): The counters of the cache: the gets served from the cache
+        (hits), those which loaded the CV file (misses) and those which
+        waited for another one's load (coalesced), the CVs evicted to respect
+        the bounds (evictions) and dropped because their file changed
+        (invalidations), and the estimated bytes of the CVs (bytes).
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, frozen=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.frozen = frozen
+        self.stats = dict.fromkeys(
+            ("hits", "misses", "evictions", "invalidations", "coalesced", "bytes"), 0)
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, filename, **kwargs):
+        """
+        Get the CV of a file, loading it with CV(filename, **kwargs) when it
+        is not cached or has changed.
+        """
+        name = (os.path.abspath(filename), repr(sorted(kwargs.items())))
+        stats = file_stats(filename)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.stats == stats:
+                self._entries.move_to_end(name)
+                entry.hits += 1
+                self.stats["hits"] += 1
+                return entry.cv
+            future = self._loading.get((name, repr(stats)))
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._loading[(name, repr(stats))] = future
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return future.result()
+        try:
+            cv = CV(filename, **kwargs)
+            if self.frozen:
+                cv = freeze(cv)
+            entry = CacheEntry(name[0], stats, cv, estimate_size(cv))
+            self._store(name, entry)
+            future.set_result(cv)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[(name, repr(stats))]
+        return cv
+
+    def _store(self, name, entry):
+        """
+        Add an entry, replacing the one of an older version of the file, and
+        evict the least recently used entries beyond the bounds.
+        """
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self.stats["bytes"] -= previous.size
+                self.stats["invalidations"] += 1
+            self._entries[name] = entry
+            self.stats["bytes"] += entry.size
+            while self._entries and (
+                    (self.max_entries is not None and len(self._entries) > self.max_entries)
+                    or (self.max_bytes is not None and self.stats["bytes"] > self.max_bytes)):
+                _, evicted = self._entries.popitem(last=False)
+                self.stats["bytes"] -= evicted.size
+                self.stats["evictions"] += 1
+
+    def invalidate(self, filename=None):
+        """
+        Drop the CVs of a file, or all the CVs if filename is None.
+        """
+        with self._lock:
+            for name in list(self._entries):
+                if filename is None or name[0] == os.path.abspath(filename):
+                    self.stats["bytes"] -= self._entries.pop(name).size
+
+    def get_entries(self):
+        """
+        Get the cached entries, from the least to the most recently used.
+        """
+        with self._lock:
+            return list(self._entries.values())
+
+    def get_stats(self):
+        """
+        Get the counters of the cache and its current size.
+        """
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (f"CVCache(entries={len(self._entries)}, bytes={self.stats['bytes']}, "
+                f"hits={self.stats['hits']}, misses={self.stats['misses']}, "
+                f"evictions={self.stats['evictions']})")
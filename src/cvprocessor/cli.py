@@ -0,0 +1,369 @@
+"""
+This module contains the cvprocessor command-line interface.
+
+The commands only load the sheets they need and can reuse a snapshot cache,
+so that scripts calling the command many times do not parse the whole
+workbook on every call. Heavy modules are imported by the commands that use
+them, keeping the startup of the command cheap.
+"""
+import argparse
+import contextlib
+import os
+import sys
+
+from cvprocessor.lazy import LazyModule
+
+batch_module = LazyModule("cvprocessor.batch")
+cache_module = LazyModule("cvprocessor.cache")
+cv_module = LazyModule("cvprocessor.cv")
+export_module = LazyModule("cvprocessor.export")
+pipeline_module = LazyModule("cvprocessor.pipeline")
+profiling_module = LazyModule("cvprocessor.profiling")
+render_module = LazyModule("cvprocessor.render")
+store_module = LazyModule("cvprocessor.store")
+tables_module = LazyModule("cvprocessor.tables")
+
+# Sections each command needs, None meaning every section.
+COMMAND_SECTIONS = {
+    "info": None,
+    "publications": ["publications"],
+    "citation": ["publications", "authors"],
+    "export": None,
+}
+
+
+def parse_year(value):
+    """
+    Parse a year ("2020") or a year range ("2018:2024", "2018:", ":2024").
+    """
+    if ":" not in value:
+        return int(value)
+    start, end = value.split(":", 1)
+    return (int(start) if start else None, int(end) if end else None)
+
+
+def load(args, sections=None, stats=False, trace_memory=False):
+    """
+    Load the CV of the command, from the snapshot cache when one is set and
+    the load is not measured.
+    """
+    kwargs = {"columnar": args.columnar, "engine": args.engine}
+    if sections is not None:
+        kwargs["sections"] = sections
+    if stats or trace_memory:
+        return cv_module.CV(args.filename, stats=stats, trace_memory=trace_memory, **kwargs)
+    if args.cache:
+        return cache_module.load_snapshot(args.filename, args.cache, **kwargs)
+    return cv_module.CV(args.filename, **kwargs)
+
+
+def command_info(args, out):
+    """
+    Print the number of items of each loaded section, the load timings of
+    each section with --timings and its memory with --memory.
+    """
+    cv = load(args, args.sections, stats=args.timings, trace_memory=args.memory)
+    for name in cv.sections:
+        section = cv.get_section(name)
+        count = len(list(section)) if hasattr(section, "__iter__") else 1
+        print(f"{name}\t{count}", file=out)
+    if args.timings:
+        print(file=out)
+        print(cv.load_stats.format(), file=out)
+    if args.memory:
+        print(file=out)
+        print(cv.memory_report().format(), file=out)
+    return 0
+
+
+def command_show(args, out):
+    """
+    Print one section, streaming its text.
+    """
+    cv = load(args, [args.section])
+    section = cv.get_section(args.section)
+    if args.repr:
+        print(repr(section), file=out)
+    else:
+        render_module.write_text(section, out)
+        print(file=out)
+    return 0
+
+
+def command_publications(args, out):
+    """
+    Print the publications matching the query, one per line.
+    """
+    sections = ["publications", "authors"] if args.apa else ["publications"]
+    cv = load(args, sections)
+    publications = cv.academic.publications
+    found = publications.query(doc_type=args.type, venue=args.venue,
+                               author=args.author, keyword=args.keyword,
+                               year=args.year)
+    if args.latest is not None:
+        found = found[:args.latest]
+    for publication in found:
+        title = publication.details.get_title()
+        if args.apa:
+            print(cv.get_publications_apa_citation(title), file=out)
+            continue
+        start = publication.details.dates.get_start()
+        year = start.year if start is not None else ""
+        print(f"{year}\t{publication.details.get_type()}\t{title}", file=out)
+    return 0
+
+
+def command_citation(args, out):
+    """
+    Print the APA citation of a publication.
+    """
+    cv = load(args, COMMAND_SECTIONS["citation"])
+    citation = cv.get_publications_apa_citation(args.title)
+    if citation is None:
+        print(f"Publication not found: {args.title}", file=sys.stderr)
+        return 1
+    print(citation, file=out)
+    return 0
+
+
+def parse_sink(value):
+    """
+    Parse a FORMAT:PATH export target.
+    """
+    sinks = pipeline_module.SINKS
+    sink, _, path = value.partition(":")
+    if sink not in sinks or not path:
+        raise argparse.ArgumentTypeError(
+            f"expected FORMAT:PATH with FORMAT one of {', '.join(sinks)}, got {value!r}")
+    return sink, path
+
+
+def export_sinks(cv, targets, out):
+    """
+    Export a CV to the (format, path) targets in one pass over its records.
+    """
+    with contextlib.ExitStack() as stack:
+        sinks = [pipeline_module.SINKS[sink](stack.enter_context(open(path, "w", encoding="utf-8")))
+                 for sink, path in targets]
+        count = pipeline_module.export(cv, sinks)
+    for _, path in targets:
+        print(path, file=out)
+    print(f"{count} records", file=out)
+    return 0
+
+
+def command_export(args, out):
+    """
+    Export the loaded sections as JSON, as NDJSON records or as Parquet
+    tables.
+    """
+    cv = load(args, args.sections)
+    if args.to:
+        return export_sinks(cv, args.to, out)
+    if args.parquet is not None:
+        for path in tables_module.write_parquet(cv.to_tables(), args.parquet):
+            print(path, file=out)
+        return 0
+
+    def write(file):
+        if args.ndjson:
+            export_module.write_ndjson(cv, file)
+        else:
+            export_module.write_json(cv, file, indent=args.indent)
+
+    if args.output in (None, "-"):
+        write(out)
+        if not args.ndjson:
+            out.write("\n")
+        return 0
+    with open(args.output, "w", encoding="utf-8") as file:
+        write(file)
+    return 0
+
+
+def command_batch(args, out):
+    """
+    Load many CV files with a process pool.
+    """
+    failures = batch_module.report(
+        batch_module.load_cvs(args.source, workers=args.workers, timeout=args.timeout,
+                              columnar=args.columnar, engine=args.engine),
+        out)
+    return 1 if failures else 0
+
+
+def command_profile(args, out):
+    """
+    Load a CV under the profiler, write its pstats and collapsed stacks and
+    print the hot functions of the package.
+    """
+    profile = profiling_module.profile_load(
+        args.filename, columnar=args.columnar, sections=args.sections, engine=args.engine,
+        repeat=args.repeat, interval=args.interval)
+    profile.write_pstats(args.output + ".pstats")
+    with open(args.output + ".collapsed", "w", encoding="utf-8") as file:
+        profile.write_collapsed(file)
+    print(profile.format_hot_functions(args.top), file=out)
+    print(f"\nWrote {args.output}.pstats and {args.output}.collapsed", file=out)
+    return 0
+
+
+def command_ingest(args, out):
+    """
+    Add CV files to a SQLite store.
+    """
+    with store_module.CVStore(args.database) as store:
+        for name in store.add_many(args.filenames, engine=args.engine,
+                                   sections=args.sections):
+            print(name, file=out)
+    return 0
+
+
+def command_query(args, out):
+    """
+    Query the publications of the CVs of a SQLite store.
+    """
+    with store_module.CVStore(args.database) as store:
+        for row in store.query_publications(venue=args.venue, year=args.year,
+                                            doc_type=args.type, department=args.department):
+            print(f"{row['cv']}\t{row['year']}\t{row['type']}\t{row['title']}", file=out)
+    return 0
+
+
+def add_store_parsers(commands):
+    """
+    Add the ingest and query commands of SQLite stores to the subparsers of
+    the command.
+    """
+    ingest = commands.add_parser("ingest", help="add CV files to a SQLite store")
+    ingest.add_argument("database")
+    ingest.add_argument("filenames", nargs="+")
+    ingest.add_argument("--sections", nargs="+", default=None,
+                        help="sections to load (default: all)")
+    ingest.set_defaults(func=command_ingest)
+
+    query = commands.add_parser(
+        "query", help="query the publications of the CVs of a SQLite store")
+    query.add_argument("database")
+    query.add_argument("--type")
+    query.add_argument("--venue")
+    query.add_argument("--department", help="department of one of the authors")
+    query.add_argument("--year", type=parse_year,
+                       help="a year or a range such as 2018:2024")
+    query.set_defaults(func=command_query)
+
+
+def add_export_parser(commands):
+    """
+    Add the export command to the subparsers of the command.
+    """
+    export = commands.add_parser("export", help="export the CV as JSON")
+    export.add_argument("filename")
+    export.add_argument("-o", "--output", default=None,
+                        help="output file (default: standard output)")
+    export.add_argument("--sections", nargs="+", default=None)
+    export.add_argument("--indent", type=int, default=None)
+    export.add_argument("--ndjson", action="store_true",
+                        help="write one JSON record per line")
+    export.add_argument("--parquet", metavar="DIRECTORY", default=None,
+                        help="write one Parquet file per table (requires pyarrow)")
+    export.add_argument("--to", metavar="FORMAT:PATH", type=parse_sink, action="append",
+                        default=[],
+                        help="write FORMAT (ndjson, bibtex, html or text) to PATH instead, "
+                             "all in one pass; can be repeated")
+    export.set_defaults(func=command_export)
+
+
+def build_parser():
+    """
+    Build the argument parser of the command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cvprocessor", description="Load, query and export CV workbooks.")
+    parser.add_argument("--cache", default=os.environ.get("CVPROCESSOR_CACHE"),
+                        help="snapshot cache directory (default: $CVPROCESSOR_CACHE)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="keep the publications in a columnar store")
+    parser.add_argument("--engine", choices=["pandas", "xlsx", "csv", "json", "ods"],
+                        default=None,
+                        help="input reader engine (default: detected from the path)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="print the size of each section")
+    info.add_argument("filename")
+    info.add_argument("--sections", nargs="+", default=None)
+    info.add_argument("--timings", action="store_true",
+                      help="also print the load time and rows per second of each section")
+    info.add_argument("--memory", action="store_true",
+                      help="also print the memory and load allocation peak of each section")
+    info.set_defaults(func=command_info)
+
+    show = commands.add_parser("show", help="print one section")
+    show.add_argument("filename")
+    show.add_argument("section")
+    show.add_argument("--repr", action="store_true",
+                      help="print the repr of the section")
+    show.set_defaults(func=command_show)
+
+    publications = commands.add_parser(
+        "publications", help="query the publications")
+    publications.add_argument("filename")
+    publications.add_argument("--type")
+    publications.add_argument("--venue")
+    publications.add_argument("--author", type=int)
+    publications.add_argument("--keyword")
+    publications.add_argument("--year", type=parse_year,
+                              help="a year or a range such as 2018:2024")
+    publications.add_argument("--latest", type=int,
+                              help="only the given number of newest matches")
+    publications.add_argument("--apa", action="store_true",
+                              help="print the APA citations")
+    publications.set_defaults(func=command_publications)
+
+    citation = commands.add_parser(
+        "citation", help="print the APA citation of a publication")
+    citation.add_argument("filename")
+    citation.add_argument("title")
+    citation.set_defaults(func=command_citation)
+
+    add_export_parser(commands)
+    add_store_parsers(commands)
+
+    batch = commands.add_parser(
+        "batch", help="load many CV files with a process pool")
+    batch.add_argument("source", nargs="+",
+                       help="CV files, directories or globs")
+    batch.add_argument("-j", "--workers", type=int, default=None)
+    batch.add_argument("-t", "--timeout", type=float, default=None)
+    batch.set_defaults(func=command_batch)
+
+    profile = commands.add_parser(
+        "profile", help="load a CV under the profiler")
+    profile.add_argument("filename")
+    profile.add_argument("--sections", nargs="+", default=None)
+    profile.add_argument("-o", "--output", default="cvprocessor-profile",
+                         help="prefix of the .pstats and .collapsed files")
+    profile.add_argument("--top", type=int, default=20,
+                         help="number of hot functions to print")
+    profile.add_argument("--repeat", type=int, default=1,
+                         help="number of loads, for more samples of small CVs")
+    profile.add_argument("--interval", type=float, default=0.001,
+                         help="stack sampling interval in seconds")
+    profile.set_defaults(func=command_profile)
+    return parser
+
+
+def main(argv=None, out=None):
+    """
+    Run the cvprocessor command.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args, out or sys.stdout)
+    except (OSError, ValueError, ImportError) as error:
+        print(f"cvprocessor: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
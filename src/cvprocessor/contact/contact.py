@@ -2,7 +2,7 @@
 This module contains the class Contact, which is used to store the contact information
 of the author.
 """
-import pandas as pd
+from cvprocessor.reader.reader import isna
 
 contact_types = {
     "email": "Email",
@@ -105,7 +105,7 @@ class Contact:
         Loads the contact information of the author.
         """
         for key, value in contact_types.items():
-            if value in df and not pd.isnull(df[value]):
+            if value in df and not isna(df[value]):
                 # check if we are processing the coordinates
                 if key == "coordinates":
                     self.process_coordinates(df[value])
@@ -6,10 +6,10 @@ import sys
 
 from cvprocessor.intro import Intro
 from cvprocessor.education import Educations
-from cvprocessor.publications import Publications
+from cvprocessor.publications import Publications, format_apa_authors
 from cvprocessor.authors import Authors
 from cvprocessor.software import Software
-from cvprocessor.institutes import Institutes
+from cvprocessor.institutes import Institutes, InstituteJoins
 from cvprocessor.news import News
 from cvprocessor.research_interests import ResearchInterests
 from cvprocessor.grants_awards import GrantsAwards
@@ -18,9 +18,38 @@ from cvprocessor.teaching import Teaching
 from cvprocessor.supervision import Supervision
 from cvprocessor.experience import Experience
 from cvprocessor.skills import Skills
+from cvprocessor.reader.reader import open_reader
 from cvprocessor.service import Services
 from cvprocessor.memberships import Memberships
 from cvprocessor.references import References
+from cvprocessor.timeline import Timeline
+from cvprocessor.aio import start_loading, wait_loaded
+from cvprocessor.trace import LoadStats, TimingReader
+from cvprocessor.memory import memory_report
+from cvprocessor.render import iter_labelled, write_text
+from cvprocessor.tables import to_tables
+from cvprocessor.date.date import timestamps
+
+# Section name: (group attribute of the CV, section attribute), in load order.
+SECTIONS = {
+    "education": ("academic", "education"),
+    "institutes": ("academic", "institutes"),
+    "software": (None, "software"),
+    "intro": ("personal", "intro"),
+    "authors": ("personal", "authors"),
+    "news": (None, "news"),
+    "publications": ("academic", "publications"),
+    "research_interests": ("academic", "research_interests"),
+    "grants_awards": ("academic", "grants_awards"),
+    "teaching": ("academic", "teaching"),
+    "supervision": ("academic", "supervision"),
+    "experience": ("professional", "experience"),
+    "skills": ("professional", "skills"),
+    "service": ("professional", "service"),
+    "memberships": ("professional", "memberships"),
+    "presentations": ("professional", "presentations"),
+    "references": ("personal", "references"),
+}
 
 
 class AcademicInfo:
@@ -44,14 +73,20 @@ class AcademicInfo:
         self.publications = Publications()
 
     def __str__(self):
-        string = f"Education: {self.education}\n"
-        string += f"Institutes: {self.institutes}\n"
-        string += f"Research Interests: {self.research_interests}\n"
-        string += f"Grants & Awards: {self.grants_awards}\n"
-        string += f"Teaching: {self.teaching}\n"
-        string += f"Supervision: {self.supervision}\n"
-        string += f"Publications: {self.publications}\n"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the academic sections.
+        """
+        return iter_labelled((
+            ("Education", self.education),
+            ("Institutes", self.institutes),
+            ("Research Interests", self.research_interests),
+            ("Grants & Awards", self.grants_awards),
+            ("Teaching", self.teaching),
+            ("Supervision", self.supervision),
+            ("Publications", self.publications)))
 
     def __repr__(self):
         string = (
@@ -83,10 +118,16 @@ class PersonalInfo:
         self.references = References()
 
     def __str__(self):
-        string = f"Intro: {self.intro}\n"
-        string += f"Authors: {self.authors}\n"
-        string += f"References: {self.references}\n"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the personal sections.
+        """
+        return iter_labelled((
+            ("Intro", self.intro),
+            ("Authors", self.authors),
+            ("References", self.references)))
 
     def __repr__(self):
         string = (
@@ -116,12 +157,18 @@ class ProfessionalInfo:
         self.presentations = Presentations()
 
     def __str__(self):
-        string = f"Experience: {self.experience}\n"
-        string += f"Skills: {self.skills}\n"
-        string += f"Service: {self.service}\n"
-        string += f"Memberships: {self.memberships}\n"
-        string += f"Presentations: {self.presentations}\n"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the professional sections.
+        """
+        return iter_labelled((
+            ("Experience", self.experience),
+            ("Skills", self.skills),
+            ("Service", self.service),
+            ("Memberships", self.memberships),
+            ("Presentations", self.presentations)))
 
     def __repr__(self):
         string = (
@@ -134,21 +181,281 @@ class ProfessionalInfo:
         return string
 
 
+class LoadOptions:
+    """
+    The LoadOptions class holds the options of the loading of a CV, given
+    as keyword arguments to CV, CV.aopen, CV.aload, build_snapshot and
+    profile_load.
+
+    Attributes:
+    columnar (bool): Keep the publications in a columnar store.
+    sections (list): The names of the sections to load, all if None.
+    engine (str): The reader engine, detected from the filename if None.
+    stats (bool): Record the load statistics in load_stats.
+    trace (callable): The hook of the load trace spans; implies stats.
+    trace_memory (bool): Record the tracemalloc peaks; implies stats.
+
+    Methods:
+    get_sections: Get the names of the sections to load.
+    records_stats: Check whether the load statistics are recorded.
+    """
+
+    def __init__(self, **options):
+        self.columnar = options.pop("columnar", False)
+        self.sections = options.pop("sections", None)
+        self.engine = options.pop("engine", None)
+        self.stats = options.pop("stats", False)
+        self.trace = options.pop("trace", None)
+        self.trace_memory = options.pop("trace_memory", False)
+        if options:
+            raise TypeError(f"Unknown load options: {', '.join(sorted(options))}")
+
+    def get_sections(self):
+        """
+        Get the names of the sections to load, checking that they exist.
+        """
+        sections = list(SECTIONS) if self.sections is None else list(self.sections)
+        for name in sections:
+            if name not in SECTIONS:
+                raise ValueError(f"Unknown section: {name}")
+        return sections
+
+    def records_stats(self):
+        """
+        Check whether the load statistics are recorded: with stats, a trace
+        hook or trace_memory.
+        """
+        return self.stats or self.trace is not None or self.trace_memory
+
+    def __repr__(self):
+        string = (
+            f"LoadOptions("
+            f"columnar={self.columnar}, "
+            f"sections={self.sections}, "
+            f"engine={self.engine}, "
+            f"stats={self.stats}, "
+            f"trace={self.trace}, "
+            f"trace_memory={self.trace_memory})"
+        )
+        return string
+
+
+class CVState:
+    """
+    The CVState class holds what a CV builds besides its sections: the
+    statistics of its load, and the timeline and institute joins linking
+    its sections.
+
+    Attributes:
+    load_stats (LoadStats): The statistics of the load, None if they are
+        not recorded.
+    timeline (Timeline): The dated items of the sections.
+    institute_joins (InstituteJoins): The institutes of the records.
+
+    Methods:
+    get_load_stats: Get the statistics of the load.
+    get_timeline: Get the timeline.
+    get_institute_joins: Get the institute joins.
+    """
+
+    def __init__(self, load_stats=None):
+        self.load_stats = load_stats
+        self.timeline = Timeline()
+        self.institute_joins = InstituteJoins()
+
+    def get_load_stats(self):
+        """
+        Get the statistics of the load, None if they are not recorded.
+        """
+        return self.load_stats
+
+    def get_timeline(self):
+        """
+        Get the timeline of the dated items of the sections.
+        """
+        return self.timeline
+
+    def get_institute_joins(self):
+        """
+        Get the joins of the institution ids of the records to the institutes.
+        """
+        return self.institute_joins
+
+    def __repr__(self):
+        string = (
+            f"CVState("
+            f"load_stats={repr(self.load_stats)}, "
+            f"timeline={repr(self.timeline)}, "
+            f"institute_joins={repr(self.institute_joins)})"
+        )
+        return string
+
+
 class CV:
     """
     The CV class is used to create a CV object that stores all the information from the CV file.
 
-    :param filename: The filename of the CV file.
-    :type filename: str
+    The options are keyword arguments, held by a LoadOptions.
+
+    :param filename: The filename of the CV file: an xlsx or ods workbook, a
+        JSON document or a directory of CSV files. The content of a file
+        (bytes, memoryview, io.BytesIO or mmap) is read in place.
+    :type filename: str or bytes
+
+    :param columnar: Keep the publications in a columnar store.
+    :type columnar: bool
+
+    :param sections: The names of the sections to load, all if None.
+    :type sections: list
+
+    :param engine: The reader engine, one of "pandas", "xlsx", "csv", "json"
+        and "ods", detected from the filename if None.
+    :type engine: str
+
+    :param stats: Record the wall time and rows of each section load in
+        load_stats.
+    :type stats: bool
+
+    :param trace: A hook called with a span dictionary for each section load
+        and its phases; implies stats.
+    :type trace: callable
+
+    :param trace_memory: Also record the tracemalloc allocation peak of each
+        section load; implies stats.
+    :type trace_memory: bool
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, **options):
+        options = LoadOptions(**options)
+        self._create_sections(options)
+        self._load_cv(filename, options)
+
+    def _create_sections(self, options):
+        """
+        The _create_sections method is used to create the empty sections of
+        the sections of the options, and their load statistics.
+
+        :param options: The load options.
+        :type options: LoadOptions
+        """
         self.professional = ProfessionalInfo()
         self.personal = PersonalInfo()
         self.academic = AcademicInfo()
         self.software = Software()
         self.news = News()
-        self._load_cv(filename)
+        self.state = CVState(LoadStats(options.trace, options.trace_memory)
+                             if options.records_stats() else None)
+        self.sections = options.get_sections()
+
+    @property
+    def load_stats(self):
+        """
+        The statistics of the load, None if they are not recorded.
+        """
+        return self.state.get_load_stats()
+
+    @property
+    def timeline(self):
+        """
+        The timeline of the dated items of the sections.
+        """
+        return self.state.get_timeline()
+
+    @property
+    def institute_joins(self):
+        """
+        The joins of the institution ids of the records to the institutes.
+        """
+        return self.state.get_institute_joins()
+
+    @classmethod
+    def create(cls, **options):
+        """
+        The create method is used to create a CV with the empty sections of
+        the options, to be filled with load_section and then linked with
+        link_sections, as the incremental loaders do.
+        """
+        instance = cls.__new__(cls)
+        instance._create_sections(LoadOptions(**options))
+        return instance
+
+    @classmethod
+    def aopen(cls, filename, executor=None, **options):
+        """
+        The aopen method is used to start loading a CV in the background of
+        the running event loop. The CV is returned at once: its sections are
+        filled as their sheets are parsed in a thread pool, and the aiter
+        methods of the sections wait for them.
+
+        :param executor: The executor of the section loads, a thread pool
+            of its own if None.
+        :type executor: concurrent.futures.Executor
+        """
+        options = LoadOptions(**options)
+        instance = cls.__new__(cls)
+        instance._create_sections(options)
+        start_loading(instance, filename, options, executor)
+        return instance
+
+    @classmethod
+    async def aload(cls, filename, executor=None, **options):
+        """
+        The aload method is used to load a CV without blocking the event
+        loop, parsing the sheets concurrently in a thread pool. Cancelling it
+        stops the section loads which have not started.
+        """
+        instance = cls.aopen(filename, executor, **options)
+        await instance.aready()
+        return instance
+
+    async def aready(self):
+        """
+        The aready method is used to wait until a CV started with aopen is
+        loaded, raising the error of a failed load.
+        """
+        await wait_loaded(self)
+
+    def get_section(self, name):
+        """
+        The get_section method is used to get a section by its name.
+
+        :param name: The name of the section, one of SECTIONS.
+        :type name: str
+        """
+        if name not in SECTIONS:
+            raise ValueError(f"Unknown section: {name}")
+        group, attribute = SECTIONS[name]
+        owner = self if group is None else getattr(self, group)
+        return getattr(owner, attribute)
+
+    def set_section(self, name, section):
+        """
+        The set_section method is used to replace a section by its name.
+
+        :param name: The name of the section, one of SECTIONS.
+        :type name: str
+
+        :param section: The section object.
+        """
+        group, attribute = SECTIONS[name]
+        owner = self if group is None else getattr(self, group)
+        setattr(owner, attribute, section)
+
+    def memory_report(self):
+        """
+        The memory_report method is used to estimate the memory retained by
+        each section, by object type and attribute, with the tracemalloc
+        peaks of the loads when the CV was loaded with trace_memory.
+        """
+        return memory_report(self)
+
+    def to_tables(self, sections=None):
+        """
+        The to_tables method is used to convert the loaded sections, or the
+        given ones, to flat tables of column lists, for pyarrow, pandas or
+        write_parquet.
+        """
+        return to_tables(self, sections)
 
     def get_publications_apa_citation(self, publication_title):
         """
@@ -171,44 +478,124 @@ class CV:
             author = self.personal.authors.get_author(author_id)
             if author is not None:
                 authors_alias_short.append(author.personal.get_alias())
-        if len(authors_alias_short) > 1:
-            authors_alias_short[-1] = "& " + authors_alias_short[-1]
-        authors_alias_short = ", ".join(authors_alias_short)
-        apa = authors_alias_short + " " + apa
+        apa = format_apa_authors(authors_alias_short) + " " + apa
         return apa
 
-    def _load_cv(self, filename):
+    def _join_institutes(self):
+        """
+        The _join_institutes method is used to resolve the institution ids of
+        the records into their institutes, collecting the ids not found.
+        """
+        institutes = self.academic.institutes
+        joins = InstituteJoins()
+        joins.resolve(institutes, "Education", self.academic.education)
+        joins.resolve(institutes, "Experience", self.professional.experience)
+        joins.resolve(institutes, "Teaching",
+                      [teaching.education for teaching in self.academic.teaching])
+        joins.resolve(institutes, "Supervision",
+                      [supervision.education for supervision in self.academic.supervision])
+        joins.resolve(institutes, "Grants_awards", self.academic.grants_awards)
+        joins.resolve(institutes, "Presentations",
+                      self.professional.presentations)
+        self.state.institute_joins = joins
+
+    def _load_cv(self, filename, options):
         """
         The _load_cv method is used to load the CV file.
 
         :param filename: The filename of the CV file.
         :type filename: str
+
+        :param options: The load options.
+        :type options: LoadOptions
+        """
+        reader = open_reader(filename, options.engine)
+        try:
+            for name in SECTIONS:
+                if name in self.sections:
+                    self.load_section(name, reader, options.columnar)
+        finally:
+            if reader is not filename:
+                reader.close()
+        self.link_sections(self.sections)
+
+    def load_section(self, name, reader, columnar=False):
+        """
+        The load_section method is used to load one section.
+
+        :param name: The name of the section, one of SECTIONS.
+        :type name: str
+
+        :param reader: The reader of the CV file.
+        :type reader: Reader
+
+        :param columnar: Keep the publications in a columnar store.
+        :type columnar: bool
+        """
+        if self.load_stats is not None:
+            with self.load_stats.section(name):
+                self._read_section(name, TimingReader(reader), columnar)
+        else:
+            self._read_section(name, reader, columnar)
+
+    def _read_section(self, name, reader, columnar=False):
+        """
+        The _read_section method is used to read one section from the reader,
+        its dates being of the date type of the reader.
+        """
+        with timestamps(reader.timestamps):
+            if name == "publications":
+                self.academic.publications.load(reader, columnar)
+            else:
+                self.get_section(name).load(reader)
+
+    def link_sections(self, sections):
+        """
+        The link_sections method is used to build the timeline and the
+        institute joins once the sections are loaded.
+
+        :param sections: The names of the loaded sections.
+        :type sections: list
+        """
+        if self.load_stats is not None:
+            with self.load_stats.section("link"):
+                self._build_links(sections)
+        else:
+            self._build_links(sections)
+
+    def _build_links(self, sections):
+        """
+        The _build_links method is used to build the timeline and the joins.
+        """
+        self.timeline.load([
+            self.professional.experience,
+            self.academic.education,
+            self.academic.grants_awards,
+            self.professional.memberships])
+        if "institutes" in sections:
+            self._join_institutes()
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of str(cv), one per item of the large
+        sections, so that the text is built in linear time.
         """
-        self.academic.education.load(filename)
-        self.academic.institutes.load(filename)
-        self.software.load(filename)
-        self.personal.intro.load(filename)
-        self.personal.authors.load(filename)
-        self.news.load(filename)
-        self.academic.publications.load(filename)
-        self.academic.research_interests.load(filename)
-        self.academic.grants_awards.load(filename)
-        self.academic.teaching.load(filename)
-        self.academic.supervision.load(filename)
-        self.professional.experience.load(filename)
-        self.professional.skills.load(filename)
-        self.professional.service.load(filename)
-        self.professional.memberships.load(filename)
-        self.professional.presentations.load(filename)
-        self.personal.references.load(filename)
+        return iter_labelled((
+            ("Academic Info", self.academic),
+            ("Personal Info", self.personal),
+            ("Professional Info", self.professional),
+            ("Software", self.software),
+            ("News", self.news)))
+
+    def write_text(self, file):
+        """
+        Write str(cv) to a text file object, chunk by chunk, without holding
+        the whole text in memory.
+        """
+        write_text(self, file)
 
     def __str__(self):
-        string = f"Academic Info: {self.academic}\n"
-        string += f"Personal Info: {self.personal}\n"
-        string += f"Professional Info: {self.professional}\n"
-        string += f"Software: {self.software}\n"
-        string += f"News: {self.news}\n"
-        return string
+        return "".join(self.iter_text())
 
     def __repr__(self):
         string = (
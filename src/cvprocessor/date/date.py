@@ -1,7 +1,65 @@
 """
 This module contains the Date class and functions to process the date data from the CV.
+
+The dates are parsed as datetime.datetime. While a section is loaded from
+the pandas engine (within timestamps(True)), they are converted to pandas
+Timestamps, the type pandas.to_datetime gives, so that the pandas engine
+keeps giving Timestamps while the other engines do not import pandas.
 """
-import pandas as pd
+import datetime
+import threading
+
+from cvprocessor.lazy import pandas as pd
+from cvprocessor.trace import phase
+
+_local = threading.local()
+
+
+class TimestampScope:
+    """
+    A context manager setting whether the dates parsed in this thread are
+    pandas Timestamps.
+
+    Attributes:
+    enabled (bool): Whether the dates are pandas Timestamps.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self._previous = False
+
+    def __enter__(self):
+        self._previous = getattr(_local, "timestamps", False)
+        _local.timestamps = self.enabled
+        return self
+
+    def __exit__(self, *exc_info):
+        _local.timestamps = self._previous
+
+
+def timestamps(enabled=True):
+    """
+    Get a context manager within which the dates parsed in this thread are
+    pandas Timestamps if enabled, datetimes otherwise.
+    """
+    return TimestampScope(enabled)
+
+
+def uses_timestamps():
+    """
+    Check whether the dates parsed in this thread are pandas Timestamps.
+    """
+    return getattr(_local, "timestamps", False)
+
+
+def to_date(value):
+    """
+    Convert a datetime to the date type of this thread: a pandas Timestamp
+    within timestamps(True), the datetime itself otherwise.
+    """
+    if value is None or not getattr(_local, "timestamps", False):
+        return value
+    return pd.Timestamp(value)
 
 
 class Date:
@@ -45,8 +103,8 @@ class Date:
         spaces = date.count(" ")
         if spaces == 1:
             date = "01 " + date
-        date = pd.to_datetime(date, format="%d %b %Y")
-        return date
+        date = datetime.datetime.strptime(date, "%d %b %Y")
+        return to_date(date)
 
     def process_date_range(self, date_range):
         """
@@ -117,26 +175,28 @@ class Dates:
         self.dates = sorted(
             self.dates, key=lambda x: x.start if x.start is not None else 0, reverse=True)
 
-    def load(self, df: pd.DataFrame):
-        """
-        Add dates to the list of dates.
-        """
-        dates = df["Dates"].split(";")
-        dates = list(filter(None, dates))
-        for date in dates:
-            date_obj = Date()
-            if "-" in date:
-                date_obj.range = date
-                date_obj.process_date_range(date)
-            else:
-                date_obj.range = date
-                if len(date) == 4:
-                    date = "Jan " + date
-                date_obj.start = date_obj.format_date(date)
-                # end date is the current date
-                date_obj.end = pd.to_datetime("today")
-            self.add_date(date_obj)
-        self.sort_dates()
+    def load(self, df: dict, now=None):
+        """
+        Add dates to the list of dates. The dates without an end end at now,
+        the current time if None.
+        """
+        with phase("dates"):
+            dates = df["Dates"].split(";")
+            dates = list(filter(None, dates))
+            for date in dates:
+                date_obj = Date()
+                if "-" in date:
+                    date_obj.range = date
+                    date_obj.process_date_range(date)
+                else:
+                    date_obj.range = date
+                    if len(date) == 4:
+                        date = "Jan " + date
+                    date_obj.start = date_obj.format_date(date)
+                    # end date is the current date
+                    date_obj.end = to_date(datetime.datetime.now() if now is None else now)
+                self.add_date(date_obj)
+            self.sort_dates()
 
     def __iter__(self):
         return iter(self.dates)
@@ -1,7 +1,9 @@
 """
 This module contains the classes to represent the education data of an author.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
+from cvprocessor.trace import phase
 from cvprocessor.date.date import Dates
 from cvprocessor.links.links import Links
 
@@ -11,6 +13,8 @@ class Education:
     A class to represent the education data of an author.
     """
 
+    institute = None
+
     def __init__(self):
         self.degree = str()
         self.institution_id = int()
@@ -32,6 +36,12 @@ class Education:
         """
         return self.institution_id
 
+    def get_institute(self):
+        """
+        Get the institute of the education, None if its institution id does not resolve.
+        """
+        return self.institute
+
     def get_award(self):
         """
         Get the award.
@@ -104,16 +114,24 @@ class Educations:
         """
         Load the education data.
         """
-        education_df = pd.read_excel(filename, sheet_name="Education")
-        for _, row in education_df.iterrows():
+        self.educations = []
+        for row in read_rows(filename, "Education"):
             self.educations.append(Education())
             self.educations[-1].load(row)
-        self.educations = sorted(
-            self.educations, key=lambda x: x.dates.get_end(), reverse=True)
+        with phase("sort"):
+            self.educations = sorted(
+                self.educations, key=lambda x: x.dates.get_end(), reverse=True)
 
     def __repr__(self) -> str:
-        string = f"Education(educations={repr(self.educations)})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per education.
+        """
+        yield "Education(educations="
+        yield from iter_list_repr(self.educations)
+        yield ")"
 
     def __iter__(self):
         return iter(self.educations)
@@ -1,7 +1,9 @@
 """
 This module contains the ExperienceData and Experience classes.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
+from cvprocessor.trace import phase
 from cvprocessor.date.date import Dates
 
 
@@ -18,6 +20,8 @@ class ExperienceData:
     achievements (str): The achievements of the experience.
     """
 
+    institute = None
+
     def __init__(self):
         self.dates = Dates()
         self.position = str()
@@ -38,6 +42,12 @@ class ExperienceData:
         """
         return self.institution_id
 
+    def get_institute(self):
+        """
+        Get the institute of this experience, None if its institution id does not resolve.
+        """
+        return self.institute
+
     def get_description(self):
         """
         Get the description of this experience.
@@ -101,16 +111,24 @@ class Experience:
         """
         Load the experience data.
         """
-        experience_df = pd.read_excel(filename, sheet_name="Experience")
-        for _, row in experience_df.iterrows():
+        self.experiences = []
+        for row in read_rows(filename, "Experience"):
             self.experiences.append(ExperienceData())
             self.experiences[-1].load(row)
-        self.experiences = sorted(
-            self.experiences, key=lambda x: x.dates.get_end(), reverse=True)
+        with phase("sort"):
+            self.experiences = sorted(
+                self.experiences, key=lambda x: x.dates.get_end(), reverse=True)
 
     def __repr__(self) -> str:
-        string = f"Experience(experience={repr(self.experiences)})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per experience.
+        """
+        yield "Experience(experience="
+        yield from iter_list_repr(self.experiences)
+        yield ")"
 
     def __iter__(self):
         return iter(self.experiences)
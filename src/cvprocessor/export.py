@@ -0,0 +1,165 @@
+"""
+This module contains the functions to export a CV to machine-readable formats.
+
+to_data converts CV objects to JSON-compatible data. write_json and
+write_ndjson stream it: the document is written section by section and
+record by record, so that only one record is converted to data at a time.
+"""
+import datetime
+import json
+import math
+
+from cvprocessor.lazy import numpy as np
+from cvprocessor.reader.reader import isna
+
+# Attributes derived from the section data (indexes, joins, caches),
+# which are not exported.
+DERIVED_ATTRIBUTES = {
+    "columns",
+    "index",
+    "date_index",
+    "institute",
+    "institutes_by_id",
+    "authors_by_id",
+    "positions_by_title",
+    "load_stats",
+}
+
+
+def to_data(obj):
+    """
+    Convert a CV object to JSON-compatible data: dictionaries, lists,
+    strings, numbers and None.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str, datetime.date)):
+        return to_value(obj)
+    if isinstance(obj, dict):
+        return {str(key): to_data(value) for key, value in obj.items()}
+    if isinstance(obj, np.generic):
+        return to_value(obj)
+    if is_sequence(obj):
+        return [to_data(item) for item in obj]
+    if hasattr(obj, "__dict__"):
+        return {key: to_data(value) for key, value in get_attributes(obj)}
+    return str(obj)
+
+
+def to_value(obj):
+    """
+    Convert a scalar value, a number, string, date or NumPy scalar, to a
+    string, a number or None.
+    """
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+    if isinstance(obj, float):
+        return None if math.isnan(obj) else obj
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return None if isna(obj) else obj.isoformat()
+    if isinstance(obj, np.generic):
+        return to_value(obj.item())
+    return str(obj)
+
+
+def is_sequence(obj):
+    """
+    Check whether a CV object is exported as a list.
+    """
+    return isinstance(obj, (list, tuple, set, np.ndarray)) or hasattr(obj, "__getitem__")
+
+
+def get_attributes(obj):
+    """
+    Get the (name, value) of the exported attributes of a CV object.
+    """
+    return [(key, value) for key, value in vars(obj).items()
+            if not key.startswith("_") and key not in DERIVED_ATTRIBUTES]
+
+
+def get_members(obj):
+    """
+    Get ("{", (key, value) members) if obj is exported as a JSON object,
+    ("[", items) if it is exported as a list, None if it is exported as a
+    value, in the order of the checks of to_data.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str, datetime.date, np.generic)):
+        return None
+    if isinstance(obj, dict):
+        return "{", [(str(key), value) for key, value in obj.items()]
+    if is_sequence(obj):
+        return "[", obj
+    if hasattr(obj, "__dict__"):
+        return "{", get_attributes(obj)
+    return None
+
+
+def to_dict(cv):
+    """
+    Convert the loaded sections of a CV to a dictionary keyed by section name.
+    """
+    return {name: to_data(cv.get_section(name)) for name in cv.sections}
+
+
+def iter_json(obj, indent=None, depth=3, level=0):
+    """
+    Iterate over the chunks of the JSON document of obj, the same text as
+    json.dumps(to_data(obj)). The objects and lists of the first depth
+    levels are written member by member, the deeper ones at once.
+    """
+    members = None if depth == 0 else get_members(obj)
+    if members is None:
+        text = json.dumps(to_data(obj), indent=indent, ensure_ascii=False)
+        if indent is not None and level:
+            text = text.replace("\n", "\n" + " " * (indent * level))
+        yield text
+        return
+    opening, members = members
+    closing = "}" if opening == "{" else "]"
+    separator = ", " if indent is None else ",\n" + " " * (indent * (level + 1))
+    empty = True
+    for member in members:
+        yield (opening if indent is None else opening + separator[1:]) if empty else separator
+        empty = False
+        if opening == "{":
+            key, member = member
+            yield json.dumps(key, ensure_ascii=False) + ": "
+        yield from iter_json(member, indent, depth - 1, level + 1)
+    if empty:
+        yield opening + closing
+    else:
+        yield closing if indent is None else "\n" + " " * (indent * level) + closing
+
+
+def write_json(cv, file, indent=None):
+    """
+    Write the loaded sections of a CV as a JSON document to a text file,
+    one record at a time.
+    """
+    sections = {name: cv.get_section(name) for name in cv.sections}
+    for chunk in iter_json(sections, indent):
+        file.write(chunk)
+
+
+def iter_records(cv, sections=None):
+    """
+    Iterate over the (section name, record) of the loaded sections of a CV:
+    the items of the sections with items (publications, news items,
+    experiences...), the whole section for the others.
+    """
+    for name in cv.sections if sections is None else sections:
+        section = cv.get_section(name)
+        if hasattr(section, "__iter__"):
+            for record in section:
+                yield name, record
+        else:
+            yield name, section
+
+
+def write_ndjson(cv, file, sections=None):
+    """
+    Write the records of the loaded sections of a CV as newline-delimited
+    JSON, one {"section": name, "record": data} line per record.
+    """
+    for name, record in iter_records(cv, sections):
+        file.write(json.dumps({"section": name, "record": to_data(record)},
+                              ensure_ascii=False))
+        file.write("\n")
@@ -1,7 +1,9 @@
 """
 This module contains the GrantsAwards class and GrantsAwardsData class.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
+from cvprocessor.trace import phase
 
 from cvprocessor.date.date import Dates
 
@@ -22,6 +24,8 @@ class GrantsAwardsData:
     __repr__: Returns the string representation of the grants and awards data.
     """
 
+    institute = None
+
     def __init__(self):
         self.dates: Dates = Dates()
         self.description = str()
@@ -40,6 +44,12 @@ class GrantsAwardsData:
         """
         return self.institution_id
 
+    def get_institute(self):
+        """
+        Get the institute of the grant or award, None if its institution id does not resolve.
+        """
+        return self.institute
+
     def get_value(self):
         """
         Get the value of the grant or award.
@@ -93,17 +103,24 @@ class GrantsAwards:
         """
         Load the grants and awards data from the given file.
         """
-        grants_rewards_df = pd.read_excel(
-            filename, sheet_name="Grants_awards")
-        for _, row in grants_rewards_df.iterrows():
+        self.grants_awards = []
+        for row in read_rows(filename, "Grants_awards"):
             self.grants_awards.append(GrantsAwardsData())
             self.grants_awards[-1].load(row)
-        self.grants_awards = sorted(
-            self.grants_awards, key=lambda x: x.dates.get_start(), reverse=True)
+        with phase("sort"):
+            self.grants_awards = sorted(
+                self.grants_awards, key=lambda x: x.dates.get_start(), reverse=True)
 
     def __repr__(self) -> str:
-        string = f"GrantsAwards(grants_awards={repr(list(self.grants_awards))})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per grant or award.
+        """
+        yield "GrantsAwards(grants_awards="
+        yield from iter_list_repr(self.grants_awards)
+        yield ")"
 
     def __iter__(self):
         return iter(self.grants_awards)
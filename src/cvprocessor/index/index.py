@@ -0,0 +1,365 @@
+"""
+This module contains the index classes used to answer queries over the
+sections of the CV without scanning them.
+"""
+import heapq
+
+from cvprocessor.lazy import numpy as np
+from cvprocessor.reader.reader import isna
+
+
+class BitmapIndex:
+    """
+    A class to represent a bitmap index.
+
+    Each key maps to a bitmap (a Python int) whose bit i is set when the
+    item at position i has that key.
+
+    Attributes:
+    size (int): The number of indexed positions.
+    bitmaps (dict): The bitmap of each key.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.bitmaps = {}
+
+    def get_keys(self):
+        """
+        Get the indexed keys.
+        """
+        return self.bitmaps.keys()
+
+    def get(self, key):
+        """
+        Get the bitmap of the given key.
+        """
+        return self.bitmaps.get(key, 0)
+
+    def get_any(self, keys):
+        """
+        Get the union of the bitmaps of the given keys.
+        """
+        bitmap = 0
+        for key in keys:
+            bitmap |= self.get(key)
+        return bitmap
+
+    def get_all(self):
+        """
+        Get the bitmap with every position set.
+        """
+        return (1 << self.size) - 1
+
+    def to_bitmap(self, positions):
+        """
+        Build the bitmap of the given positions.
+        """
+        bits = bytearray((self.size + 7) // 8)
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(bits, "little")
+
+    @staticmethod
+    def positions(bitmap):
+        """
+        Get the positions set in the given bitmap, in ascending order.
+        """
+        positions = []
+        bits = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        for byte_index, byte in enumerate(bits):
+            while byte:
+                low = byte & -byte
+                positions.append((byte_index << 3) + low.bit_length() - 1)
+                byte ^= low
+        return positions
+
+    def load(self, values):
+        """
+        Load the index, values[i] being the keys of the item at position i.
+        """
+        key_positions = {}
+        for position, keys in enumerate(values):
+            for key in keys:
+                key_positions.setdefault(key, []).append(position)
+        self.size = len(values)
+        self.bitmaps = {key: self.to_bitmap(positions)
+                        for key, positions in key_positions.items()}
+
+    def __len__(self):
+        return len(self.bitmaps)
+
+    def __repr__(self):
+        string = (
+            f"BitmapIndex("
+            f"size={self.size}, "
+            f"keys={len(self.bitmaps)})"
+        )
+        return string
+
+
+class SortedIndex:
+    """
+    A class to represent a sorted index of dates.
+
+    The dates are kept as a sorted datetime64 array next to the positions of
+    their items, so range queries are answered with a binary search.
+    Results are returned newest first, ties in the order of the items.
+
+    Attributes:
+    keys (numpy.ndarray): The sorted dates.
+    positions (numpy.ndarray): The position of the item of each date.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype="datetime64[ns]")
+        self.positions = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def to_key(date):
+        """
+        Convert a date, timestamp or date string to an index key.
+        """
+        return np.datetime64(date, "ns")
+
+    def load(self, dates):
+        """
+        Load the index, dates[i] being the date of the item at position i.
+        """
+        keys = np.array(dates, dtype="datetime64[ns]")
+        positions = np.flatnonzero(~np.isnat(keys))
+        keys = keys[positions]
+        order = np.lexsort((-positions, keys))
+        self.keys = keys[order]
+        self.positions = positions[order]
+
+    def _newest_first(self, low, high):
+        """
+        Get the positions between the given key offsets, newest first.
+        """
+        return self.positions[low:high][::-1].tolist()
+
+    def between(self, start=None, end=None):
+        """
+        Get the positions of the items dated between start and end, inclusive.
+        """
+        low = 0
+        high = len(self.keys)
+        if start is not None:
+            low = np.searchsorted(self.keys, self.to_key(start), side="left")
+        if end is not None:
+            high = np.searchsorted(self.keys, self.to_key(end), side="right")
+        return self._newest_first(low, max(low, high))
+
+    def latest(self, num):
+        """
+        Get the positions of the num newest items.
+        """
+        return self._newest_first(max(len(self.keys) - num, 0), len(self.keys))
+
+    def before(self, date):
+        """
+        Get the positions of the items dated strictly before the given date.
+        """
+        high = np.searchsorted(self.keys, self.to_key(date), side="left")
+        return self._newest_first(0, high)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return f"SortedIndex(size={len(self.keys)})"
+
+
+class IntervalIndex:
+    """
+    A class to represent a centered interval tree over date ranges.
+
+    Each node keeps the intervals containing its center, sorted by start and
+    by end, so stabbing and overlap queries run in O(log n + k). The union of
+    the intervals is kept merged to answer gap queries with a binary search.
+
+    Attributes:
+    starts (numpy.ndarray): The start of each interval.
+    ends (numpy.ndarray): The end of each interval, open ended if NaT.
+    positions (numpy.ndarray): The position of the item of each interval.
+    nodes (list): The tree nodes as (center, by_start, by_end, left, right).
+    merged (list): The union of the intervals as sorted (start, end) pairs.
+    merged_ends (numpy.ndarray): The end of each merged interval.
+    """
+
+    def __init__(self):
+        self.starts = np.empty(0, dtype="datetime64[ns]")
+        self.ends = np.empty(0, dtype="datetime64[ns]")
+        self.positions = np.empty(0, dtype=np.int64)
+        self.nodes = []
+        self.merged = []
+        self.merged_ends = np.empty(0, dtype="datetime64[ns]")
+
+    def _build(self, intervals):
+        """
+        Build the subtree of the given intervals and return its node number.
+        """
+        if not intervals:
+            return -1
+        endpoints = sorted(
+            point for i in intervals for point in (self.starts[i], self.ends[i]))
+        center = endpoints[len(endpoints) // 2]
+        left = [i for i in intervals if self.ends[i] < center]
+        right = [i for i in intervals if self.starts[i] > center]
+        here = [i for i in intervals
+                if self.starts[i] <= center <= self.ends[i]]
+        node = len(self.nodes)
+        self.nodes.append(None)
+        self.nodes[node] = (
+            center,
+            sorted(here, key=lambda i: self.starts[i]),
+            sorted(here, key=lambda i: self.ends[i], reverse=True),
+            self._build(left),
+            self._build(right))
+        return node
+
+    def _merge(self):
+        """
+        Merge the intervals into their sorted union.
+        """
+        self.merged = []
+        for i in np.argsort(self.starts, kind="stable"):
+            start, end = self.starts[i], self.ends[i]
+            if self.merged and start <= self.merged[-1][1]:
+                if end > self.merged[-1][1]:
+                    self.merged[-1] = (self.merged[-1][0], end)
+            else:
+                self.merged.append((start, end))
+        self.merged_ends = np.array([interval[1] for interval in self.merged],
+                                    dtype="datetime64[ns]")
+
+    def load(self, intervals):
+        """
+        Load the index from (start, end, position) intervals.
+
+        Intervals without a start are skipped and a missing end leaves the
+        interval open ended.
+        """
+        intervals = [interval for interval in intervals
+                     if not isna(interval[0])]
+        self.starts = np.array([interval[0] for interval in intervals],
+                               dtype="datetime64[ns]")
+        ends = np.array([interval[1] for interval in intervals],
+                        dtype="datetime64[ns]")
+        open_end = np.datetime64(np.iinfo(np.int64).max, "ns")
+        self.ends = np.where(np.isnat(ends), open_end, ends)
+        self.positions = np.array([interval[2] for interval in intervals],
+                                  dtype=np.int64)
+        self.nodes = []
+        self._build(list(range(len(intervals))))
+        self._merge()
+
+    def _collect(self, start, end):
+        """
+        Get the intervals overlapping [start, end].
+        """
+        found = []
+        stack = [0] if self.nodes else []
+        while stack:
+            center, by_start, by_end, left, right = self.nodes[stack.pop()]
+            if end < center:
+                for i in by_start:
+                    if self.starts[i] > end:
+                        break
+                    found.append(i)
+                next_nodes = (left,)
+            elif start > center:
+                for i in by_end:
+                    if self.ends[i] < start:
+                        break
+                    found.append(i)
+                next_nodes = (right,)
+            else:
+                found.extend(by_start)
+                next_nodes = (left, right)
+            stack.extend(node for node in next_nodes if node != -1)
+        return found
+
+    def _newest_first(self, intervals):
+        """
+        Get the item positions of the intervals, newest start first, without
+        repeating an item.
+        """
+        positions = []
+        seen = set()
+        for i in sorted(intervals, key=lambda i: (self.starts[i], -i),
+                        reverse=True):
+            position = int(self.positions[i])
+            if position not in seen:
+                seen.add(position)
+                positions.append(position)
+        return positions
+
+    def stab(self, date):
+        """
+        Get the positions of the items active on the given date.
+        """
+        key = SortedIndex.to_key(date)
+        return self._newest_first(self._collect(key, key))
+
+    def overlap(self, start, end):
+        """
+        Get the positions of the items overlapping [start, end].
+        """
+        return self._newest_first(
+            self._collect(SortedIndex.to_key(start), SortedIndex.to_key(end)))
+
+    @staticmethod
+    def to_datetime(key):
+        """
+        Convert an index key back to a datetime.
+        """
+        return np.datetime64(key, "us").item()
+
+    def gaps(self, start=None, end=None):
+        """
+        Get the (start, end) periods within [start, end] not covered by any
+        interval, as datetimes.
+        """
+        if not self.merged:
+            return []
+        start = self.merged[0][0] if start is None else SortedIndex.to_key(start)
+        end = self.merged[-1][1] if end is None else SortedIndex.to_key(end)
+        first = int(np.searchsorted(self.merged_ends, start, side="left"))
+        gaps = []
+        cursor = start
+        for interval_start, interval_end in self.merged[first:]:
+            if interval_start > end:
+                break
+            if interval_start > cursor:
+                gaps.append((self.to_datetime(cursor), self.to_datetime(interval_start)))
+            cursor = max(cursor, interval_end)
+        if cursor < end:
+            gaps.append((self.to_datetime(cursor), self.to_datetime(end)))
+        return gaps
+
+    def overlapping_pairs(self):
+        """
+        Get the pairs of item positions whose intervals overlap each other.
+        """
+        pairs = []
+        seen = set()
+        active = []
+        for i in np.argsort(self.starts, kind="stable"):
+            heapq.heappush(active, (self.ends[i], int(i)))
+            while active[0][0] < self.starts[i]:
+                heapq.heappop(active)
+            for _, j in active:
+                pair = tuple(sorted((int(self.positions[i]),
+                                     int(self.positions[j]))))
+                if pair[0] != pair[1] and pair not in seen:
+                    seen.add(pair)
+                    pairs.append(pair)
+        return pairs
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __repr__(self):
+        return f"IntervalIndex(size={len(self.starts)}, nodes={len(self.nodes)})"
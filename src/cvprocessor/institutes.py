@@ -1,7 +1,8 @@
 """
 This module contains the classes to handle the data of the institutes.
 """
-import pandas as pd
+from cvprocessor.reader.reader import isna, read_rows
+from cvprocessor.render import iter_list_repr
 from cvprocessor.name.name import Name
 from cvprocessor.contact.contact import Contact
 from cvprocessor.links.links import Links
@@ -71,6 +72,7 @@ class Institutes:
 
     Attributes:
     institutes (list): A list of InstituteData objects.
+    institutes_by_id (dict): The institutes by ID.
 
     Methods:
     get_institute(): Get the institute by its ID.
@@ -79,6 +81,7 @@ class Institutes:
 
     def __init__(self):
         self.institutes = []
+        self.institutes_by_id = {}
 
     def get_institute(self, institute_id):
         """
@@ -86,24 +89,86 @@ class Institutes:
         """
         if isinstance(institute_id, str):
             institute_id = int(institute_id)
-        for institute in self.institutes:
-            if institute.get_id() == institute_id:
-                return institute
-        return None
+        return self.institutes_by_id.get(institute_id)
 
     def load(self, filename):
         """
         Load the institutes from the filename.
         """
-        institutes_df = pd.read_excel(filename, sheet_name="Institutes")
-        for _, institute in institutes_df.iterrows():
+        self.institutes = []
+        self.institutes_by_id = {}
+        for institute in read_rows(filename, "Institutes"):
             institute_data = InstituteData()
             institute_data.load(institute)
             self.institutes.append(institute_data)
+            self.institutes_by_id.setdefault(institute_data.get_id(),
+                                             institute_data)
 
     def __repr__(self):
-        string = f"Institutes(Institute={repr(self.institutes)})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per institute.
+        """
+        yield "Institutes(Institute="
+        yield from iter_list_repr(self.institutes)
+        yield ")"
 
     def __iter__(self):
         return iter(self.institutes)
+
+
+class InstituteJoins:
+    """
+    A class to resolve the institution ids of the records into institutes.
+
+    Each record gets its InstituteData set once, and the ids that do not
+    resolve are collected instead of being found at render time. Until
+    then, the institute of a record is the None of its class.
+
+    Attributes:
+    resolved (int): The number of records joined to an institute.
+    misses (list): The (section, record, institution id) of each miss.
+    """
+
+    def __init__(self):
+        self.resolved = 0
+        self.misses = []
+
+    def get_misses(self):
+        """
+        Get the (section, record, institution id) of the ids not found.
+        """
+        return self.misses
+
+    def resolve(self, institutes, section, records):
+        """
+        Set the institute of each record of the given section.
+        """
+        for record in records:
+            institution_id = record.get_institution_id()
+            missing = isna(institution_id) or institution_id == ""
+            institute = None
+            if not missing:
+                try:
+                    institute = institutes.get_institute(institution_id)
+                except ValueError:
+                    institute = None
+            # Records shared with a frozen snapshot already hold their institute.
+            if record.institute is not institute:
+                record.institute = institute
+            if missing:
+                continue
+            if institute is None:
+                self.misses.append((section, record, institution_id))
+            else:
+                self.resolved += 1
+
+    def __repr__(self):
+        string = (
+            f"InstituteJoins("
+            f"resolved={self.resolved}, "
+            f"misses={[(section, institution_id) for section, _, institution_id in self.misses]})"
+        )
+        return string
@@ -1,7 +1,7 @@
 """
 This module contains the class Intro, which is used to store the introduction
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
 
 
 class Intro:
@@ -46,10 +46,10 @@ class Intro:
         """
         Load the introduction from the given file.
         """
-        intro = pd.read_excel(filename, sheet_name="Intro")
-        self.short_summary = intro["Short summary"].values[0]
-        self.long_summary = intro["Welcome"].values[0]
-        self.tagline = intro["Tagline"].values[0]
+        intro = read_rows(filename, "Intro")[0]
+        self.short_summary = intro["Short summary"]
+        self.long_summary = intro["Welcome"]
+        self.tagline = intro["Tagline"]
 
     def __str__(self) -> str:
         string = f"Short summary: {self.short_summary}\n"
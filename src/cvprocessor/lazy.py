@@ -0,0 +1,43 @@
+"""
+This module contains the LazyModule class, a stand-in for a module that is
+only imported when one of its attributes is first used.
+
+Importing pandas takes hundreds of milliseconds, so the modules of this
+package use the lazy pandas and numpy below instead of importing them at
+top level. Code paths that never parse a sheet never pay for the import.
+"""
+import importlib
+
+
+class LazyModule:
+    """
+    A class to represent a module imported on first attribute access.
+
+    Attributes:
+    name (str): The name of the module.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._module = None
+
+    def load(self):
+        """
+        Import the module, if it is not imported yet, and return it.
+        """
+        if self._module is None:
+            self._module = importlib.import_module(self.name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__") or attribute == "_module":
+            raise AttributeError(attribute)
+        return getattr(self.load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"LazyModule(name={self.name}, {state})"
+
+
+pandas = LazyModule("pandas")
+numpy = LazyModule("numpy")
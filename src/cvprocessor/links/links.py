@@ -2,7 +2,7 @@
 Links class is used to store the links of the online presence of the user.
 """
 
-import pandas as pd
+from cvprocessor.reader.reader import isna
 
 link_types = {
     "website": "Website",
@@ -90,14 +90,14 @@ class Links:
         """
         self.links.append(link)
 
-    def load(self, df: pd.DataFrame):
+    def load(self, df: dict):
         """
         Add links to the list of links.
         """
         for link_type in link_types.values():
             if link_type not in df:
                 continue
-            if pd.isna(df[link_type]):
+            if isna(df[link_type]):
                 continue
             link = Link()
             link.type = link_type
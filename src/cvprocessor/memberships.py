@@ -1,7 +1,8 @@
 """
 This module contains the Memberships class and the MembershipData class.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr, quoted_repr
 
 from cvprocessor.date.date import Dates
 
@@ -11,7 +12,7 @@ class MembershipData:
     The MembershipData class is used to store the membership data.
 
     Attributes:
-    date (pd.Timestamp): The date of the membership.
+    date (datetime): The date of the membership.
     membership (str): The membership.
     """
 
@@ -48,15 +49,22 @@ class Memberships:
         """
         Load the memberships data.
         """
-        membership_df = pd.read_excel(
-            filename, sheet_name="Professional_memberships")
-        for _, row in membership_df.iterrows():
+        self.memberships = []
+        for row in read_rows(filename, "Professional_memberships"):
             membership = MembershipData()
             membership.load(row)
             self.memberships.append(membership)
 
     def __repr__(self):
-        return f"Memberships(memberships={repr(list(map(repr, self.memberships)))})\n"
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per membership.
+        """
+        yield "Memberships(memberships="
+        yield from iter_list_repr(self.memberships, quoted_repr)
+        yield ")\n"
 
     def __iter__(self):
         return iter(self.memberships)
@@ -0,0 +1,215 @@
+"""
+This module contains the functions to estimate the memory held by a CV,
+and the memory report which splits it by section, object type and
+attribute.
+"""
+import sys
+import types
+
+# Attributes which refer to the objects of another section, set by the
+# joins, and are not followed by the memory report.
+REFERENCE_ATTRIBUTES = {"institute"}
+
+
+def iter_referents(value):
+    """
+    Get the values referenced by a value of the CV graph: the items of the
+    containers, the attributes of the CV objects and the elements of object
+    arrays. Other objects are leaves.
+    """
+    if isinstance(value, dict):
+        return [item for pair in value.items() for item in pair]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    if getattr(value, "ndim", 0) and getattr(value, "dtype", None) == object:
+        return list(value.ravel())
+    if hasattr(value, "__dict__") and type(value).__module__.startswith("cvprocessor."):
+        return [vars(value)]
+    return []
+
+
+def estimate_size(obj):
+    """
+    Estimate the bytes held by an object and everything it references, with
+    sys.getsizeof. Shared objects are counted once, and NumPy arrays count
+    the data they own.
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen or isinstance(value, (type, types.ModuleType)):
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        stack.extend(iter_referents(value))
+    return total
+
+
+def _walk(root, stop):
+    """
+    Get id: (size, type name, attribute) of the values reachable from root,
+    without going through the ids in stop. The attribute is the name of the
+    nearest attribute of a CV object which holds the value.
+    """
+    found = {}
+    stack = [(root, None)]
+    while stack:
+        value, attribute = stack.pop()
+        if id(value) in found or id(value) in stop or isinstance(
+                value, (type, types.ModuleType)):
+            continue
+        found[id(value)] = (sys.getsizeof(value), type(value).__name__, attribute)
+        if (not isinstance(value, (dict, list, tuple, set, frozenset))
+                and hasattr(value, "__dict__")
+                and type(value).__module__.startswith("cvprocessor.")):
+            stack.extend((item, key) for key, item in vars(value).items()
+                         if key not in REFERENCE_ATTRIBUTES)
+        else:
+            stack.extend((item, attribute) for item in iter_referents(value))
+    return found
+
+
+class SectionMemory:
+    """
+    A class to represent the memory retained by a section of a CV.
+
+    Attributes:
+    name (str): The name of the section.
+    bytes (int): The estimated bytes only this section references.
+    objects (int): The number of objects only this section references.
+    types (dict): Type name: bytes.
+    attributes (dict): Attribute name: bytes, "abstract" for instance.
+    peak (int): The tracemalloc peak of its load in bytes, None if it was
+        not traced.
+    """
+
+    def __init__(self, name, peak=None):
+        self.name = name
+        self.bytes = 0
+        self.objects = 0
+        self.types = {}
+        self.attributes = {}
+        self.peak = peak
+
+    def add(self, size, type_name, attribute):
+        """
+        Add an object to the section.
+        """
+        self.bytes += size
+        self.objects += 1
+        self.types[type_name] = self.types.get(type_name, 0) + size
+        if attribute is not None:
+            self.attributes[attribute] = self.attributes.get(attribute, 0) + size
+
+    def get_types(self, count=None):
+        """
+        Get the (type name, bytes) of the section, largest first.
+        """
+        return sorted(self.types.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def get_attributes(self, count=None):
+        """
+        Get the (attribute name, bytes) of the section, largest first.
+        """
+        return sorted(self.attributes.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def __repr__(self):
+        return (f"SectionMemory(name={self.name}, bytes={self.bytes}, "
+                f"objects={self.objects}, peak={self.peak})")
+
+
+class MemoryReport:
+    """
+    A class to represent the memory held by a CV, by section.
+
+    Every object is attributed to the only section which references it;
+    objects referenced by several sections, such as the institutes joined to
+    the education records, are counted in shared instead, and the objects of
+    the CV outside the sections (timeline, joins) in other. The joined
+    institutes are counted in the institutes section.
+
+    Attributes:
+    sections (dict): Section name: SectionMemory, in load order.
+    shared (SectionMemory): The objects referenced by several sections.
+    other (SectionMemory): The objects of the CV outside the sections.
+    """
+
+    def __init__(self, sections, shared, other):
+        self.sections = sections
+        self.shared = shared
+        self.other = other
+
+    def get_section(self, name):
+        """
+        Get the memory of a section, None if it is not loaded.
+        """
+        return self.sections.get(name)
+
+    def get_total(self):
+        """
+        Get the estimated bytes held by the CV.
+        """
+        return (sum(section.bytes for section in self.sections.values())
+                + self.shared.bytes + self.other.bytes)
+
+    def get_types(self, count=None):
+        """
+        Get the (type name, bytes) of the whole CV, largest first.
+        """
+        totals = {}
+        for section in [*self.sections.values(), self.shared, self.other]:
+            for type_name, size in section.types.items():
+                totals[type_name] = totals.get(type_name, 0) + size
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def format(self, count=3):
+        """
+        Format the report as a table, one line per section with its largest
+        types and attributes.
+        """
+        lines = ["section\tbytes\tobjects\tpeak\ttop types\ttop attributes"]
+        for section in [*self.sections.values(), self.shared, self.other]:
+            lines.append("\t".join([
+                section.name, str(section.bytes), str(section.objects),
+                "" if section.peak is None else str(section.peak),
+                ", ".join(f"{name} {size}" for name, size in section.get_types(count)),
+                ", ".join(f"{name} {size}" for name, size in section.get_attributes(count))]))
+        lines.append(f"total\t{self.get_total()}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (f"MemoryReport(total={self.get_total()}, "
+                f"sections={list(self.sections.values())})")
+
+
+def memory_report(cv):
+    """
+    Estimate the memory retained by each loaded section of a CV, with its
+    breakdown by type and attribute. The tracemalloc peaks of the loads are
+    included when the CV was loaded with trace_memory.
+    """
+    roots = {name: cv.get_section(name) for name in cv.sections}
+    stats = getattr(cv, "load_stats", None)
+    sections = {}
+    for name in roots:
+        section_stats = stats.get_section(name) if stats is not None else None
+        sections[name] = SectionMemory(
+            name, None if section_stats is None else section_stats.peak)
+    shared = SectionMemory("shared")
+    other = SectionMemory("other")
+    # id: (SectionMemory, (size, type name, attribute)) of each object.
+    owners = {}
+    walks = [(sections[name], _walk(section, ())) for name, section in roots.items()]
+    reached = {key for _, found in walks for key in found}
+    walks.append((other, _walk(cv, reached)))
+    for owner, found in walks:
+        for key, value in found.items():
+            if key not in owners:
+                owners[key] = (owner, value)
+            elif owners[key][0] is not owner:
+                owners[key] = (shared, value)
+    for owner, value in owners.values():
+        owner.add(*value)
+    return MemoryReport(sections, shared, other)
@@ -1,8 +1,11 @@
 """
 This module contains the classes to handle news data.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_lines
+from cvprocessor.aio import aiter_section
 from cvprocessor.links.links import Links
+from cvprocessor.index.index import SortedIndex
 
 
 class NewsData:
@@ -12,6 +15,7 @@ class NewsData:
     Attributes:
     title (str): The title of the news item.
     date (str): The date of the news item.
+    timestamp (datetime): The date of the news item as a timestamp.
     description (str): The description of the news item.
     resources (NewsResources): The resources for the news item.
     """
@@ -19,6 +23,7 @@ class NewsData:
     def __init__(self):
         self.title = str()
         self.date = str()
+        self.timestamp = None
         self.description = str()
         self.links = Links()
 
@@ -34,6 +39,12 @@ class NewsData:
         """
         return self.date
 
+    def get_timestamp(self):
+        """
+        Get the date of the news item as a timestamp.
+        """
+        return self.timestamp
+
     def get_description(self):
         """
         Get the description of the news item.
@@ -45,8 +56,8 @@ class NewsData:
         Load the news data from a Pandas DataFrame.
         """
         self.title = pd_dataframe["Title"]
-        self.date = pd_dataframe["Date"]
-        self.date = self.date.strftime("%b %d, %Y")
+        self.timestamp = pd_dataframe["Date"]
+        self.date = self.timestamp.strftime("%b %d, %Y")
         self.description = pd_dataframe["Description"]
         self.links.load(pd_dataframe)
 
@@ -67,6 +78,7 @@ class News:
 
     Attributes:
     news (list): A list of NewsData objects.
+    date_index (SortedIndex): The news items sorted by date.
 
     Methods:
     __init__(filename): Initializes the News class by loading the news data from the given file.
@@ -76,21 +88,44 @@ class News:
 
     def __init__(self):
         self.news = []
+        self.date_index = SortedIndex()
+
+    def between(self, start=None, end=None):
+        """
+        Get the news items dated between start and end (inclusive), newest first.
+        """
+        return [self.news[i] for i in self.date_index.between(start, end)]
+
+    def latest(self, num):
+        """
+        Get the num newest news items.
+        """
+        return [self.news[i] for i in self.date_index.latest(num)]
+
+    def before(self, date):
+        """
+        Get the news items dated strictly before the given date, newest first.
+        """
+        return [self.news[i] for i in self.date_index.before(date)]
 
     def load(self, filename):
         """
         Load the news data from the given file.
         """
-        news_df = pd.read_excel(filename, sheet_name="News")
-        for _, row in news_df.iterrows():
+        self.news = []
+        for row in read_rows(filename, "News"):
             self.news.append(NewsData())
             self.news[-1].load(row)
+        self.date_index.load([news.get_timestamp() for news in self.news])
 
     def __str__(self):
-        string = ""
-        for news in self.news:
-            string += str(news) + "\n"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one line per news item.
+        """
+        return iter_lines(self.news)
 
     def __repr__(self):
         string = f"News(news={repr(self.news)})\n"
@@ -98,3 +133,10 @@ class News:
 
     def __iter__(self):
         return iter(self.news)
+
+    def aiter(self, batch_size=100):
+        """
+        Iterate asynchronously over the news items, waiting for them when the
+        CV is being loaded with CV.aopen.
+        """
+        return aiter_section(self, batch_size)
@@ -0,0 +1,486 @@
+"""
+This module contains the single-pass export pipeline of CVs.
+
+An Exporter walks the records of the loaded sections once and fans each
+record out to its sinks: NDJSON, BibTeX, HTML, a plain-text summary, or
+any Sink subclass. The values derived from a record (its JSON data, the
+aliases of its authors, its APA citation, its institute, its formatted
+dates) are computed by its ExportRecord on the first sink asking for them
+and shared by the others, as are the author aliases of the CV.
+"""
+import html
+import json
+import re
+
+from cvprocessor.export import iter_records, to_data
+from cvprocessor.publications import format_apa_authors
+from cvprocessor.reader.reader import isna, notna
+
+# Section name: heading of the section in the HTML and text outputs.
+SECTION_TITLES = {
+    "education": "Education",
+    "institutes": "Institutes",
+    "software": "Software",
+    "intro": "Intro",
+    "authors": "Authors",
+    "news": "News",
+    "publications": "Publications",
+    "research_interests": "Research Interests",
+    "grants_awards": "Grants & Awards",
+    "teaching": "Teaching",
+    "supervision": "Supervision",
+    "experience": "Experience",
+    "skills": "Skills",
+    "service": "Service",
+    "memberships": "Memberships",
+    "presentations": "Presentations",
+    "references": "References",
+}
+
+# Attributes holding the title of a record, by priority.
+TITLE_ATTRIBUTES = ("title", "degree", "position", "membership", "venue", "name",
+                    "description", "short_summary", "research_interests")
+
+# Publication type: BibTeX entry type and field of the venue.
+BIBTEX_TYPES = {
+    "Journal Article": ("article", "journal"),
+    "Conference Paper": ("inproceedings", "booktitle"),
+    "Book Chapter": ("incollection", "booktitle"),
+    "Thesis": ("phdthesis", "school"),
+}
+
+BIBTEX_SPECIAL = re.compile(r"([&%$#_])")
+
+
+def get_text(value):
+    """
+    Get value if it is a non-empty string, None otherwise (NaN cells...).
+    """
+    return value if isinstance(value, str) and value else None
+
+
+class ExportRecord:
+    """
+    A class to represent a record being exported, with the values derived
+    from it, each computed once on first use.
+
+    Attributes:
+    section (str): The name of the section of the record.
+    position (int): The position of the record in its section.
+    record (object): The record.
+    exporter (Exporter): The exporter of the record.
+
+    Methods:
+    get_data: Get the JSON-compatible data of the record.
+    get_authors: Get the aliases of the authors of a publication.
+    get_citation: Get the APA citation of a publication.
+    get_title: Get the title of the record.
+    get_institute: Get the institute joined to the record.
+    get_dates: Get the formatted dates of the record.
+    get_year: Get the start year of the record.
+    """
+
+    def __init__(self, section, position, record, exporter):
+        self.section = section
+        self.position = position
+        self.record = record
+        self.exporter = exporter
+        self._values = {}
+
+    def _get(self, name, compute):
+        if name not in self._values:
+            self._values[name] = compute()
+        return self._values[name]
+
+    def _get_subject(self):
+        # The titles and dates of publications are in their details, those
+        # of teaching and supervision records in their course or degree.
+        if self.section == "publications":
+            return self.record.details
+        return getattr(self.record, "education", self.record)
+
+    def get_data(self):
+        """
+        Get the JSON-compatible data of the record, as exported by to_data.
+        """
+        return self._get("data", lambda: to_data(self.record))
+
+    def get_authors(self):
+        """
+        Get the aliases of the authors of a publication, [] for the other
+        records and when the authors are not loaded.
+        """
+        def compute():
+            if self.section != "publications":
+                return []
+            aliases = self.exporter.get_aliases()
+            return [aliases[ids.get_author_id()] for ids in self.record.get_auth_id_aff_id()
+                    if ids.get_author_id() in aliases]
+        return self._get("authors", compute)
+
+    def get_citation(self):
+        """
+        Get the APA citation of a publication, the same as
+        CV.get_publications_apa_citation, None for the other records.
+        """
+        def compute():
+            if self.section != "publications":
+                return None
+            return format_apa_authors(self.get_authors()) + " " + self.record.get_apa_citation()
+        return self._get("citation", compute)
+
+    def get_title(self):
+        """
+        Get the title of the record: the name of authors and references
+        ("Author <id>" when they have none), the first of the title, degree,
+        position... attributes with a value of the others.
+        """
+        def compute():
+            if self.section == "authors":
+                personal = self.record.personal
+                return (get_text(personal.get_preferred_name()) or get_text(personal.get_alias())
+                        or f"Author {self.record.get_id()}")
+            if self.section == "references":
+                author_id = self.record.get_author_id()
+                return get_text(self.exporter.get_aliases().get(author_id)) or f"Author {author_id}"
+            subject = self._get_subject()
+            for attribute in TITLE_ATTRIBUTES:
+                value = getattr(subject, attribute, None)
+                if hasattr(value, "get_name"):
+                    value = value.get_name()
+                if get_text(value):
+                    return value
+            return None
+        return self._get("title", compute)
+
+    def get_institute(self):
+        """
+        Get the name of the institute joined to the record, None when the
+        record has none or the institutes are not loaded.
+        """
+        def compute():
+            institute = getattr(self._get_subject(), "institute", None)
+            return None if institute is None else get_text(institute.name.get_name())
+        return self._get("institute", compute)
+
+    def get_dates(self):
+        """
+        Get the dates of the record as written in the CV ("Jan 2017 - Dec
+        2020; 2021"), None when the record has none.
+        """
+        def compute():
+            subject = self._get_subject()
+            dates = getattr(subject, "dates", None)
+            if dates is not None:
+                ranges = [date.get_range() for date in dates.dates if notna(date.get_range())]
+                return "; ".join(ranges) or None
+            date = getattr(subject, "date", None)
+            if isinstance(date, str):
+                return date
+            if date is not None and notna(date.get_start()):
+                return date.get_start().strftime("%b %Y")
+            return None
+        return self._get("dates", compute)
+
+    def get_year(self):
+        """
+        Get the start year of the record, None when it has no dates.
+        """
+        def compute():
+            subject = self._get_subject()
+            dates = getattr(subject, "dates", None)
+            if dates is None or not dates.dates:
+                return None
+            start = dates.get_start()
+            return None if isna(start) else int(start.year)
+        return self._get("year", compute)
+
+    def __repr__(self):
+        return f"ExportRecord(section={self.section}, position={self.position})"
+
+
+class Sink:
+    """
+    The Sink class is the base class of the outputs of an Exporter.
+
+    Methods:
+    start: Start the export of a CV.
+    start_section: Start a section.
+    write: Write a record.
+    end_section: End a section.
+    end: End the export.
+    """
+
+    def start(self, exporter):
+        """
+        Start the export of the CV of exporter.
+        """
+
+    def start_section(self, name):
+        """
+        Start a section, before its records.
+        """
+
+    def write(self, record):
+        """
+        Write an ExportRecord.
+        """
+        raise NotImplementedError
+
+    def end_section(self, name):
+        """
+        End a section, after its records.
+        """
+
+    def end(self):
+        """
+        End the export.
+        """
+
+
+class NdjsonSink(Sink):
+    """
+    The NdjsonSink class writes the records as newline-delimited JSON, the
+    same lines as export.write_ndjson.
+
+    Attributes:
+    file (file): The text file object written to.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, record):
+        self.file.write(json.dumps({"section": record.section, "record": record.get_data()},
+                                   ensure_ascii=False))
+        self.file.write("\n")
+
+
+class BibtexSink(Sink):
+    """
+    The BibtexSink class writes the publications as BibTeX entries, keyed
+    by the last name of the first author, the year and the first word of
+    the title.
+
+    Attributes:
+    file (file): The text file object written to.
+    keys (set): The keys of the entries written.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.keys = set()
+
+    def _get_key(self, record):
+        authors = record.get_authors()
+        lastname = get_text(authors[0]).split(",")[0] if authors and get_text(authors[0]) else ""
+        words = (record.get_title() or "").split()
+        key = re.sub(r"\W", "", f"{lastname}{record.get_year() or ''}{words[0] if words else ''}")
+        key = key or "publication"
+        unique, suffix = key, ord("a")
+        while unique in self.keys:
+            unique, suffix = key + chr(suffix), suffix + 1
+        self.keys.add(unique)
+        return unique
+
+    def write(self, record):
+        if record.section != "publications":
+            return
+        publication = record.record
+        entry_type, venue_field = BIBTEX_TYPES.get(
+            publication.details.get_type(), ("misc", "howpublished"))
+        venue, pages = publication.details.venue, publication.details.pages
+        page_range = "--".join(str(bibtex_value(page)) for page in (
+            pages.get_page_start(), pages.get_page_end()) if bibtex_value(page) is not None)
+        doi = publication.links.get_link("DOI")
+        fields = (
+            ("title", record.get_title()),
+            ("author", " and ".join(filter(get_text, record.get_authors()))),
+            (venue_field, venue.get_venue()),
+            ("year", record.get_year()),
+            ("volume", venue.get_volume()),
+            ("number", venue.get_issue()),
+            ("pages", page_range),
+            ("doi", doi.get_url() if doi is not None else None),
+        )
+        lines = [f"@{entry_type}{{{self._get_key(record)},"]
+        for name, value in fields:
+            value = bibtex_value(value)
+            if value is not None and value != "":
+                lines.append(f"  {name} = {{{bibtex_escape(value)}}},")
+        self.file.write("\n".join(lines) + "\n}\n\n")
+
+
+class HtmlSink(Sink):
+    """
+    The HtmlSink class writes an HTML page with a list per section: the
+    citation of each publication, the title, dates and institute of the
+    other records.
+
+    Attributes:
+    file (file): The text file object written to.
+    title (str): The title of the page.
+    """
+
+    def __init__(self, file, title="CV"):
+        self.file = file
+        self.title = title
+
+    def start(self, exporter):
+        self.file.write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                        f"<title>{html.escape(self.title)}</title>\n</head>\n<body>\n")
+
+    def start_section(self, name):
+        self.file.write(f'<section id="{html.escape(name)}">\n'
+                        f"<h2>{html.escape(SECTION_TITLES.get(name, name))}</h2>\n<ul>\n")
+
+    def write(self, record):
+        text = html.escape((record.get_citation() or record.get_title() or "").strip())
+        for name, value in (("dates", record.get_dates()), ("institute", record.get_institute())):
+            if value is not None:
+                text += f' <span class="{name}">{html.escape(value)}</span>'
+        self.file.write(f"<li>{text}</li>\n")
+
+    def end_section(self, name):
+        self.file.write("</ul>\n</section>\n")
+
+    def end(self):
+        self.file.write("</body>\n</html>\n")
+
+
+class TextSink(Sink):
+    """
+    The TextSink class writes a plain-text summary: a heading per section
+    and a line per record, with the citation of the publications and the
+    title, dates and institute of the other records.
+
+    Attributes:
+    file (file): The text file object written to.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def start_section(self, name):
+        self.file.write(f"{SECTION_TITLES.get(name, name)}\n")
+
+    def write(self, record):
+        details = [value for value in (record.get_dates(), record.get_institute())
+                   if value is not None]
+        line = (record.get_citation() or record.get_title() or "").strip()
+        if details:
+            line += f" ({', '.join(details)})"
+        self.file.write(f"  {line}\n")
+
+    def end_section(self, name):
+        self.file.write("\n")
+
+
+# Format name: Sink class writing it to a file object.
+SINKS = {
+    "ndjson": NdjsonSink,
+    "bibtex": BibtexSink,
+    "html": HtmlSink,
+    "text": TextSink,
+}
+
+
+def bibtex_escape(value):
+    """
+    Escape the LaTeX special characters of a BibTeX field value.
+    """
+    return BIBTEX_SPECIAL.sub(r"\\\1", str(value))
+
+
+def bibtex_value(value):
+    """
+    Get the BibTeX text of a value: None for missing values, integers for
+    whole numbers.
+    """
+    if value is None or isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class Exporter:
+    """
+    A class to export a CV to several sinks in one pass over its records.
+
+    Attributes:
+    cv (CV): The exported CV.
+    sections (list): The exported sections, None for the loaded ones.
+    sinks (list): The sinks.
+
+    Methods:
+    add_sink: Add a sink.
+    get_aliases: Get the alias of each author id.
+    run: Export the records to the sinks.
+    """
+
+    def __init__(self, cv, sections=None):
+        self.cv = cv
+        self.sections = sections
+        self.sinks = []
+        self._aliases = None
+
+    def add_sink(self, sink):
+        """
+        Add a sink, and return it.
+        """
+        self.sinks.append(sink)
+        return sink
+
+    def get_aliases(self):
+        """
+        Get the alias of each author id, computed once for the export: the
+        alias of the first author of each id, as Authors.get_author finds.
+        """
+        if self._aliases is None:
+            self._aliases = {}
+            if "authors" in self.cv.sections:
+                for author in self.cv.personal.authors:
+                    self._aliases.setdefault(author.get_id(), author.personal.get_alias())
+        return self._aliases
+
+    def run(self):
+        """
+        Export the records to every sink, and return the number of records.
+        """
+        for sink in self.sinks:
+            sink.start(self)
+        section, count, position = None, 0, 0
+        for name, record in iter_records(self.cv, self.sections):
+            if name != section:
+                if section is not None:
+                    for sink in self.sinks:
+                        sink.end_section(section)
+                section, position = name, 0
+                for sink in self.sinks:
+                    sink.start_section(name)
+            export_record = ExportRecord(name, position, record, self)
+            for sink in self.sinks:
+                sink.write(export_record)
+            position += 1
+            count += 1
+        if section is not None:
+            for sink in self.sinks:
+                sink.end_section(section)
+        for sink in self.sinks:
+            sink.end()
+        return count
+
+    def __repr__(self):
+        return f"Exporter(sections={self.sections}, sinks={self.sinks})"
+
+
+def export(cv, sinks, sections=None):
+    """
+    Export the loaded sections of a CV, or the given ones, to the given
+    sinks in one pass. Returns the number of records.
+    """
+    exporter = Exporter(cv, sections)
+    for sink in sinks:
+        exporter.add_sink(sink)
+    return exporter.run()
@@ -2,9 +2,13 @@
 This module contains the classes and methods to process the presentations data from the CV.
 """
 
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr, quoted_repr
+from cvprocessor.trace import phase
+from cvprocessor.aio import aiter_section
 from cvprocessor.date.date import Date
 from cvprocessor.links.links import Link
+from cvprocessor.index.index import SortedIndex
 
 
 class Presentation:
@@ -19,6 +23,8 @@ class Presentation:
     slides (str): The slides of the presentation.
     """
 
+    institute = None
+
     def __init__(self):
         self.date = Date()
         self.title = str()
@@ -38,6 +44,12 @@ class Presentation:
         """
         return self.institution_id
 
+    def get_institute(self):
+        """
+        Get the institute of this presentation, None if its institution id does not resolve.
+        """
+        return self.institute
+
     def get_event(self):
         """
         Get the event of this presentation.
@@ -55,7 +67,8 @@ class Presentation:
         Load the presentation data from the given filename.
         """
         self.title = filename["Title"]
-        self.date.start = self.date.format_date(filename["Date"])
+        with phase("dates"):
+            self.date.start = self.date.format_date(filename["Date"])
         self.institution_id = filename["Institution id"]
         self.event = filename["Event"]
         self.slides.type = "Slides"
@@ -86,10 +99,12 @@ class Presentations:
 
     Attributes:
     presentations (list): The list of Presentation objects.
+    date_index (SortedIndex): The presentations sorted by date.
     """
 
     def __init__(self):
         self.presentations = []
+        self.date_index = SortedIndex()
 
     def get_presentations(self):
         """
@@ -103,23 +118,54 @@ class Presentations:
         """
         return sorted(self.presentations, key=lambda x: x.date.get_start(), reverse=True)
 
+    def between(self, start=None, end=None):
+        """
+        Get the presentations dated between start and end (inclusive), newest first.
+        """
+        return [self.presentations[i] for i in self.date_index.between(start, end)]
+
+    def latest(self, num):
+        """
+        Get the num newest presentations.
+        """
+        return [self.presentations[i] for i in self.date_index.latest(num)]
+
+    def before(self, date):
+        """
+        Get the presentations dated strictly before the given date, newest first.
+        """
+        return [self.presentations[i] for i in self.date_index.before(date)]
+
     def load(self, filename):
         """
         Load the presentation data from the given filename.
         """
-        presentations_df = pd.read_excel(
-            filename, sheet_name="Presentations")
-        for _, row in presentations_df.iterrows():
+        self.presentations = []
+        for row in read_rows(filename, "Presentations"):
             self.presentations.append(Presentation())
             self.presentations[-1].load(row)
-        self.presentations.sort(key=lambda x: x.date.get_start(), reverse=True)
+        with phase("sort"):
+            self.presentations.sort(key=lambda x: x.date.get_start(), reverse=True)
+        self.date_index.load([presentation.date.get_start()
+                              for presentation in self.presentations])
 
     def __repr__(self):
-        string = (
-            f"Presentations("
-            f"presentations={list(map(repr, self.presentations))})"
-        )
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per presentation.
+        """
+        yield "Presentations(presentations="
+        yield from iter_list_repr(self.presentations, quoted_repr)
+        yield ")"
 
     def __iter__(self):
         return iter(self.presentations)
+
+    def aiter(self, batch_size=100):
+        """
+        Iterate asynchronously over the presentations, waiting for them when the
+        CV is being loaded with CV.aopen.
+        """
+        return aiter_section(self, batch_size)
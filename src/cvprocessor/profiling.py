@@ -0,0 +1,143 @@
+"""
+This module contains the profiling of CV loads, for reports of slow loads.
+
+profile_load loads a CV under cProfile, whose statistics are written as a
+pstats file (for pstats, snakeviz...) and summarized as the hot functions
+of the package. cProfile only records callers one level up, so the stacks
+of flame graphs are sampled instead by a thread which reads the stack of
+the loading thread at a fixed interval; they are written in the collapsed
+format of flamegraph.pl and speedscope, one "frame;frame;frame count" line
+per stack.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+
+from cvprocessor.cv import CV
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def frame_label(filename, line, name):
+    """
+    Get the label of a function in the outputs: its name and its file,
+    relative to the package for the package modules.
+    """
+    if filename.startswith(PACKAGE_DIRECTORY):
+        filename = "cvprocessor" + filename[len(PACKAGE_DIRECTORY):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{name} ({filename}:{line})"
+
+
+class StackSampler:
+    """
+    A class to sample the stack of a thread at a fixed interval.
+
+    Attributes:
+    thread_id (int): The identifier of the sampled thread.
+    interval (float): The sampling interval in seconds.
+    stacks (dict): Collapsed stack: number of samples.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pylint: disable=protected-access
+            labels = []
+            while frame is not None:
+                code = frame.f_code
+                labels.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if labels:
+                stack = ";".join(reversed(labels))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            del frame
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+class LoadProfile:
+    """
+    A class to represent the profile of CV loads.
+
+    Attributes:
+    stats (pstats.Stats): The cProfile statistics.
+    stacks (dict): Collapsed stack: number of samples.
+    interval (float): The sampling interval of the stacks in seconds.
+    """
+
+    def __init__(self, stats, stacks, interval):
+        self.stats = stats
+        self.stacks = stacks
+        self.interval = interval
+
+    def write_pstats(self, path):
+        """
+        Write the cProfile statistics as a pstats file.
+        """
+        self.stats.dump_stats(path)
+
+    def write_collapsed(self, file):
+        """
+        Write the sampled stacks in the collapsed format, to a file object.
+        """
+        for stack, count in sorted(self.stacks.items()):
+            file.write(f"{stack} {count}\n")
+
+    def get_hot_functions(self, count=20, package_only=True):
+        """
+        Get the (function label, calls, own seconds, cumulative seconds) of
+        the functions with the most own time, of the package only by default.
+        """
+        functions = []
+        for function, (_, calls, own, cumulative, _) in self.stats.stats.items():
+            if package_only and not function[0].startswith(PACKAGE_DIRECTORY):
+                continue
+            functions.append((frame_label(*function), calls, own, cumulative))
+        functions.sort(key=lambda function: function[2], reverse=True)
+        return functions[:count]
+
+    def format_hot_functions(self, count=20):
+        """
+        Format the hot functions of the package as a table.
+        """
+        lines = ["calls\town ms\tcumulative ms\tfunction"]
+        for label, calls, own, cumulative in self.get_hot_functions(count):
+            lines.append(f"{calls}\t{own * 1000:.2f}\t{cumulative * 1000:.2f}\t{label}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (f"LoadProfile(functions={len(self.stats.stats)}, "
+                f"samples={sum(self.stacks.values())})")
+
+
+def profile_load(filename, *, repeat=1, interval=0.001, **options):
+    """
+    Load a CV repeat times, with the CV load options, under cProfile and a
+    stack sampler, and return the LoadProfile. Repeating the load gives
+    small workbooks enough samples.
+    """
+    profiler = cProfile.Profile()
+    with StackSampler(threading.get_ident(), interval) as sampler:
+        profiler.enable()
+        try:
+            for _ in range(repeat):
+                CV(filename, **options)
+        finally:
+            profiler.disable()
+    return LoadProfile(pstats.Stats(profiler), sampler.stacks, interval)
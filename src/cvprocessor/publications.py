@@ -1,10 +1,29 @@
 """
 This module contains the classes and methods to process the publications data from the CV file.
 """
-import pandas as pd
+from collections.abc import Sequence
+import datetime
+import weakref
 
+from cvprocessor.lazy import numpy as np
 from cvprocessor.links.links import Links
-from cvprocessor.date.date import Dates
+from cvprocessor.date.date import Dates, timestamps, to_date, uses_timestamps
+from cvprocessor.index.index import BitmapIndex, SortedIndex
+from cvprocessor.reader.reader import isna, notna, read_rows, unique
+from cvprocessor.render import iter_list_repr, quoted_repr
+from cvprocessor.trace import phase
+from cvprocessor.aio import aiter_section
+
+
+def format_apa_authors(aliases):
+    """
+    Format the aliases of the authors of a publication for its APA
+    citation: "A, B, & C".
+    """
+    aliases = list(aliases)
+    if len(aliases) > 1:
+        aliases[-1] = "& " + aliases[-1]
+    return ", ".join(aliases)
 
 
 class Source:
@@ -157,12 +176,12 @@ class Details:
         """
         return self.keywords
 
-    def load(self, filename):
+    def load(self, filename, now=None):
         """
         Load the publication details from the file.
         """
         self.title = filename["Title"]
-        self.dates.load(filename)
+        self.dates.load(filename, now)
         self.venue.load(filename)
         self.pages.load(filename)
         self.type = filename["Document Type"]
@@ -296,11 +315,12 @@ class PublicationsData:
         """
         return self.auth_id_aff_id
 
-    def load(self, filename):
+    @staticmethod
+    def parse_authors(authors_string):
         """
-        Load the publication data from the file.
+        Parse the authors string into a list of author IDs and affiliation IDs.
         """
-        authors_list = filename["Authors"].split(",")
+        authors_list = authors_string.split(",")
         authors = []
         for author in authors_list:
             if "(" in author:
@@ -316,8 +336,15 @@ class PublicationsData:
             if author_affiliation is not None:
                 for affiliation in author_affiliation:
                     authors[-1].add_affiliation_id(int(affiliation))
-        self.auth_id_aff_id = authors
-        self.details.load(filename)
+        return authors
+
+    def load(self, filename, now=None):
+        """
+        Load the publication data from the file; now is the end of the
+        open-ended dates, the current time if None.
+        """
+        self.auth_id_aff_id = self.parse_authors(filename["Authors"])
+        self.details.load(filename, now)
         self.links.load(filename)
         self.rights.load(filename)
 
@@ -327,21 +354,21 @@ class PublicationsData:
         """
         citation = ""
         start_date = self.details.dates.get_start()
-        if pd.notna(start_date):
+        if notna(start_date):
             citation += f"({int(start_date.year)}). "
-        if pd.notna(self.details.get_title()):
+        if notna(self.details.get_title()):
             citation += f"{self.details.get_title()}. "
-        if pd.notna(self.details.venue.get_venue()):
+        if notna(self.details.venue.get_venue()):
             citation += f"{self.details.venue.get_venue()}"
-        if pd.notna(self.details.venue.get_volume()):
+        if notna(self.details.venue.get_volume()):
             citation += f", {int(self.details.venue.get_volume())}"
-        if pd.notna(self.details.venue.get_issue()):
+        if notna(self.details.venue.get_issue()):
             citation += f"({int(self.details.venue.get_issue())})"
-        if pd.notna(self.details.venue.get_artno()):
+        if notna(self.details.venue.get_artno()):
             citation += f"{self.details.venue.get_artno()}"
-        if pd.notna(self.details.pages.get_page_start()):
+        if notna(self.details.pages.get_page_start()):
             citation += f", pp. {int(self.details.pages.get_page_start())}"
-        if pd.notna(self.details.pages.get_page_end()):
+        if notna(self.details.pages.get_page_end()):
             citation += f"-{int(self.details.pages.get_page_end())}"
         doi = self.links.get_link("DOI")
         if doi is not None:
@@ -360,12 +387,306 @@ class PublicationsData:
         return string
 
 
+class PublicationsColumns:
+    """
+    A class to represent the publications as columns, one array per field.
+
+    Every column of the Publications sheet is kept once, as an array of its
+    cells, from which PublicationsData objects are materialized on demand;
+    the fields queried by Publications are the same arrays under a name,
+    given by get_field.
+
+    Attributes:
+    cells (dict): Sheet column name: the cells of the column.
+    start (numpy.ndarray): The start dates of the publications.
+    year (numpy.ndarray): The years of the publications, NaN if unknown.
+    author_ids (numpy.ndarray): The author IDs of all publications, in order.
+    author_offsets (numpy.ndarray): The offsets of each publication in author_ids.
+    loaded (datetime): The load time, the end of the open-ended dates.
+    timestamps (bool): Whether the dates are pandas Timestamps, as with the
+        pandas engine.
+    """
+
+    fields = {
+        "title": "Title",
+        "venue": "Source",
+        "type": "Document Type",
+        "volume": "Volume",
+        "issue": "Issue",
+        "page_start": "Page start",
+        "page_end": "Page end",
+        "doi": "DOI",
+    }
+
+    def __init__(self):
+        self.cells = {}
+        self.start = np.empty(0, dtype="datetime64[us]")
+        self.year = np.empty(0, dtype=np.float64)
+        self.author_ids = np.empty(0, dtype=np.int64)
+        self.author_offsets = np.zeros(1, dtype=np.int64)
+        self.loaded = None
+        self.timestamps = False
+
+    def __len__(self):
+        return len(self.start)
+
+    def get_field(self, field):
+        """
+        Get the cells of a field of the publications, "title" for instance.
+        """
+        column = self.fields[field]
+        return self.cells[column] if column in self.cells else np.empty(0, dtype=object)
+
+    def get_row(self, index):
+        """
+        Get the row of the publication at the given index, column name: cell.
+        """
+        return {column: cells[index] for column, cells in self.cells.items()}
+
+    def get_starts(self):
+        """
+        Get the start date of each publication, of the date type of the
+        reader they were loaded from.
+        """
+        with timestamps(self.timestamps):
+            return [to_date(start) for start in self.start.tolist()]
+
+    def get_first_author_ids(self):
+        """
+        Get the ID of the first author of each publication.
+        """
+        return self.author_ids[self.author_offsets[:-1]]
+
+    def load(self, rows):
+        """
+        Load the columns from the rows, sorted the same way as Publications.load.
+        """
+        self.loaded = datetime.datetime.now()
+        self.timestamps = uses_timestamps()
+        starts = []
+        for row in rows:
+            dates = Dates()
+            dates.load(row, self.loaded)
+            starts.append(dates.get_start())
+        with phase("sort"):
+            order = sorted(range(len(rows)), key=lambda i: (
+                starts[i], rows[i]["Title"]), reverse=True)
+        self.cells = {}
+        for column in dict.fromkeys(column for row in rows for column in row):
+            cells = np.empty(len(rows), dtype=object)
+            cells[:] = [rows[i].get(column, np.nan) for i in order]
+            self.cells[column] = cells
+        for column in self.fields.values():
+            if column not in self.cells:
+                self.cells[column] = np.full(len(rows), np.nan, dtype=object)
+        self.start = np.array([starts[i] for i in order], dtype="datetime64[us]")
+        years = self.start.astype("datetime64[Y]").astype(np.int64) + 1970
+        self.year = np.where(np.isnat(self.start), np.nan, years)
+        author_ids = []
+        offsets = [0]
+        for authors in self.cells.get("Authors", ()):
+            author_ids.extend(author.get_author_id()
+                              for author in PublicationsData.parse_authors(authors))
+            offsets.append(len(author_ids))
+        self.author_ids = np.array(author_ids, dtype=np.int64)
+        self.author_offsets = np.array(offsets, dtype=np.int64)
+
+    def __repr__(self):
+        string = (
+            f"PublicationsColumns("
+            f"rows={len(self)}, "
+            f"fields={list(self.fields)})"
+        )
+        return string
+
+
+class PublicationsViews(Sequence):
+    """
+    A read-only sequence of PublicationsData objects materialized on demand
+    from a PublicationsColumns store.
+
+    Materialized objects are kept while they are referenced elsewhere, so
+    repeated lookups of a publication in use return the same object. In a
+    frozen CV, they are frozen as they are materialized.
+    """
+
+    def __init__(self, columns: PublicationsColumns):
+        self.columns = columns
+        self._views = weakref.WeakValueDictionary()
+        self._freeze = None
+
+    def on_freeze(self, freeze):
+        """
+        Freeze the materialized publications, and those materialized from
+        now on, with freeze.
+        """
+        self._freeze = freeze
+        for publication in list(self._views.values()):
+            freeze(publication)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("publication index out of range")
+        publication = self._views.get(index)
+        if publication is None:
+            publication = PublicationsData()
+            with timestamps(self.columns.timestamps):
+                publication.load(self.columns.get_row(index), self.columns.loaded)
+            if self._freeze is not None:
+                publication = self._freeze(publication)
+            publication = self._views.setdefault(index, publication)
+        return publication
+
+    def __getstate__(self):
+        return {"columns": self.columns}
+
+    def __setstate__(self, state):
+        self.columns = state["columns"]
+        self._views = weakref.WeakValueDictionary()
+        self._freeze = None
+
+
+class PublicationsIndex:
+    """
+    A class to represent the bitmap indexes over the publications.
+
+    Bit i of every bitmap refers to the publication at position i of
+    Publications, so query results keep the order set by Publications.load.
+
+    Attributes:
+    type (BitmapIndex): The publications by document type.
+    venue (BitmapIndex): The publications by venue.
+    year (BitmapIndex): The publications by year.
+    author (BitmapIndex): The publications by author ID.
+    keyword (BitmapIndex): The publications by lowercase keyword.
+    """
+
+    def __init__(self):
+        self.type = BitmapIndex()
+        self.venue = BitmapIndex()
+        self.year = BitmapIndex()
+        self.author = BitmapIndex()
+        self.keyword = BitmapIndex()
+
+    @staticmethod
+    def split_keywords(keywords):
+        """
+        Split a keywords string into lowercase keywords.
+        """
+        if not isinstance(keywords, str):
+            return set()
+        return {keyword.strip().lower() for keyword in keywords.split(";")
+                if keyword.strip()}
+
+    @staticmethod
+    def as_keys(value):
+        """
+        Get the keys of a single indexed value, skipping missing values.
+        """
+        if isna(value):
+            return ()
+        return (value,)
+
+    def load(self, records):
+        """
+        Load the indexes from (type, venue, year, author_ids, keywords) records.
+        """
+        records = list(records)
+        self.type.load([self.as_keys(record[0]) for record in records])
+        self.venue.load([self.as_keys(record[1]) for record in records])
+        self.year.load([self.as_keys(record[2]) for record in records])
+        self.author.load([set(record[3]) for record in records])
+        self.keyword.load([self.split_keywords(record[4])
+                           for record in records])
+
+    def get_types_ordered(self, get_type):
+        """
+        Get the document types in order of first appearance, the missing
+        types included once as the first of them, get_type(position) being
+        the type of the publication at position, as unique gives them. The
+        first position of a type is the lowest bit of its bitmap, so this
+        does not walk the publications.
+        """
+        firsts = {key: (bitmap & -bitmap).bit_length()
+                  for key, bitmap in self.type.bitmaps.items()}
+        missing = self.type.get_all() & ~self.type.get_any(self.type.get_keys())
+        if missing:
+            position = (missing & -missing).bit_length()
+            firsts[get_type(position - 1)] = position
+        return sorted(firsts, key=firsts.get)
+
+    @staticmethod
+    def match(index, value):
+        """
+        Get the bitmap of a criterion, a single value or a list of values.
+        """
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return index.get_any(value)
+        return index.get(value)
+
+    def match_year(self, year):
+        """
+        Get the bitmap of a year or an inclusive (start, end) year range.
+        """
+        if not isinstance(year, tuple):
+            return self.year.get(year)
+        start, end = year
+        return self.year.get_any(
+            key for key in self.year.get_keys()
+            if (start is None or key >= start) and (end is None or key <= end))
+
+    def query(self, doc_type=None, venue=None, author=None, keyword=None, year=None):
+        """
+        Get the positions of the publications matching all the given criteria.
+        """
+        bitmap = self.type.get_all()
+        if doc_type is not None:
+            bitmap &= self.match(self.type, doc_type)
+        if venue is not None:
+            bitmap &= self.match(self.venue, venue)
+        if author is not None:
+            bitmap &= self.match(self.author, author)
+        if keyword is not None:
+            if isinstance(keyword, str):
+                keyword = keyword.lower()
+            else:
+                keyword = [key.lower() for key in keyword]
+            bitmap &= self.match(self.keyword, keyword)
+        if year is not None:
+            bitmap &= self.match_year(year)
+        return BitmapIndex.positions(bitmap)
+
+    def __repr__(self):
+        string = (
+            f"PublicationsIndex("
+            f"type={repr(self.type)}, "
+            f"venue={repr(self.venue)}, "
+            f"year={repr(self.year)}, "
+            f"author={repr(self.author)}, "
+            f"keyword={repr(self.keyword)})"
+        )
+        return string
+
+
 class Publications():
     """
     A class to represent the publications of an author.
 
     Attributes:
     publications (list): The list of publications.
+    columns (PublicationsColumns): The columnar store, None unless loaded
+    with columnar=True.
+    index (PublicationsIndex): The bitmap indexes used by query.
+    date_index (SortedIndex): The publications sorted by start date.
+    positions_by_title (dict): The position of the first publication with
+    each title.
 
     Methods:
     get_publications_count: Gets the number of publications.
@@ -375,10 +696,15 @@ class Publications():
     get_num_publications_by_type: Gets the number of publications by document type.
     get_num_publications_by_author: Gets the number of publications by author.
     get_publications_date_range: Gets the date range of the publications.
+    query: Gets the publications matching the given criteria.
     """
 
     def __init__(self):
         self.publications = []
+        self.columns = None
+        self.index = PublicationsIndex()
+        self.date_index = SortedIndex()
+        self.positions_by_title = {}
 
     def get_publications_count(self):
         """
@@ -396,43 +722,42 @@ class Publications():
         """
         Gets the number of unique sources.
         """
-        sources = set()
-        for publication in self.publications:
-            sources.add(publication.details.venue.get_venue())
-        return len(sources)
+        if self.columns is not None:
+            return len(unique(self.columns.get_field("venue")))
+        return len(unique(publication.details.venue.get_venue()
+                          for publication in self.publications))
 
     def get_types(self):
         """
         Gets the document types.
         """
-        types = set()
-        for publication in self:
-            types.add(publication.details.type)
-        return types
+        return set(self.get_types_ordered())
 
     def get_publication_by_title(self, title):
         """
         Get the publication by the title.
         """
-        for publication in self:
-            if publication.details.get_title() == title:
-                return publication
-        return None
+        position = self.positions_by_title.get(title)
+        if position is None:
+            return None
+        return self.publications[position]
 
     def get_types_ordered(self):
         """
-        Gets the document types ordered.
+        Gets the document types ordered by first appearance, from the type
+        index.
         """
-        types = []
-        for publication in self.publications:
-            if publication.details.type not in types:
-                types.append(publication.details.type)
-        return types
+        if self.columns is not None:
+            return self.index.get_types_ordered(self.columns.get_field("type").__getitem__)
+        return self.index.get_types_ordered(
+            lambda position: self.publications[position].details.type)
 
     def get_num_publications_by_type(self, pub_type):
         """
         Gets the number of publications by document type.
         """
+        if self.columns is not None:
+            return int(np.count_nonzero(self.columns.get_field("type") == pub_type))
         count = 0
         for publication in self.publications:
             if publication.details.type == pub_type:
@@ -443,6 +768,8 @@ class Publications():
         """
         Gets the number of publications by author.
         """
+        if self.columns is not None:
+            return int(np.count_nonzero(self.columns.author_ids == author_id))
         count = 0
         for publication in self:
             for auth_id_aff_id in publication.get_auth_id_aff_id():
@@ -454,6 +781,9 @@ class Publications():
         """
         Gets the number of publications where the author is the first author.
         """
+        if self.columns is not None:
+            first_authors = self.columns.get_first_author_ids()
+            return int(np.count_nonzero(first_authors == author_id))
         count = 0
         for publication in self:
             if publication.get_auth_id_aff_id()[0].get_author_id() == author_id:
@@ -464,31 +794,119 @@ class Publications():
         """
         Gets the date range of the publications.
         """
-        dates = []
-        for publication in self.publications:
-            dates.append(publication.details.dates.get_start())
+        if self.columns is not None:
+            dates = self.columns.get_starts()
+        else:
+            dates = [publication.details.dates.get_start()
+                     for publication in self.publications]
         return min(dates), max(dates)
 
-    def load(self, filename):
+    def query(self, doc_type=None, venue=None, author=None, keyword=None, year=None):
+        """
+        Gets the publications matching all the given criteria.
+
+        doc_type (the document type), venue, author and keyword take a
+        single value or a list of values, year takes a year or an inclusive
+        (start, end) tuple where either bound may be None. The publications
+        keep the load order.
+        """
+        positions = self.index.query(
+            doc_type=doc_type, venue=venue, author=author, keyword=keyword, year=year)
+        return [self.publications[position] for position in positions]
+
+    def between(self, start=None, end=None):
+        """
+        Get the publications dated between start and end (inclusive), newest first.
+        """
+        return [self.publications[i] for i in self.date_index.between(start, end)]
+
+    def latest(self, num):
+        """
+        Get the num newest publications.
+        """
+        return [self.publications[i] for i in self.date_index.latest(num)]
+
+    def before(self, date):
+        """
+        Get the publications dated strictly before the given date, newest first.
+        """
+        return [self.publications[i] for i in self.date_index.before(date)]
+
+    def _index_records(self):
+        """
+        Get the (type, venue, year, author_ids, keywords) record of each publication.
+        """
+        if self.columns is not None:
+            offsets = self.columns.author_offsets
+            keywords = self.columns.cells.get("Keywords")
+            types = self.columns.get_field("type")
+            venues = self.columns.get_field("venue")
+            for i in range(len(self.columns)):
+                yield (types[i], venues[i],
+                       self.columns.year[i],
+                       self.columns.author_ids[offsets[i]:offsets[i + 1]].tolist(),
+                       None if keywords is None else keywords[i])
+            return
+        for publication in self.publications:
+            start = publication.details.dates.get_start()
+            yield (publication.details.get_type(),
+                   publication.details.venue.get_venue(),
+                   start.year if notna(start) else None,
+                   [author.get_author_id()
+                    for author in publication.get_auth_id_aff_id()],
+                   publication.details.get_keywords())
+
+    def load(self, filename, columnar=False):
         """
         Load the publications data from the file.
+
+        With columnar=True the publications are kept in a PublicationsColumns
+        store and the PublicationsData objects are built on demand.
         """
-        publications_df = pd.read_excel(
-            filename, sheet_name="Publications")
-        for _, row in publications_df.iterrows():
-            self.publications.append(PublicationsData())
-            self.publications[-1].load(row)
-        self.publications = sorted(
-            self.publications, key=lambda x: (
-                x.details.dates.get_start(), x.details.get_title()), reverse=True
-        )
+        self.publications = []
+        self.columns = None
+        self.positions_by_title = {}
+        rows = read_rows(filename, "Publications")
+        if columnar:
+            self.columns = PublicationsColumns()
+            self.columns.load(rows)
+            self.publications = PublicationsViews(self.columns)
+        else:
+            for row in rows:
+                self.publications.append(PublicationsData())
+                self.publications[-1].load(row)
+            with phase("sort"):
+                self.publications = sorted(
+                    self.publications, key=lambda x: (
+                        x.details.dates.get_start(), x.details.get_title()), reverse=True
+                )
+        self.index.load(self._index_records())
+        titles = (self.columns.get_field("title") if self.columns is not None else
+                  [publication.details.get_title() for publication in self.publications])
+        for position, title in enumerate(titles):
+            self.positions_by_title.setdefault(title, position)
+        if self.columns is not None:
+            self.date_index.load(self.columns.start)
+        else:
+            self.date_index.load([publication.details.dates.get_start()
+                                  for publication in self.publications])
 
     def __repr__(self):
-        string = (
-            f"Publications("
-            f"publications={list(map(repr, self.publications))}"
-        )
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per publication.
+        """
+        yield "Publications(publications="
+        yield from iter_list_repr(self.publications, quoted_repr)
 
     def __iter__(self):
         return iter(self.publications)
+
+    def aiter(self, batch_size=100):
+        """
+        Iterate asynchronously over the publications, waiting for them when the
+        CV is being loaded with CV.aopen.
+        """
+        return aiter_section(self, batch_size)
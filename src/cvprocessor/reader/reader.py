@@ -0,0 +1,925 @@
+"""
+This module contains the readers used by the section loaders to get the
+rows of the sheets of a CV workbook.
+
+A row is a dictionary from column name to cell value, with missing cells
+set to NaN, the same values pandas gives for the sheet. The pandas engine
+gives the dates as pandas Timestamps (NaT when missing from a date column);
+the other engines, which do not import pandas, give them as
+datetime.datetime (None when missing). A Timestamp is a datetime and
+compares equal to the datetime of the same time. The dates parsed from the
+cells by the section loaders follow the type of the engine: see the
+timestamps attribute of the readers. The engines are:
+
+- "pandas": pandas.read_excel, opening the workbook once per thread for
+  all the sheets it reads.
+- "xlsx": a reader built on zipfile and incremental XML parsing, which
+  does not import pandas nor build DataFrames.
+- "csv": a directory with one CSV file per sheet, named <sheet>.csv.
+- "json": a JSON document mapping each sheet name to a list of records.
+- "ods": an OpenDocument spreadsheet, read like the xlsx engine.
+
+When no engine is given it is detected from the path: a directory is read
+as CSV, .json and .ods files with their engines and anything else with
+pandas.
+
+Instead of a path, the source can be the content of a file: bytes, a
+bytearray, a memoryview, an io.BytesIO or an mmap. It is read in place
+through a BufferFile, and its engine is detected from the content (the
+xlsx engine for xlsx workbooks). Large xlsx, ods and JSON files on disk
+are memory-mapped instead of being read into memory.
+"""
+import contextlib
+import csv
+import datetime
+import errno
+import io
+import json
+import math
+import mmap
+import os
+import posixpath
+import re
+import sys
+import threading
+import zipfile
+from xml.etree.ElementTree import iterparse, parse
+
+from cvprocessor.lazy import pandas as pd
+
+NAN = float("nan")
+
+# Types of the cell values which are never missing.
+PRESENT_TYPES = {str, int, bool, datetime.datetime}
+
+# Strings read as missing values, as with pandas.read_excel.
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+ODS_OFFICE_NS = "{urn:oasis:names:tc:opendocument:xmlns:office:1.0}"
+ODS_TABLE_NS = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+ODS_TEXT_NS = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+# Strings read as booleans from text, as with pandas.read_csv.
+BOOL_STRINGS = {
+    "True": True, "TRUE": True, "true": True,
+    "False": False, "FALSE": False, "false": False,
+}
+
+# Files from this size (in bytes) on are memory-mapped.
+MMAP_THRESHOLD = 16 * 2 ** 20
+
+# Built-in number formats which show dates or times.
+DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+DATE_FORMAT_STRIP = re.compile(r'"[^"]*"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+DATE_FORMAT_CHARS = re.compile(r"(?<![_\\])[dmhysDMHYS]")
+
+
+def isna(value):
+    """
+    Check whether a cell value is missing (None, NaN or NaT).
+    """
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return math.isnan(value)
+    if type(value) in PRESENT_TYPES:
+        return False
+    # The other missing values, NaT and NA, come from pandas, imported by then.
+    return "pandas" in sys.modules and pd.isna(value) is True
+
+
+def notna(value):
+    """
+    Check whether a cell value is not missing.
+    """
+    return not isna(value)
+
+
+def unique(values):
+    """
+    Get the distinct values in order of appearance, counting all missing
+    values as one, as pandas.unique does.
+    """
+    seen = {}
+    for value in values:
+        seen.setdefault(NAN if isna(value) else value, value)
+    return list(seen.values())
+
+
+class BufferFile(io.RawIOBase):
+    """
+    The BufferFile class is a read-only, seekable file over a memoryview,
+    which reads the buffer in place instead of copying it.
+
+    Attributes:
+    view (memoryview): The content of the file.
+    """
+
+    def __init__(self, view, owner=None):
+        super().__init__()
+        self.view = view.cast("B") if view.ndim != 1 or view.format != "B" else view
+        self._position = 0
+        self._owner = owner
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        if offset < 0:
+            # As a file does, so that zipfile reports a buffer too short for
+            # an archive as a BadZipFile.
+            raise OSError(errno.EINVAL, f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def read(self, size=-1):
+        start = min(self._position, len(self.view))
+        end = len(self.view) if size is None or size < 0 else min(start + size, len(self.view))
+        self._position = end
+        return bytes(self.view[start:end])
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def get_text(self):
+        """
+        Decode the whole content as UTF-8 text.
+        """
+        return str(self.view, "utf-8-sig")
+
+    def close(self):
+        if not self.closed:
+            self.view.release()
+            if self._owner is not None:
+                self._owner.close()
+        super().close()
+
+
+def to_view(source):
+    """
+    Get a memoryview of the content of a buffer source (bytes, bytearray,
+    memoryview, mmap, io.BytesIO or other binary file), None for a path.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return memoryview(source)
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        return memoryview(source.read())
+    return None
+
+
+def open_file(source):
+    """
+    Open the content of a source as a BufferFile: the buffer itself, or a
+    memory map of a large file. Small files are returned as their path.
+    """
+    view = to_view(source)
+    if view is not None:
+        return BufferFile(view)
+    if os.path.getsize(source) < MMAP_THRESHOLD:
+        return source
+    with open(source, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return BufferFile(memoryview(mapping), owner=mapping)
+
+
+def close_file(file):
+    """
+    Close a file returned by open_file.
+    """
+    if isinstance(file, BufferFile):
+        file.close()
+
+
+class Reader:
+    """
+    The Reader class is the base class of the workbook readers.
+
+    Attributes:
+    thread_safe (bool): Whether, once get_sheet_names has opened it, the
+        reader can read sheets from several threads at once.
+    timestamps (bool): Whether the dates are pandas Timestamps rather than
+        datetimes.
+
+    Methods:
+    get_sheet_names: Get the names of the sheets.
+    read_rows: Get the rows of a sheet.
+    close: Release the workbook.
+    """
+
+    thread_safe = False
+    timestamps = False
+
+    def get_sheet_names(self):
+        """
+        Get the names of the sheets.
+        """
+        raise NotImplementedError
+
+    def read_rows(self, sheet_name):
+        """
+        Get the rows of a sheet as dictionaries keyed by column name.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release the workbook.
+        """
+
+
+class PandasReader(Reader):
+    """
+    The PandasReader class reads the sheets with pandas.read_excel.
+
+    A pandas ExcelFile cannot be shared between threads, so each thread
+    opens the workbook once for all the sheets it reads: the sheets can then
+    be read concurrently, at the cost of one ExcelFile per thread.
+
+    Attributes:
+    filename (str): The filename or the content of the workbook.
+    """
+
+    thread_safe = True
+    timestamps = True
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+        self._local = threading.local()
+        self._excels = []
+        self._lock = threading.Lock()
+
+    def _get_excel(self):
+        """
+        Open the workbook once for all the sheets read by this thread.
+        """
+        excel = getattr(self._local, "excel", None)
+        if excel is None:
+            with self._lock:
+                if self._file is None:
+                    self._file = open_file(self.filename)
+                file = self._file
+                if isinstance(file, BufferFile) and self._excels:
+                    # Each thread reads the content at its own position.
+                    file = BufferFile(file.view[:])
+                excel = pd.ExcelFile(file)
+                self._excels.append((excel, file))
+            self._local.excel = excel
+        return excel
+
+    def get_sheet_names(self):
+        return list(self._get_excel().sheet_names)
+
+    def read_rows(self, sheet_name):
+        excel = self._get_excel()
+        if sheet_name not in excel.sheet_names:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return pd.read_excel(excel, sheet_name=sheet_name).to_dict("records")
+
+    def close(self):
+        with self._lock:
+            # The first file is the shared one, closed last.
+            for excel, file in reversed(self._excels):
+                excel.close()
+                close_file(file)
+            self._excels = []
+            self._file = None
+            self._local = threading.local()
+
+
+def is_date_format(format_code):
+    """
+    Check whether a number format code shows a date or a time.
+    """
+    if format_code is None or format_code.lower() == "general":
+        return False
+    return DATE_FORMAT_CHARS.search(DATE_FORMAT_STRIP.sub("", format_code)) is not None
+
+
+def column_index(reference):
+    """
+    Get the zero-based column index of a cell reference such as "AB12".
+    """
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def to_number(text):
+    """
+    Convert the text of a numeric cell, integral values becoming ints.
+    """
+    number = float(text)
+    if number.is_integer() and abs(number) < 2 ** 53:
+        return int(number)
+    return number
+
+
+def is_number(value):
+    """
+    Check whether a cell value is a number (booleans are not).
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def infer_column(values):
+    """
+    Convert the values of a column the way pandas infers the column type:
+    numeric strings become numbers, numeric columns with missing values
+    become floats and missing cells become NaN (None in date columns).
+    """
+    present = [value for value in values if value is not None]
+    if not present:
+        return [NAN] * len(values)
+    if all(isinstance(value, datetime.datetime) for value in present):
+        return values
+    numbers = all(is_number(value) for value in present)
+    # Numbers and booleans with missing cells, and numbers with a float.
+    if (len(present) < len(values)
+            and all(isinstance(value, (bool, int, float)) for value in present)
+            or numbers and any(isinstance(value, float) for value in present)):
+        return [NAN if value is None else float(value) for value in values]
+    if numbers:
+        return values
+    if all(is_number(value) or isinstance(value, str) for value in present):
+        try:
+            return infer_column([to_number(value) if isinstance(value, str) else value
+                                 for value in values])
+        except ValueError:
+            pass
+    return [NAN if value is None else value for value in values]
+
+
+def header_names(header, width):
+    """
+    Get the column names, naming the blank ones and numbering duplicates
+    the way pandas does.
+    """
+    names = []
+    seen = {}
+    for index in range(width):
+        name = header[index] if index < len(header) else None
+        if name is None:
+            name = f"Unnamed: {index}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def text_value(text):
+    """
+    Get the value of a cell read from text, None if it is missing.
+    """
+    if text in NA_STRINGS:
+        return None
+    return BOOL_STRINGS.get(text, text)
+
+
+def is_iso_date(value):
+    """
+    Check whether a value is an ISO 8601 date or date and time string.
+    """
+    if not isinstance(value, str) or len(value) < 10 or value[4] != "-":
+        return False
+    try:
+        datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def infer_dates(values):
+    """
+    Convert a column of ISO 8601 strings, as written by the text formats
+    for date cells, to datetimes.
+    """
+    present = [value for value in values if value is not None]
+    if not present or not all(is_iso_date(value) for value in present):
+        return values
+    return [None if value is None else datetime.datetime.fromisoformat(value)
+            for value in values]
+
+
+def to_records(rows, skip_blank=False, text_dates=False):
+    """
+    Convert the rows of cell values of a sheet, the first one being the
+    header, to dictionaries keyed by column name. Trailing blank rows are
+    dropped, and all blank rows with skip_blank. With text_dates, columns
+    of ISO 8601 strings become datetimes.
+    """
+    header = next(rows, [])
+    data = [row for row in rows if row or not skip_blank]
+    while data and not data[-1]:
+        data.pop()
+    width = max([len(header)] + [len(row) for row in data])
+    names = header_names(header, width)
+    columns = [[row[index] if index < len(row) else None for row in data]
+               for index in range(width)]
+    if text_dates:
+        columns = [infer_dates(values) for values in columns]
+    columns = [infer_column(values) for values in columns]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+class XlsxReader(Reader):
+    """
+    The XlsxReader class reads the sheets of an xlsx workbook with zipfile
+    and incremental XML parsing, without pandas.
+
+    The shared strings and styles are parsed once; each sheet is parsed
+    row by row when it is read.
+
+    Attributes:
+    filename (str): The filename or the content of the workbook.
+    """
+
+    thread_safe = True
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._zip = None
+        self._files = None
+        self._sheets = None
+        self._shared_strings = None
+        self._date_styles = None
+        self._epoch = datetime.datetime(1899, 12, 30)
+
+    def _open(self):
+        """
+        Open the workbook and read its sheet names, shared strings and styles.
+        """
+        if self._zip is not None:
+            return
+        # The file and the archive stay open until close, or are closed now if
+        # the archive cannot be opened.
+        with contextlib.ExitStack() as files:
+            file = open_file(self.filename)
+            files.callback(close_file, file)
+            self._zip = files.enter_context(zipfile.ZipFile(file))
+            self._files = files.pop_all()
+        with self._zip.open("xl/workbook.xml") as file:
+            workbook = parse(file).getroot()
+        properties = workbook.find(f"{MAIN_NS}workbookPr")
+        if properties is not None and properties.get("date1904") in ("1", "true"):
+            self._epoch = datetime.datetime(1904, 1, 1)
+        with self._zip.open("xl/_rels/workbook.xml.rels") as file:
+            relations = {relation.get("Id"): relation.get("Target")
+                         for relation in parse(file).getroot().iter(
+                             f"{PKG_REL_NS}Relationship")}
+        self._sheets = {}
+        for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+            target = relations[sheet.get(f"{REL_NS}id")]
+            if target.startswith("/"):
+                path = target.lstrip("/")
+            else:
+                path = posixpath.normpath(posixpath.join("xl", target))
+            self._sheets[sheet.get("name")] = path
+        self._shared_strings = self._read_shared_strings()
+        self._date_styles = self._read_date_styles()
+
+    def _read_shared_strings(self):
+        """
+        Read the shared strings table.
+        """
+        strings = []
+        if "xl/sharedStrings.xml" not in self._zip.namelist():
+            return strings
+        with self._zip.open("xl/sharedStrings.xml") as file:
+            for _, element in iterparse(file):
+                if element.tag == f"{MAIN_NS}si":
+                    # Phonetic runs (rPh) are not part of the cell text.
+                    for phonetic in element.findall(f"{MAIN_NS}rPh"):
+                        element.remove(phonetic)
+                    strings.append("".join(
+                        text.text or "" for text in element.iter(f"{MAIN_NS}t")))
+                    element.clear()
+        return strings
+
+    def _read_date_styles(self):
+        """
+        Read the indexes of the cell styles that show dates.
+        """
+        date_styles = set()
+        if "xl/styles.xml" not in self._zip.namelist():
+            return date_styles
+        with self._zip.open("xl/styles.xml") as file:
+            styles = parse(file).getroot()
+        formats = {int(number_format.get("numFmtId")): number_format.get("formatCode")
+                   for number_format in styles.iter(f"{MAIN_NS}numFmt")}
+        cell_formats = styles.find(f"{MAIN_NS}cellXfs")
+        if cell_formats is None:
+            return date_styles
+        for index, cell_format in enumerate(cell_formats.iter(f"{MAIN_NS}xf")):
+            format_id = int(cell_format.get("numFmtId", 0))
+            if format_id in formats:
+                if is_date_format(formats[format_id]):
+                    date_styles.add(index)
+            elif format_id in DATE_FORMAT_IDS:
+                date_styles.add(index)
+        return date_styles
+
+    def _to_date(self, serial):
+        """
+        Convert a serial date number to a datetime.
+        """
+        serial = float(serial)
+        if self._epoch.year == 1899 and serial < 60:
+            serial += 1
+        return self._epoch + datetime.timedelta(
+            microseconds=round(serial * 86400 * 10 ** 6, -3))
+
+    def _cell_value(self, cell):
+        """
+        Get the value of a cell element, None if the cell is empty.
+        """
+        cell_type = cell.get("t", "n")
+        if cell_type == "inlineStr":
+            inline = cell.find(f"{MAIN_NS}is")
+            text = (None if inline is None else
+                    "".join(part.text or "" for part in inline.iter(f"{MAIN_NS}t")))
+        else:
+            value = cell.find(f"{MAIN_NS}v")
+            text = None if value is None else value.text
+        if text is None or cell_type == "e":
+            return None
+        if cell_type == "s":
+            text = self._shared_strings[int(text)]
+        elif cell_type == "b":
+            return text == "1"
+        elif cell_type == "d":
+            return datetime.datetime.fromisoformat(text)
+        elif cell_type == "n":
+            return (self._to_date(text) if int(cell.get("s", 0)) in self._date_styles
+                    else to_number(text))
+        return None if text in NA_STRINGS else text
+
+    def _iter_sheet(self, sheet_name):
+        """
+        Yield the cell values of each row of a sheet, as lists.
+        """
+        with self._zip.open(self._sheets[sheet_name]) as file:
+            row_number = 0
+            for _, element in iterparse(file):
+                if element.tag != f"{MAIN_NS}row":
+                    continue
+                # Rows without cells are not written, yield them as empty.
+                number = int(element.get("r", row_number + 1))
+                for _ in range(number - row_number - 1):
+                    yield []
+                row_number = number
+                values = []
+                for position, cell in enumerate(element.iter(f"{MAIN_NS}c")):
+                    reference = cell.get("r")
+                    index = column_index(reference) if reference else position
+                    value = self._cell_value(cell)
+                    if value is None:
+                        continue
+                    values.extend([None] * (index + 1 - len(values)))
+                    values[index] = value
+                element.clear()
+                yield values
+
+    def get_sheet_names(self):
+        self._open()
+        return list(self._sheets)
+
+    def read_rows(self, sheet_name):
+        self._open()
+        if sheet_name not in self._sheets:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return to_records(self._iter_sheet(sheet_name))
+
+    def close(self):
+        """
+        Close the workbook.
+        """
+        if self._zip is not None:
+            self._files.close()
+            self._files = None
+            self._zip = None
+
+
+class CsvReader(Reader):
+    """
+    The CsvReader class reads a directory with one CSV file per sheet,
+    named after the sheet.
+
+    Attributes:
+    directory (str): The directory of the CSV files.
+    """
+
+    thread_safe = True
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _get_path(self, sheet_name):
+        """
+        Get the path of the CSV file of a sheet.
+        """
+        return os.path.join(self.directory, f"{sheet_name}.csv")
+
+    def get_sheet_names(self):
+        return sorted(name[:-len(".csv")] for name in os.listdir(self.directory)
+                      if name.endswith(".csv"))
+
+    def read_rows(self, sheet_name):
+        path = self._get_path(sheet_name)
+        if not os.path.isfile(path):
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            rows = (self._trim([text_value(text) for text in row])
+                    for row in csv.reader(file))
+            return to_records(rows, skip_blank=True, text_dates=True)
+
+    @staticmethod
+    def _trim(row):
+        """
+        Drop the trailing empty cells of a row.
+        """
+        while row and row[-1] is None:
+            row.pop()
+        return row
+
+
+class JsonReader(Reader):
+    """
+    The JsonReader class reads a JSON document mapping each sheet name to
+    the list of its rows, as objects keyed by column name.
+
+    Attributes:
+    filename (str): The filename or the content of the document.
+    """
+
+    thread_safe = True
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._document = None
+
+    def _get_document(self):
+        """
+        Parse the document once for all the sheets.
+        """
+        if self._document is None:
+            file = open_file(self.filename)
+            if isinstance(file, BufferFile):
+                try:
+                    self._document = json.loads(file.get_text())
+                finally:
+                    file.close()
+            else:
+                with open(file, encoding="utf-8-sig") as text:
+                    self._document = json.load(text)
+        return self._document
+
+    def get_sheet_names(self):
+        return list(self._get_document())
+
+    def read_rows(self, sheet_name):
+        document = self._get_document()
+        if sheet_name not in document:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        records = document[sheet_name]
+        header = list(dict.fromkeys(key for record in records for key in record))
+        rows = [[None if isna(record.get(key)) else record.get(key) for key in header]
+                for record in records]
+        return to_records(iter([header] + rows), text_dates=True)
+
+    def close(self):
+        self._document = None
+
+
+class OdsReader(Reader):
+    """
+    The OdsReader class reads the sheets of an OpenDocument spreadsheet
+    with zipfile and incremental XML parsing.
+
+    All the sheets are in one XML part, which is parsed once.
+
+    Attributes:
+    filename (str): The filename or the content of the spreadsheet.
+    """
+
+    thread_safe = True
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._tables = None
+
+    @staticmethod
+    def _text(element):
+        """
+        Get the text of a paragraph, expanding the spaces, tabs and line
+        breaks elements.
+        """
+        parts = [element.text or ""]
+        for child in element:
+            if child.tag == f"{ODS_TEXT_NS}s":
+                parts.append(" " * int(child.get(f"{ODS_TEXT_NS}c", 1)))
+            elif child.tag == f"{ODS_TEXT_NS}tab":
+                parts.append("\t")
+            elif child.tag == f"{ODS_TEXT_NS}line-break":
+                parts.append("\n")
+            else:
+                parts.append(OdsReader._text(child))
+            parts.append(child.tail or "")
+        return "".join(parts)
+
+    @staticmethod
+    def _cell_value(cell):
+        """
+        Get the value of a cell element, None if the cell is empty.
+        """
+        value_type = cell.get(f"{ODS_OFFICE_NS}value-type")
+        if value_type in ("float", "percentage", "currency"):
+            return to_number(cell.get(f"{ODS_OFFICE_NS}value"))
+        if value_type == "date":
+            return datetime.datetime.fromisoformat(cell.get(f"{ODS_OFFICE_NS}date-value"))
+        if value_type == "boolean":
+            return cell.get(f"{ODS_OFFICE_NS}boolean-value") == "true"
+        if value_type is None:
+            return None
+        text = "\n".join(OdsReader._text(paragraph)
+                         for paragraph in cell.iter(f"{ODS_TEXT_NS}p"))
+        return None if text in NA_STRINGS else text
+
+    @staticmethod
+    def _row_values(row):
+        """
+        Get the cell values of a row element, expanding repeated cells.
+        """
+        values = []
+        blank = 0
+        for cell in row:
+            if cell.tag not in (f"{ODS_TABLE_NS}table-cell",
+                                f"{ODS_TABLE_NS}covered-table-cell"):
+                continue
+            repeat = int(cell.get(f"{ODS_TABLE_NS}number-columns-repeated", 1))
+            value = OdsReader._cell_value(cell)
+            if value is None:
+                # Trailing blank cells are repeated up to the last column.
+                blank += repeat
+                continue
+            values.extend([None] * blank)
+            values.extend([value] * repeat)
+            blank = 0
+        return values
+
+    def _open(self):
+        """
+        Read the rows of all the sheets.
+        """
+        if self._tables is not None:
+            return
+        self._tables = {}
+        source = open_file(self.filename)
+        try:
+            self._read_content(source)
+        finally:
+            close_file(source)
+
+    def _read_content(self, source):
+        """
+        Read the rows of all the sheets from the content part.
+        """
+        rows = None
+        blank = 0
+        with zipfile.ZipFile(source) as archive, archive.open("content.xml") as file:
+            for event, element in iterparse(file, events=("start", "end")):
+                if element.tag == f"{ODS_TABLE_NS}table":
+                    if event == "start":
+                        rows = self._tables.setdefault(
+                            element.get(f"{ODS_TABLE_NS}name"), [])
+                        blank = 0
+                    else:
+                        element.clear()
+                elif element.tag == f"{ODS_TABLE_NS}table-row" and event == "end":
+                    repeat = int(element.get(f"{ODS_TABLE_NS}number-rows-repeated", 1))
+                    values = self._row_values(element)
+                    element.clear()
+                    if not values:
+                        # Trailing blank rows are repeated up to the last row.
+                        blank += repeat
+                        continue
+                    rows.extend([] for _ in range(blank))
+                    rows.extend(list(values) for _ in range(repeat))
+                    blank = 0
+
+    def get_sheet_names(self):
+        self._open()
+        return list(self._tables)
+
+    def read_rows(self, sheet_name):
+        self._open()
+        if sheet_name not in self._tables:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        return to_records(iter(self._tables[sheet_name]))
+
+    def close(self):
+        self._tables = None
+
+
+ENGINES = {
+    "pandas": PandasReader,
+    "xlsx": XlsxReader,
+    "csv": CsvReader,
+    "json": JsonReader,
+    "ods": OdsReader,
+}
+
+# File extension: engine, for the files not read with pandas.
+FORMATS = {
+    ".json": "json",
+    ".ods": "ods",
+}
+
+# Extensions of the workbook files, read with pandas or with the engine
+# of their format; a directory of CSV files is a workbook too.
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm", ".xls") + tuple(FORMATS)
+
+
+def detect_content_engine(view):
+    """
+    Detect the engine of the content of a workbook.
+    """
+    head = bytes(view[:128])
+    if head.startswith(b"PK\x03\x04"):
+        if b"application/vnd.oasis.opendocument.spreadsheet" in head:
+            return "ods"
+        return "xlsx"
+    if head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"{"):
+        return "json"
+    raise ValueError("Unknown workbook format")
+
+
+def detect_engine(path):
+    """
+    Detect the engine of a workbook from its path.
+    """
+    if os.path.isdir(path):
+        return "csv"
+    return FORMATS.get(os.path.splitext(str(path))[1].lower(), "pandas")
+
+
+def open_reader(source, engine=None):
+    """
+    Get a reader for a workbook path or content, or the reader itself when
+    source is already a Reader. The engine is detected from the path or the
+    content when not given.
+    """
+    if isinstance(source, Reader):
+        return source
+    view = to_view(source)
+    if view is not None:
+        # Read file objects once, then share their content with the reader.
+        source = view
+        engine = engine or detect_content_engine(view)
+        if engine == "csv":
+            raise ValueError("A directory of CSV files cannot be read from a buffer")
+    engine = engine or detect_engine(source)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown reader engine: {engine}")
+    return ENGINES[engine](source)
+
+
+def read_rows(source, sheet_name):
+    """
+    Get the rows of a sheet, source being a workbook path or content, or a
+    Reader. A reader opened here is closed after the sheet is read.
+    """
+    reader = open_reader(source)
+    try:
+        return reader.read_rows(sheet_name)
+    finally:
+        if reader is not source:
+            reader.close()
@@ -1,7 +1,8 @@
 """
 This module contains the classes to handle the references section of the CV.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
 
 
 class ReferenceData:
@@ -56,14 +57,22 @@ class References:
         """
         Load the references data.
         """
-        reference_df = pd.read_excel(filename, sheet_name="References")
-        for _, row in reference_df.iterrows():
+        self.references = []
+        for row in read_rows(filename, "References"):
             reference = ReferenceData()
             reference.load(row)
             self.references.append(reference)
 
     def __repr__(self):
-        return f"References({repr(self.references)})"
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per reference.
+        """
+        yield "References("
+        yield from iter_list_repr(self.references)
+        yield ")"
 
     def __iter__(self):
         return iter(self.references)
@@ -0,0 +1,68 @@
+"""
+This module contains the streaming text rendering of CVs.
+
+The text of a CV (str(cv)) nests the text of its sections, and the text of
+a section is one line or repr per item. The sections with many items have
+an iter_text method which yields their text in chunks, one per item, so
+that a CV is written to a stream in linear time without holding its whole
+text in memory. "".join(iter_text(value)) is always str(value).
+"""
+
+
+def iter_text(value):
+    """
+    Iterate over the chunks of the text of value: the chunks of its
+    iter_text method when it has one, its str otherwise.
+    """
+    chunks = getattr(value, "iter_text", None)
+    if chunks is None:
+        yield str(value)
+    else:
+        yield from chunks()
+
+
+def iter_lines(items):
+    """
+    Iterate over the text of items, one line per item.
+    """
+    for item in items:
+        yield f"{item}\n"
+
+
+def iter_list_repr(items, item_repr=repr):
+    """
+    Iterate over the chunks of the repr of a list of items, whose items are
+    formatted with item_repr.
+    """
+    yield "["
+    for position, item in enumerate(items):
+        if position:
+            yield ", "
+        yield item_repr(item)
+    yield "]"
+
+
+def quoted_repr(item):
+    """
+    Get the repr of the repr of item, as in the repr of list(map(repr, items)).
+    """
+    return repr(repr(item))
+
+
+def write_text(value, file):
+    """
+    Write the text of value to a text file object, chunk by chunk.
+    """
+    for chunk in iter_text(value):
+        file.write(chunk)
+
+
+def iter_labelled(sections):
+    """
+    Iterate over the chunks of the text of (label, section) pairs, one
+    "label: text" line per section.
+    """
+    for label, section in sections:
+        yield f"{label}: "
+        yield from iter_text(section)
+        yield "\n"
@@ -2,7 +2,7 @@
 This module contains the ResearchInterests class which is used to store
 the research interests and keywords of a person.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
 
 
 class ResearchInterests:
@@ -34,12 +34,11 @@ class ResearchInterests:
         """
         Load the research interests and keywords from the given file.
         """
-        research_interests_pd = pd.read_excel(
-            filename, sheet_name="Research_Interests")
-        self.research_interests = research_interests_pd["Interests"].values[0]
-        keywords = research_interests_pd["Keywords"]
-        for keyword in keywords:
-            self.keywords.append(keyword)
+        self.keywords = []
+        research_interests = read_rows(filename, "Research_Interests")
+        self.research_interests = research_interests[0]["Interests"]
+        for row in research_interests:
+            self.keywords.append(row["Keywords"])
 
     def __repr__(self):
         string = (
@@ -1,7 +1,9 @@
 """
 This module contains the ServiceData and Services classes.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
+from cvprocessor.trace import phase
 
 from cvprocessor.links.links import Link
 
@@ -68,18 +70,25 @@ class Services:
         """
         Load the service data.
         """
-        service_df = pd.read_excel(
-            filename, sheet_name="Professional_services")
-        for _, row in service_df.iterrows():
+        self.services = []
+        for row in read_rows(filename, "Professional_services"):
             service = ServiceData()
             service.load(row)
             self.services.append(service)
         # Sort the services by venue alphabetically
-        self.services = sorted(self.services, key=lambda x: x.venue)
+        with phase("sort"):
+            self.services = sorted(self.services, key=lambda x: x.venue)
 
     def __repr__(self):
-        string = f"Services(services={repr(list(self.services))})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per service.
+        """
+        yield "Services(services="
+        yield from iter_list_repr(self.services)
+        yield ")"
 
     def __iter__(self):
         return iter(self.services)
@@ -0,0 +1,237 @@
+"""
+This module contains the shared numeric columns of loaded CVs, for worker
+processes which serve the same CVs.
+
+One process loads a CV and publishes it into a named
+multiprocessing.shared_memory segment; the workers attach to the segment
+by name instead of parsing the workbook. The CV is pickled with protocol 5
+and its numeric and date NumPy arrays are written out of band: attached
+CVs read these columns in place from the segment, as read-only arrays,
+rather than holding a private copy. With columnar publications, they are
+the years, start dates and author ids of the publications, and the date
+indexes.
+
+Only these numeric columns are shared. Python objects cannot live in a
+shared segment, so everything else, including the text cells of the
+publications (titles, venues...), their indexes and the whole graph of the
+other sections, is unpickled into a private copy in each worker, which is
+still much cheaper than parsing the workbook.
+
+The segment is local to the machine and lives until the publisher unlinks it.
+"""
+import io
+import mmap
+import os
+import pickle
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+from cvprocessor.lazy import numpy as np
+
+# Header: magic, pickle length, number of out-of-band buffers, then the
+# (offset, length) of each buffer.
+MAGIC = b"CVPSHM01"
+HEADER = struct.Struct("<8sQQ")
+BUFFER = struct.Struct("<QQ")
+
+# Alignment of the out-of-band buffers in the segment.
+ALIGNMENT = 64
+
+# Where Linux exposes the POSIX shared memory segments as files.
+SHM_DIRECTORY = "/dev/shm"
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class ReadOnlySegment:
+    """
+    A class to represent a shared-memory segment mapped read-only from its
+    file on Linux.
+
+    Attributes:
+    name (str): The name of the segment.
+    size (int): The size of the segment in bytes.
+    buf (memoryview): The read-only content of the segment.
+    """
+
+    def __init__(self, name):
+        with open(os.path.join(SHM_DIRECTORY, name), "rb") as file:
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.name = name
+        self.size = len(self._mapping)
+        self.buf = memoryview(self._mapping)
+
+    def close(self):
+        """
+        Unmap the segment.
+        """
+        self.buf.release()
+        self._mapping.close()
+
+    def unlink(self):
+        """
+        Destroy the segment, like SharedMemory.unlink.
+        """
+        os.remove(os.path.join(SHM_DIRECTORY, self.name))
+
+
+def _open_segment(name):
+    """
+    Attach to an existing segment. On Linux it is mapped read-only from its
+    file; elsewhere it is opened with SharedMemory, unregistered from the
+    resource tracker which would otherwise unlink it when this process exits.
+    """
+    if os.path.isdir(SHM_DIRECTORY):
+        return ReadOnlySegment(name.lstrip("/"))
+    segment = shared_memory.SharedMemory(name=name, create=False)
+    # The tracker knows the segment by its POSIX name, with the leading slash.
+    resource_tracker.unregister("/" + segment.name, "shared_memory")
+    return segment
+
+
+def _as_dates(values, dtype):
+    """
+    View an int64 array as the datetime64 or timedelta64 array it was.
+    """
+    return values.view(dtype)
+
+
+class SegmentPickler(pickle.Pickler):
+    """
+    The SegmentPickler class pickles the datetime64 and timedelta64 arrays
+    as int64 views, which NumPy writes out of band like the other numeric
+    arrays, rather than as bytes in the pickle.
+    """
+
+    def reducer_override(self, obj):
+        """
+        Reduce the contiguous datetime64 and timedelta64 arrays to int64 views.
+        """
+        if type(obj).__module__ != "numpy" or not isinstance(obj, np.ndarray):
+            return NotImplemented
+        if obj.dtype.kind not in "mM" or not obj.flags.c_contiguous:
+            return NotImplemented
+        return _as_dates, (obj.view(np.int64), obj.dtype)
+
+
+class SharedColumns:
+    """
+    A class to represent a CV whose numeric columns are published in a
+    shared-memory segment.
+
+    Attributes:
+    name (str): The name of the segment.
+    cv (CV): The CV.
+    size (int): The size of the segment in bytes.
+    owner (bool): Whether this process created the segment.
+    """
+
+    def __init__(self, segment, cv, owner=False):
+        self.name = segment.name
+        self.cv = cv
+        self.size = segment.size
+        self.owner = owner
+        self._segment = segment
+
+    def get_cv(self):
+        """
+        Get the CV.
+        """
+        return self.cv
+
+    def get_name(self):
+        """
+        Get the name of the segment, which the workers attach to.
+        """
+        return self.name
+
+    def close(self):
+        """
+        Detach from the segment. While arrays of the attached CV are still
+        referenced, the segment stays mapped until they are freed, so the CV
+        can still be used.
+        """
+        segment = self._segment
+        self._segment = None
+        self.cv = None
+        if segment is not None:
+            try:
+                segment.close()
+            except BufferError:
+                # Arrays of the CV still use the mapping, which is then
+                # unmapped when the last of them is freed.
+                pass
+
+    def unlink(self):
+        """
+        Detach from the segment and destroy it; only the publisher should.
+        """
+        segment = self._segment
+        self.close()
+        if segment is not None:
+            segment.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"SharedColumns(name={self.name}, size={self.size}, owner={self.owner})"
+
+
+def publish_columns(cv, name=None):
+    """
+    Publish a CV into a new shared-memory segment, named name or given a
+    unique name, with its numeric columns out of band. The returned
+    SharedColumns owns the segment: unlink it when the workers are done.
+    """
+    buffers = []
+    file = io.BytesIO()
+    SegmentPickler(file, protocol=5, buffer_callback=buffers.append).dump(cv)
+    data = file.getbuffer()
+    views = [buffer.raw() for buffer in buffers]
+    offset = _align(HEADER.size + BUFFER.size * len(views) + len(data))
+    layout = []
+    for view in views:
+        layout.append((offset, view.nbytes))
+        offset = _align(offset + view.nbytes)
+    segment = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+    memory = segment.buf
+    HEADER.pack_into(memory, 0, MAGIC, len(data), len(views))
+    position = HEADER.size
+    for start, length in layout:
+        BUFFER.pack_into(memory, position, start, length)
+        position += BUFFER.size
+    memory[position:position + len(data)] = data
+    for (start, length), view in zip(layout, views):
+        memory[start:start + length] = view
+    del memory
+    return SharedColumns(segment, cv, owner=True)
+
+
+def attach_columns(name):
+    """
+    Attach to the CV published in a shared-memory segment. Its numeric and
+    date NumPy arrays are read-only views of the segment; the rest of it is
+    a private copy.
+    """
+    segment = _open_segment(name)
+    memory = segment.buf
+    magic, length, count = HEADER.unpack_from(memory, 0)
+    if magic != MAGIC:
+        segment.close()
+        raise ValueError(f"Shared memory segment {name} does not hold a CV")
+    position = HEADER.size
+    readonly = memory.toreadonly()
+    buffers = []
+    for _ in range(count):
+        start, size = BUFFER.unpack_from(memory, position)
+        buffers.append(readonly[start:start + size])
+        position += BUFFER.size
+    cv = pickle.loads(readonly[position:position + length], buffers=buffers)
+    del memory, readonly, buffers
+    return SharedColumns(segment, cv)
@@ -1,7 +1,8 @@
 """
 This module contains the classes to handle the skills data.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
 
 
 class SkillData:
@@ -105,15 +106,22 @@ class Skills:
         """
         Load the skills data.
         """
-        skills_pd = pd.read_excel(filename, sheet_name="Skills")
-        for _, row in skills_pd.iterrows():
+        self.skills = []
+        for row in read_rows(filename, "Skills"):
             skill_data = SkillData()
             skill_data.load(row)
             self.skills.append(skill_data)
 
     def __repr__(self):
-        string = f"Skills(skills={repr(list(self.skills))})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per skill.
+        """
+        yield "Skills(skills="
+        yield from iter_list_repr(self.skills)
+        yield ")"
 
     def __iter__(self):
         return iter(self.skills)
@@ -0,0 +1,361 @@
+"""
+This module contains the frozen snapshots of a CV, for sharing a loaded CV
+between threads.
+
+A snapshot is a CV frozen in place: its lists and dictionaries become
+read-only and its objects refuse new attribute values, so that a reader
+can never see it change. Objects which build others on demand, such as
+the publications of a columnar store, have an on_freeze method, called
+with freeze, to freeze what they build from then on.
+
+A SnapshotStore reloads the CV file into a new snapshot, without touching
+the current one, and publishes it with a single reference assignment, so
+readers never lock and never see partial data. The sections whose sheets
+did not change since the previous snapshot are shared with it instead of
+being loaded again.
+"""
+import hashlib
+import threading
+
+from cvprocessor.cv import CV, SECTIONS, LoadOptions
+from cvprocessor.reader.reader import Reader, open_reader
+
+# Sections whose records are joined to the institutes, which can only be
+# shared with the previous snapshot when the institutes are shared too.
+JOINED_SECTIONS = ("education", "experience", "teaching", "supervision",
+                   "grants_awards", "presentations")
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is frozen")
+
+
+class FrozenList(list):
+    """
+    A read-only list, with the same repr and equality as a list.
+    """
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+class FrozenDict(dict):
+    """
+    A read-only dictionary, with the same repr and equality as a dict.
+    """
+    clear = pop = popitem = setdefault = update = _readonly
+    __setitem__ = __delitem__ = __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+# Class: its frozen subclass.
+FROZEN_CLASSES = {}
+FROZEN_TYPES = set()
+
+
+def _thaw_state(obj, base):
+    """
+    Get the pickled state of a frozen object.
+    """
+    custom = any("__getstate__" in vars(klass) for klass in base.__mro__
+                 if klass is not object)
+    return obj.__getstate__() if custom else dict(obj.__dict__)
+
+
+def _rebuild(base, state):
+    """
+    Rebuild a frozen object from its class and pickled state.
+    """
+    obj = base.__new__(base)
+    if hasattr(obj, "__setstate__"):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+    if hasattr(obj, "on_freeze"):
+        obj.on_freeze(freeze)
+    obj.__class__ = frozen_class(base)
+    return obj
+
+
+def _reduce(self, _protocol):
+    base = type(self).__mro__[1]
+    return (_rebuild, (base, _thaw_state(self, base)))
+
+
+def frozen_class(base):
+    """
+    Get the frozen subclass of a class, whose instances refuse to set or
+    delete attributes.
+    """
+    if base not in FROZEN_CLASSES:
+        frozen = type(base)(base.__name__, (base,), {
+            "__module__": base.__module__,
+            "__qualname__": base.__qualname__,
+            "__setattr__": _readonly,
+            "__delattr__": _readonly,
+            "__reduce_ex__": _reduce,
+        })
+        FROZEN_TYPES.add(frozen)
+        FROZEN_CLASSES[base] = frozen
+    return FROZEN_CLASSES[base]
+
+
+def is_frozen(obj):
+    """
+    Check whether an object of the CV is frozen.
+    """
+    return isinstance(obj, (FrozenList, FrozenDict)) or type(obj) in FROZEN_TYPES
+
+
+def _freeze_collection(value, memo):
+    """
+    Freeze a list, dictionary, tuple or set of the CV graph, returning its
+    frozen replacement.
+    """
+    if isinstance(value, tuple):
+        return tuple(_freeze(item, memo) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, list):
+        frozen = FrozenList(_freeze(item, memo) for item in value)
+    else:
+        frozen = FrozenDict((key, _freeze(item, memo)) for key, item in value.items())
+    memo[id(value)] = frozen
+    return frozen
+
+
+def _freeze(value, memo):
+    """
+    Freeze a value of the CV graph, returning its frozen replacement.
+    """
+    if is_frozen(value) or id(value) in memo:
+        return memo.get(id(value), value)
+    if isinstance(value, (list, dict, tuple, set)):
+        return _freeze_collection(value, memo)
+    if getattr(value, "ndim", 0) and hasattr(value, "setflags"):
+        # NumPy arrays are made read-only in place.
+        value.setflags(write=False)
+    elif hasattr(value, "__dict__") and type(value).__module__.startswith("cvprocessor."):
+        memo[id(value)] = value
+        for key, item in list(vars(value).items()):
+            object.__setattr__(value, key, _freeze(item, memo))
+        if hasattr(value, "on_freeze"):
+            # Objects which build others on demand freeze them as they are built.
+            value.on_freeze(freeze)
+        value.__class__ = frozen_class(type(value))
+    return value
+
+
+def freeze(obj):
+    """
+    Freeze a CV, or any object of it, in place and return it. Objects which
+    are already frozen, such as sections shared with an earlier snapshot,
+    are left as they are.
+    """
+    return _freeze(obj, {})
+
+
+class FingerprintReader(Reader):
+    """
+    The FingerprintReader class wraps a reader, keeping the rows of each
+    sheet it reads and a digest of them.
+
+    Attributes:
+    reader (Reader): The wrapped reader.
+    digests (dict): Sheet name: digest of its rows.
+    recorded (list): The sheets read since the last call to record.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.thread_safe = reader.thread_safe
+        self.timestamps = reader.timestamps
+        self.digests = {}
+        self.recorded = []
+        self._rows = {}
+
+    def get_sheet_names(self):
+        return self.reader.get_sheet_names()
+
+    def read_rows(self, sheet_name):
+        if sheet_name not in self._rows:
+            rows = self.reader.read_rows(sheet_name)
+            self._rows[sheet_name] = rows
+            self.digests[sheet_name] = hashlib.blake2b(
+                repr(rows).encode("utf-8"), digest_size=16).hexdigest()
+        self.recorded.append(sheet_name)
+        return self._rows[sheet_name]
+
+    def get_digest(self, sheet_name):
+        """
+        Get the digest of the rows of a sheet, None if it is missing.
+        """
+        try:
+            self.read_rows(sheet_name)
+        except ValueError:
+            return None
+        return self.digests[sheet_name]
+
+    def record(self):
+        """
+        Get the (sheet name, digest) of the sheets read since the last call.
+        """
+        fingerprint = tuple((sheet_name, self.digests[sheet_name])
+                            for sheet_name in dict.fromkeys(self.recorded))
+        self.recorded = []
+        return fingerprint
+
+    def close(self):
+        self._rows = {}
+        self.reader.close()
+
+
+class Snapshot:
+    """
+    A class to represent a frozen snapshot of a CV.
+
+    Attributes:
+    cv (CV): The frozen CV.
+    fingerprints (dict): Section name: (sheet name, digest) of the sheets it
+        was loaded from.
+    columnar (bool): Whether the publications are in a columnar store.
+    version (int): The number of the snapshot, starting at 1.
+    shared (list): The names of the sections shared with the previous snapshot.
+    """
+
+    def __init__(self, cv, fingerprints, columnar=False, version=1, shared=None):
+        self.cv = cv
+        self.fingerprints = fingerprints
+        self.columnar = columnar
+        self.version = version
+        self.shared = [] if shared is None else shared
+
+    def get_cv(self):
+        """
+        Get the frozen CV.
+        """
+        return self.cv
+
+    def get_version(self):
+        """
+        Get the number of the snapshot.
+        """
+        return self.version
+
+    def get_shared(self):
+        """
+        Get the names of the sections shared with the previous snapshot.
+        """
+        return self.shared
+
+    def __repr__(self):
+        string = (
+            f"Snapshot("
+            f"version={self.version}, "
+            f"sections={list(self.fingerprints)}, "
+            f"shared={self.shared})"
+        )
+        return string
+
+
+def _unchanged(previous, reader, name):
+    """
+    Check whether the sheets of a section of the previous snapshot are
+    unchanged.
+    """
+    fingerprint = previous.fingerprints.get(name)
+    return fingerprint is not None and all(
+        reader.get_digest(sheet_name) == digest for sheet_name, digest in fingerprint)
+
+
+def build_snapshot(filename, previous=None, **options):
+    """
+    Load a CV file into a new frozen Snapshot, with the CV load options. The
+    sections whose sheets are unchanged since the previous snapshot are
+    shared with it.
+    """
+    cv = CV.create(**options)
+    options = LoadOptions(**options)
+    columnar = options.columnar
+    if previous is not None and previous.columnar != columnar:
+        previous = None
+    fingerprints = {}
+    shared = []
+    reader = FingerprintReader(open_reader(filename, options.engine))
+    try:
+        institutes_unchanged = "institutes" not in cv.sections or (
+            previous is not None and _unchanged(previous, reader, "institutes"))
+        for name in SECTIONS:
+            if name not in cv.sections:
+                continue
+            if (previous is not None and name in previous.cv.sections
+                    and _unchanged(previous, reader, name)
+                    and (name not in JOINED_SECTIONS or institutes_unchanged)):
+                cv.set_section(name, previous.cv.get_section(name))
+                fingerprints[name] = previous.fingerprints[name]
+                shared.append(name)
+                continue
+            reader.record()
+            cv.load_section(name, reader, columnar)
+            fingerprints[name] = reader.record()
+    finally:
+        if reader.reader is not filename:
+            reader.close()
+    cv.link_sections(cv.sections)
+    version = 1 if previous is None else previous.version + 1
+    return freeze(Snapshot(cv, fingerprints, columnar, version, shared))
+
+
+class SnapshotStore:
+    """
+    A class to share the frozen snapshot of a CV file between threads.
+
+    get returns the current snapshot without locking. reload builds the next
+    snapshot aside and then replaces the current one with a single reference
+    assignment; concurrent reloads are serialized.
+
+    Attributes:
+    filename (str): The filename of the CV file.
+    columnar (bool): Keep the publications in a columnar store.
+    sections (list): The names of the sections to load, all if None.
+    engine (str): The reader engine, detected from the filename if None.
+    snapshot (Snapshot): The current snapshot.
+    """
+
+    def __init__(self, filename, columnar=False, sections=None, engine=None):
+        self.filename = filename
+        self.columnar = columnar
+        self.sections = sections
+        self.engine = engine
+        self.snapshot = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def get(self):
+        """
+        Get the current snapshot.
+        """
+        return self.snapshot
+
+    def get_cv(self):
+        """
+        Get the frozen CV of the current snapshot.
+        """
+        return self.snapshot.cv
+
+    def reload(self):
+        """
+        Load the CV file into a new snapshot, publish it and return it.
+        """
+        with self._lock:
+            snapshot = build_snapshot(self.filename, self.snapshot, columnar=self.columnar,
+                                      sections=self.sections, engine=self.engine)
+            self.snapshot = snapshot
+        return snapshot
+
+    def __repr__(self):
+        return f"SnapshotStore(filename={self.filename}, snapshot={repr(self.snapshot)})"
@@ -1,7 +1,8 @@
 """
 This module contains the Software class and SofwareData class.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
 
 from cvprocessor.links.links import Links
 
@@ -125,14 +126,21 @@ class Software:
         """
         Load the software data.
         """
-        software_df = pd.read_excel(filename, sheet_name="Software")
-        for _, row in software_df.iterrows():
+        self.softwares = []
+        for row in read_rows(filename, "Software"):
             self.softwares.append(SoftwareData())
             self.softwares[-1].load(row)
 
     def __repr__(self) -> str:
-        string = f"Software(software={repr(self.softwares)})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per software.
+        """
+        yield "Software(software="
+        yield from iter_list_repr(self.softwares)
+        yield ")"
 
     def __iter__(self):
         return iter(self.softwares)
@@ -0,0 +1,485 @@
+"""
+This module contains the CVStore class, a SQLite database of many CVs for
+queries across them.
+
+Adding a CV reads its workbook once: the rows of its sheets are kept as
+JSON, so that get_cv loads the CV back with the usual section loaders
+without the workbook, and the tables of CV.to_tables fill a normalized
+schema (publications, publication authors and affiliations, authors,
+author affiliations, institutes, dates and links) keyed by CV, with
+indexes for the cross-CV queries. Each add is one transaction whose rows
+are inserted with executemany, table by table.
+
+The year of a publication is the year of its Dates.get_start, its earliest
+start, so that the SQL queries agree with the in-memory API.
+"""
+import datetime
+import json
+import os
+import sqlite3
+
+from cvprocessor.cv import CV
+from cvprocessor.export import to_data
+from cvprocessor.reader.reader import JsonReader, Reader, open_reader
+
+# Version of the schema, kept in PRAGMA user_version.
+STORE_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cvs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    added TEXT NOT NULL,
+    sections TEXT
+);
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    sheet TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (cv_id, sheet, position)
+);
+CREATE TABLE IF NOT EXISTS institutes (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    institute_id INTEGER,
+    name TEXT,
+    abbrv TEXT,
+    department TEXT,
+    department_abbrv TEXT,
+    group_name TEXT,
+    city TEXT,
+    country TEXT
+);
+CREATE TABLE IF NOT EXISTS authors (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    author_id INTEGER,
+    name TEXT,
+    lastname TEXT,
+    preferred_name TEXT,
+    alias TEXT,
+    job_title TEXT,
+    email TEXT
+);
+CREATE TABLE IF NOT EXISTS author_affiliations (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    author_id INTEGER,
+    institute_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS publications (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    publication_id INTEGER NOT NULL,
+    title TEXT,
+    type TEXT,
+    venue TEXT,
+    volume TEXT,
+    issue TEXT,
+    artno TEXT,
+    page_start TEXT,
+    page_end TEXT,
+    year INTEGER,
+    abstract TEXT,
+    keywords TEXT,
+    license TEXT,
+    copyright TEXT,
+    PRIMARY KEY (cv_id, publication_id)
+);
+CREATE TABLE IF NOT EXISTS publication_authors (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    publication_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    author_id INTEGER,
+    PRIMARY KEY (cv_id, publication_id, position)
+);
+CREATE TABLE IF NOT EXISTS publication_affiliations (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    publication_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    institute_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS dates (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    record INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    range TEXT,
+    start TEXT,
+    "end" TEXT
+);
+CREATE TABLE IF NOT EXISTS links (
+    cv_id INTEGER NOT NULL REFERENCES cvs (id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    record INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT,
+    url TEXT
+);
+CREATE INDEX IF NOT EXISTS institutes_id ON institutes (cv_id, institute_id);
+CREATE INDEX IF NOT EXISTS institutes_department ON institutes (department);
+CREATE INDEX IF NOT EXISTS authors_id ON authors (cv_id, author_id);
+CREATE INDEX IF NOT EXISTS authors_lastname ON authors (lastname);
+CREATE INDEX IF NOT EXISTS author_affiliations_author
+    ON author_affiliations (cv_id, author_id);
+CREATE INDEX IF NOT EXISTS author_affiliations_institute
+    ON author_affiliations (cv_id, institute_id);
+CREATE INDEX IF NOT EXISTS publications_venue_year ON publications (venue, year);
+CREATE INDEX IF NOT EXISTS publications_year ON publications (year);
+CREATE INDEX IF NOT EXISTS publications_type ON publications (type);
+CREATE INDEX IF NOT EXISTS publication_authors_author
+    ON publication_authors (cv_id, author_id);
+CREATE INDEX IF NOT EXISTS publication_affiliations_publication
+    ON publication_affiliations (cv_id, publication_id);
+CREATE INDEX IF NOT EXISTS dates_record ON dates (cv_id, section, record);
+CREATE INDEX IF NOT EXISTS dates_start ON dates (section, start);
+CREATE INDEX IF NOT EXISTS links_record ON links (cv_id, section, record);
+"""
+
+# Store table: the to_tables table of its rows.
+SOURCES = {
+    "institutes": "institutes",
+    "authors": "authors",
+    "publications": "publications",
+    "publication_authors": "publications_auth_id_aff_id",
+    "dates": "dates",
+    "links": "links",
+}
+
+# Store table: store column: to_tables column.
+COLUMNS = {
+    "institutes": {
+        "institute_id": "id",
+        "name": "name_name",
+        "abbrv": "name_abbrv",
+        "department": "department_name",
+        "department_abbrv": "department_abbrv",
+        "group_name": "group_name",
+        "city": "contact_city",
+        "country": "contact_country",
+    },
+    "authors": {
+        "author_id": "id",
+        "name": "personal_name",
+        "lastname": "personal_lastname",
+        "preferred_name": "personal_preferredname",
+        "alias": "personal_alias",
+        "job_title": "job_title",
+        "email": "contact_email",
+    },
+    "publications": {
+        "publication_id": "record",
+        "title": "details_title",
+        "type": "details_type",
+        "venue": "details_venue_venue",
+        "volume": "details_venue_volume",
+        "issue": "details_venue_issue",
+        "artno": "details_venue_artno",
+        "page_start": "details_pages_page_start",
+        "page_end": "details_pages_page_end",
+        "year": "year",
+        "abstract": "details_abstract",
+        "keywords": "details_keywords",
+        "license": "rights_license",
+        "copyright": "rights_copyright",
+    },
+    "publication_authors": {
+        "publication_id": "record",
+        "position": "position",
+        "author_id": "author_id",
+    },
+    "dates": {
+        "section": "section",
+        "record": "record",
+        "field": "field",
+        "position": "position",
+        "range": "range",
+        "start": "start",
+        "end": "end",
+    },
+    "links": {
+        "section": "section",
+        "record": "record",
+        "field": "field",
+        "position": "position",
+        "type": "type",
+        "url": "url",
+    },
+}
+
+
+def to_sql(value):
+    """
+    Convert a table value to a SQLite value: datetimes become ISO 8601
+    strings.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+class RecordingReader(Reader):
+    """
+    The RecordingReader class wraps a reader, keeping the rows of the sheets
+    read through it.
+
+    Attributes:
+    reader (Reader): The wrapped reader.
+    sheets (dict): Sheet name: rows.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.thread_safe = reader.thread_safe
+        self.timestamps = reader.timestamps
+        self.sheets = {}
+
+    def get_sheet_names(self):
+        return self.reader.get_sheet_names()
+
+    def read_rows(self, sheet_name):
+        rows = self.reader.read_rows(sheet_name)
+        self.sheets[sheet_name] = rows
+        return rows
+
+    def close(self):
+        self.reader.close()
+
+
+class StoreReader(JsonReader):
+    """
+    The StoreReader class reads the sheet rows of a CV of a store, as the
+    JSON engine reads a JSON document.
+    """
+
+    def __init__(self, document):
+        super().__init__(None)
+        self._document = document
+
+    def close(self):
+        """
+        Keep the rows, which are not read again from the store.
+        """
+
+
+class CVStore:
+    """
+    A class to represent a SQLite database of CVs.
+
+    Attributes:
+    path (str): The path of the database.
+    connection (sqlite3.Connection): The connection to the database.
+
+    Methods:
+    add: Add or replace a CV.
+    add_many: Add or replace many CVs in one transaction.
+    remove: Remove a CV.
+    get_names: Get the names of the CVs.
+    get_cv: Load a CV back from the store.
+    query_publications: Query the publications of all the CVs.
+    execute: Run a SQL query.
+    close: Close the connection.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, STORE_VERSION):
+            self.connection.close()
+            raise ValueError(f"Unsupported store version {version} in {path}")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def add(self, source, name=None, engine=None, sections=None):
+        """
+        Add a CV, replacing the CV of the same name. The name defaults to
+        the file name of source without its extension, and only the given
+        sections are loaded, all if None. Returns the CV.
+        """
+        with self.connection:
+            return self._add(source, name, engine, sections)
+
+    def add_many(self, sources, engine=None, sections=None):
+        """
+        Add many CV files in one transaction, named after their files.
+        Returns the names of the CVs.
+        """
+        names = []
+        with self.connection:
+            for source in sources:
+                name = get_name(source)
+                self._add(source, name, engine, sections)
+                names.append(name)
+        return names
+
+    def _add(self, source, name, engine, sections):
+        name = get_name(source) if name is None else name
+        reader = RecordingReader(open_reader(source, engine))
+        try:
+            cv = CV(reader, sections=sections)
+        finally:
+            reader.close()
+        self.connection.execute("DELETE FROM cvs WHERE name = ?", (name,))
+        cv_id = self.connection.execute(
+            "INSERT INTO cvs (name, added, sections) VALUES (?, ?, ?)",
+            (name, datetime.datetime.now().isoformat(timespec="seconds"),
+             None if sections is None else json.dumps(list(sections)))).lastrowid
+        self.connection.executemany(
+            "INSERT INTO sheet_rows (cv_id, sheet, position, data) VALUES (?, ?, ?, ?)",
+            ((cv_id, sheet, position, json.dumps(to_data(row), ensure_ascii=False))
+             for sheet, rows in reader.sheets.items()
+             for position, row in enumerate(rows)))
+        tables = cv.to_tables()
+        if "publications" in tables:
+            tables["publications"]["year"] = [
+                get_year(publication.details.dates)
+                for publication in cv.academic.publications]
+        self._insert_tables(cv_id, tables)
+        return cv
+
+    def _insert_tables(self, cv_id, tables):
+        for table, columns in COLUMNS.items():
+            values = tables.get(SOURCES[table], {})
+            count = len(values.get("record", ()))
+            self._insert(table, cv_id, list(columns), zip(
+                *[values.get(column, [None] * count) for column in columns.values()]))
+        authors = tables.get("authors", {})
+        self._insert("author_affiliations", cv_id, ["author_id", "institute_id"], explode(
+            zip(authors.get("id", ())), authors.get("affiliation_ids", ())))
+        positions = tables.get("publications_auth_id_aff_id", {})
+        self._insert("publication_affiliations", cv_id,
+                     ["publication_id", "position", "institute_id"], explode(
+                         zip(positions.get("record", ()), positions.get("position", ())),
+                         positions.get("affiliation_ids", ())))
+
+    def _insert(self, table, cv_id, columns, rows):
+        quoted = ", ".join(f'"{column}"' for column in columns)
+        self.connection.executemany(
+            f"INSERT INTO {table} (cv_id, {quoted}) VALUES (?{', ?' * len(columns)})",
+            ((cv_id, *map(to_sql, row)) for row in rows))
+
+    def remove(self, name):
+        """
+        Remove a CV and its rows.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM cvs WHERE name = ?", (name,))
+
+    def get_names(self):
+        """
+        Get the names of the CVs, in the order they were added.
+        """
+        return [row["name"] for row in self.connection.execute("SELECT name FROM cvs ORDER BY id")]
+
+    def get_cv(self, name, columnar=False, sections=None):
+        """
+        Load a CV back from the rows of its sheets, without its workbook.
+        The sections default to those it was added with.
+        """
+        if sections is None:
+            row = self.connection.execute(
+                "SELECT sections FROM cvs WHERE name = ?", (name,)).fetchone()
+            if row is not None and row["sections"] is not None:
+                sections = json.loads(row["sections"])
+        document = {}
+        for row in self.connection.execute(
+                "SELECT sheet, data FROM sheet_rows JOIN cvs ON cvs.id = sheet_rows.cv_id "
+                "WHERE cvs.name = ? ORDER BY sheet, position", (name,)):
+            document.setdefault(row["sheet"], []).append(json.loads(row["data"]))
+        if not document:
+            raise ValueError(f"CV not found in the store: {name}")
+        return CV(StoreReader(document), columnar=columnar, sections=sections)
+
+    def query_publications(self, venue=None, year=None, doc_type=None, department=None):
+        """
+        Get the publications of all the CVs with the given venue, year,
+        document type and department of one of their authors, as (cv,
+        title, venue, year, type) rows, newest first. year takes a year or
+        an inclusive (start, end) tuple where either bound may be None, as
+        Publications.query does.
+        """
+        conditions, parameters = [], []
+        for column, value in (("venue", venue), ("type", doc_type)):
+            if value is not None:
+                conditions.append(f"publications.{column} = ?")
+                parameters.append(value)
+        since, until = year if isinstance(year, tuple) else (year, year)
+        if since is not None:
+            conditions.append("publications.year >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("publications.year <= ?")
+            parameters.append(until)
+        if department is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM publication_authors "
+                "JOIN author_affiliations ON author_affiliations.cv_id = publication_authors.cv_id "
+                "AND author_affiliations.author_id = publication_authors.author_id "
+                "JOIN institutes ON institutes.cv_id = author_affiliations.cv_id "
+                "AND institutes.institute_id = author_affiliations.institute_id "
+                "WHERE publication_authors.cv_id = publications.cv_id "
+                "AND publication_authors.publication_id = publications.publication_id "
+                "AND institutes.department = ?)")
+            parameters.append(department)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return self.execute(
+            "SELECT cvs.name AS cv, publications.title, publications.venue, "
+            "publications.year, publications.type "
+            "FROM publications JOIN cvs ON cvs.id = publications.cv_id "
+            f"{where}ORDER BY publications.year DESC, cvs.name, publications.publication_id",
+            parameters)
+
+    def execute(self, sql, parameters=()):
+        """
+        Run a SQL query and get its rows as dictionaries.
+        """
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"CVStore(path={self.path}, cvs={len(self.get_names())})"
+
+
+def explode(keys, lists):
+    """
+    Get a (*key, value) row for each value of the list of each key.
+    """
+    for key, values in zip(keys, lists):
+        for value in values or ():
+            yield (*key, value)
+
+
+def get_year(dates):
+    """
+    Get the year of the start of dates, as Dates.get_start gives it, None
+    when they have no start.
+    """
+    try:
+        start = dates.get_start()
+    except (IndexError, ValueError):
+        return None
+    return None if start is None else start.year
+
+
+def get_name(source):
+    """
+    Get the default name of a CV in a store: its file name without the
+    extension.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        raise ValueError("A name is required for a CV given as content")
+    return os.path.splitext(os.path.basename(os.path.normpath(source)))[0]
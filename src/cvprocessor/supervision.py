@@ -1,7 +1,9 @@
 """
 This module contains the classes and methods to process the supervision data from the CV.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_lines
+from cvprocessor.trace import phase
 
 from cvprocessor.education import Education
 
@@ -39,6 +41,12 @@ class SupervisionData:
         """
         return self.type
 
+    def get_institute(self):
+        """
+        Get the institute of the supervision, None if its institution id does not resolve.
+        """
+        return self.education.get_institute()
+
     def load(self, df):
         """
         Load the supervision data.
@@ -89,20 +97,25 @@ class Supervision:
         """
         Load the supervision data.
         """
-        supervision_df = pd.read_excel(filename, sheet_name="Supervision")
-        for _, row in supervision_df.iterrows():
+        self.supervisions = []
+        for row in read_rows(filename, "Supervision"):
             supervision_data = SupervisionData()
             supervision_data.load(row)
             self.supervisions.append(supervision_data)
         # sort the supervision data by type and year
-        self.supervisions = sorted(
-            self.supervisions, key=lambda x: (x.type, x.education.dates.get_end()), reverse=True)
+        with phase("sort"):
+            self.supervisions = sorted(
+                self.supervisions, key=lambda x: (x.type, x.education.dates.get_end()),
+                reverse=True)
 
     def __str__(self) -> str:
-        string = ""
-        for supervision in self.supervisions:
-            string += str(supervision) + "\n"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one line per supervision.
+        """
+        return iter_lines(self.supervisions)
 
     def __repr__(self) -> str:
         string = f"Supervision(supervision={repr(list(self.supervisions))})"
@@ -0,0 +1,202 @@
+"""
+This module contains the export of a CV to flat, column-oriented tables.
+
+to_tables walks the records of the loaded sections once and appends each
+record to the table of its section as a row of scalar columns. Nested
+objects are flattened into prefixed columns ("details_title"), lists of
+scalars are kept as list columns, and the other nested lists become child
+tables keyed by the record ("publications_auth_id_aff_id", one row per
+author position). The links and date ranges of every section go to two
+long tables, "links" and "dates", keyed by section, record and field.
+
+The tables are dictionaries of column lists, which pyarrow.table and
+pandas.DataFrame take as they are. write_parquet writes one Parquet file
+per table when pyarrow is installed.
+"""
+import datetime
+import importlib
+import os
+
+from cvprocessor.lazy import numpy as np
+from cvprocessor.reader.reader import isna
+from cvprocessor.export import get_attributes, is_sequence, to_data
+from cvprocessor.links.links import Link, Links
+from cvprocessor.date.date import Date, Dates
+
+
+class Table:
+    """
+    A class to represent a table being built row by row, column by column.
+
+    Attributes:
+    columns (dict): Column name: list of values.
+    rows (int): The number of rows.
+    list_columns (set): The names of the columns with list values.
+
+    Methods:
+    append: Append a row.
+    get_columns: Get the columns.
+    """
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = 0
+        self.list_columns = set()
+
+    def append(self, row):
+        """
+        Append a row (column name: value); the columns missing from the row
+        are None, and new columns are None in the previous rows.
+        """
+        for name, value in row.items():
+            if name not in self.columns:
+                self.columns[name] = [None] * self.rows
+            if isinstance(value, list):
+                self.list_columns.add(name)
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+        self.rows += 1
+
+    def get_columns(self):
+        """
+        Get the columns of the table. The empty strings of the list columns,
+        left by the cells without values, become None, so that each column
+        has a single type.
+        """
+        for name in self.list_columns:
+            self.columns[name] = [None if value == "" else value
+                                  for value in self.columns[name]]
+        return self.columns
+
+    def __len__(self):
+        return self.rows
+
+    def __repr__(self):
+        return f"Table(rows={self.rows}, columns={list(self.columns)})"
+
+
+def to_value(obj):
+    """
+    Convert a scalar of a CV object to a table value: the dates stay
+    datetimes, the other scalars are converted as by to_data (NaN becomes
+    None, NumPy scalars Python ones).
+    """
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return None if isna(obj) else obj
+    return to_data(obj)
+
+
+def is_scalar(obj):
+    """
+    Check whether a CV object is a table value.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str, datetime.date, np.generic)):
+        return True
+    return not is_sequence(obj) and not hasattr(obj, "__dict__")
+
+
+class TablesBuilder:
+    """
+    A class to build the tables of a CV in one pass over its records.
+
+    Attributes:
+    tables (dict): Table name: Table.
+
+    Methods:
+    add_section: Add the records of a section.
+    get_tables: Get the tables as dictionaries of column lists.
+    """
+
+    def __init__(self):
+        self.tables = {}
+
+    def _table(self, name):
+        if name not in self.tables:
+            self.tables[name] = Table()
+        return self.tables[name]
+
+    def add_section(self, name, section):
+        """
+        Add the records of a section: its items, or the whole section for
+        the sections without items.
+        """
+        records = section if hasattr(section, "__iter__") else [section]
+        table = self._table(name)
+        for record_id, record in enumerate(records):
+            row = {"record": record_id}
+            self._flatten(record, (name, record_id), "", row)
+            table.append(row)
+
+    def _flatten(self, obj, key, prefix, row):
+        for attribute, value in get_attributes(obj):
+            field = prefix + attribute
+            if isinstance(value, (Links, Link)):
+                self._add_links(value, key, field)
+            elif isinstance(value, (Dates, Date)):
+                self._add_dates(value, key, field)
+            elif is_scalar(value):
+                row[field] = to_value(value)
+            elif not is_sequence(value):
+                self._flatten(value, key, field + "_", row)
+            elif all(is_scalar(item) for item in value):
+                row[field] = [to_value(item) for item in value]
+            else:
+                table = self._table(f"{key[0]}_{field}")
+                for position, item in enumerate(value):
+                    item_row = {"record": key[1], "position": position}
+                    self._flatten(item, key, "", item_row)
+                    table.append(item_row)
+
+    def _add_links(self, links, key, field):
+        table = self._table("links")
+        for position, link in enumerate(links.links if isinstance(links, Links) else [links]):
+            table.append({"section": key[0], "record": key[1], "field": field,
+                          "position": position, "type": to_value(link.type),
+                          "url": to_value(link.url)})
+
+    def _add_dates(self, dates, key, field):
+        table = self._table("dates")
+        for position, date in enumerate(dates.dates if isinstance(dates, Dates) else [dates]):
+            table.append({"section": key[0], "record": key[1], "field": field,
+                          "position": position, "range": to_value(date.range),
+                          "start": to_value(date.start), "end": to_value(date.end)})
+
+    def get_tables(self):
+        """
+        Get the tables, table name: column name: list of values.
+        """
+        return {name: table.get_columns() for name, table in self.tables.items()}
+
+    def __repr__(self):
+        return f"TablesBuilder(tables={self.tables})"
+
+
+def to_tables(cv, sections=None):
+    """
+    Convert the loaded sections of a CV, or the given ones, to tables:
+    table name: column name: list of values.
+    """
+    builder = TablesBuilder()
+    for name in cv.sections if sections is None else sections:
+        builder.add_section(name, cv.get_section(name))
+    return builder.get_tables()
+
+
+def write_parquet(tables, directory):
+    """
+    Write each table as <directory>/<table name>.parquet. Requires pyarrow;
+    raises ImportError when it is not installed.
+    """
+    try:
+        pyarrow = importlib.import_module("pyarrow")
+        parquet = importlib.import_module("pyarrow.parquet")
+    except ImportError as error:
+        raise ImportError("Writing Parquet files requires pyarrow "
+                          "(pip install cvprocessor[parquet])") from error
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, columns in tables.items():
+        path = os.path.join(directory, f"{name}.parquet")
+        parquet.write_table(pyarrow.table(columns), path)
+        paths.append(path)
+    return paths
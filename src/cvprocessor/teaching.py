@@ -1,7 +1,9 @@
 """
 This module contains the classes to process the teaching data from the CV.
 """
-import pandas as pd
+from cvprocessor.reader.reader import read_rows
+from cvprocessor.render import iter_list_repr
+from cvprocessor.trace import phase
 from cvprocessor.education import Education
 
 
@@ -33,6 +35,12 @@ class TeachingData:
         """
         return self.type
 
+    def get_institute(self):
+        """
+        Get the institute of the teaching, None if its institution id does not resolve.
+        """
+        return self.education.get_institute()
+
     def load(self, filename):
         """
         Load the teaching data.
@@ -85,16 +93,24 @@ class Teaching:
         """
         Load the teaching data.
         """
-        teaching_df = pd.read_excel(filename, sheet_name="Teaching")
-        for _, row in teaching_df.iterrows():
+        self.teaching = []
+        for row in read_rows(filename, "Teaching"):
             self.teaching.append(TeachingData())
             self.teaching[-1].load(row)
-        self.teaching = sorted(
-            self.teaching, key=lambda x: x.education.dates.get_end(), reverse=True)
+        with phase("sort"):
+            self.teaching = sorted(
+                self.teaching, key=lambda x: x.education.dates.get_end(), reverse=True)
 
     def __repr__(self):
-        string = f"Teaching(teaching={repr(self.teaching)})"
-        return string
+        return "".join(self.iter_text())
+
+    def iter_text(self):
+        """
+        Iterate over the chunks of the text of the section, one per course.
+        """
+        yield "Teaching(teaching="
+        yield from iter_list_repr(self.teaching)
+        yield ")"
 
     def __iter__(self):
         return iter(self.teaching)
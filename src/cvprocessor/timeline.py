@@ -0,0 +1,75 @@
+"""
+This module contains the Timeline class, an interval index over the dated
+ranges of the Experience, Education, Grants & Awards and Memberships sections.
+"""
+from cvprocessor.index.index import IntervalIndex
+
+
+class Timeline:
+    """
+    The Timeline class is used to query the dated ranges of several sections.
+
+    Every Date of an item is indexed as its own interval, so an item with
+    several ranges is found through any of them.
+
+    Attributes:
+    items (list): The indexed items (ExperienceData, Education, ...).
+    index (IntervalIndex): The interval index over the items' dates.
+
+    Methods:
+    active_on: Get the items active on a date.
+    overlapping: Get the items overlapping a period.
+    overlapping_pairs: Get the pairs of items that overlap each other.
+    gaps: Get the periods not covered by any item.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.index = IntervalIndex()
+
+    def active_on(self, date):
+        """
+        Get the items active on the given date, newest first.
+        """
+        return [self.items[i] for i in self.index.stab(date)]
+
+    def overlapping(self, start, end):
+        """
+        Get the items overlapping the period from start to end, newest first.
+        """
+        return [self.items[i] for i in self.index.overlap(start, end)]
+
+    def overlapping_pairs(self):
+        """
+        Get the pairs of items whose dates overlap each other.
+        """
+        return [(self.items[i], self.items[j])
+                for i, j in self.index.overlapping_pairs()]
+
+    def gaps(self, start=None, end=None):
+        """
+        Get the (start, end) periods not covered by any item.
+        """
+        return self.index.gaps(start, end)
+
+    def load(self, sections):
+        """
+        Load the timeline from sections whose items have dates.
+        """
+        self.items = []
+        intervals = []
+        for section in sections:
+            for item in section:
+                for date in item.dates:
+                    intervals.append(
+                        (date.get_start(), date.get_end(), len(self.items)))
+                self.items.append(item)
+        self.index.load(intervals)
+
+    def __repr__(self):
+        string = (
+            f"Timeline("
+            f"items={len(self.items)}, "
+            f"index={repr(self.index)})"
+        )
+        return string
@@ -0,0 +1,306 @@
+"""
+This module contains the load instrumentation: the wall time and rows of
+each section load, split into phases (sheet read, date parsing, sorting
+and the remaining row decoding), optionally sent as trace spans to a hook.
+
+The loaders mark their phases with phase(name). While no section is being
+measured in the current thread, phase returns a shared no-op context
+manager, so the instrumentation costs a thread-local lookup when it is off.
+
+With memory, the allocation peak of each section load is also recorded
+with tracemalloc, which slows the load down several times. tracemalloc
+traces the whole process, so the peaks of sections loaded concurrently
+(CV.aload) include each other's allocations.
+"""
+import threading
+import time
+
+from cvprocessor.lazy import LazyModule
+from cvprocessor.reader.reader import Reader
+
+tracemalloc = LazyModule("tracemalloc")
+
+_local = threading.local()
+
+
+class NullSpan:
+    """
+    A context manager which does nothing, used when nothing is measured.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+NULL_SPAN = NullSpan()
+
+
+class PhaseSpan:
+    """
+    A context manager adding its wall time to a phase of a section.
+
+    Attributes:
+    section (SectionStats): The measured section.
+    name (str): The name of the phase.
+    """
+
+    def __init__(self, section, name):
+        self.section = section
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.section.add_phase(self.name, time.perf_counter() - self._start)
+
+
+def phase(name):
+    """
+    Get a context manager measuring a phase of the section loaded in this
+    thread, or a no-op one when no section is measured.
+    """
+    section = getattr(_local, "section", None)
+    if section is None:
+        return NULL_SPAN
+    return PhaseSpan(section, name)
+
+
+class SectionStats:
+    """
+    A class to represent the load statistics of a section.
+
+    Attributes:
+    name (str): The name of the section.
+    seconds (float): The wall time of the load.
+    rows (int): The number of rows read.
+    sheets (list): The names of the sheets read.
+    phases (dict): Phase name: [seconds, count].
+    peak (int): The tracemalloc peak of the load in bytes, above the memory
+        traced when it started, None if it was not traced.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = 0
+        self.sheets = []
+        self.phases = {}
+        self.peak = None
+
+    def add_phase(self, name, seconds):
+        """
+        Add the wall time of one run of a phase.
+        """
+        total = self.phases.setdefault(name, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+    def add_rows(self, sheet_name, rows):
+        """
+        Add the rows read from a sheet.
+        """
+        self.sheets.append(sheet_name)
+        self.rows += rows
+
+    def get_phase(self, name):
+        """
+        Get the wall time of a phase. The "decode" phase is the time not
+        spent in the other phases.
+        """
+        if name == "decode":
+            return max(0.0, self.seconds - sum(total[0] for total in self.phases.values()))
+        return self.phases.get(name, [0.0, 0])[0]
+
+    def get_rows_per_second(self):
+        """
+        Get the rows loaded per second.
+        """
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self):
+        phases = {name: round(self.get_phase(name), 6)
+                  for name in list(self.phases) + ["decode"]}
+        return (f"SectionStats(name={self.name}, seconds={self.seconds:.6f}, "
+                f"rows={self.rows}, phases={phases}, peak={self.peak})")
+
+
+class SectionSpan:
+    """
+    A context manager measuring the load of a section in this thread.
+
+    Attributes:
+    stats (LoadStats): The statistics of the load.
+    section (SectionStats): The statistics of the section.
+    """
+
+    def __init__(self, stats, section):
+        self.stats = stats
+        self.section = section
+        self._start = None
+        self._wall_start = None
+        self._outer = None
+        self._traced = None
+
+    def __enter__(self):
+        self._outer = getattr(_local, "section", None)
+        _local.section = self.section
+        if self.stats.memory:
+            self._start_tracing()
+        self._wall_start = time.time()
+        self._start = time.perf_counter()
+        return self.section
+
+    def __exit__(self, *exc_info):
+        self.section.seconds += time.perf_counter() - self._start
+        if self._traced is not None:
+            self._stop_tracing()
+        _local.section = self._outer
+        self.stats.emit(self.section, self._wall_start)
+
+    def _start_tracing(self):
+        with LoadStats.tracing_lock:
+            if LoadStats.tracing == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                LoadStats.tracing_started = True
+            LoadStats.tracing += 1
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+
+    def _stop_tracing(self):
+        with LoadStats.tracing_lock:
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self._traced)
+            self.section.peak = max(peak, self.section.peak or 0)
+            LoadStats.tracing -= 1
+            if LoadStats.tracing == 0 and LoadStats.tracing_started:
+                tracemalloc.stop()
+                LoadStats.tracing_started = False
+        self._traced = None
+
+
+class LoadStats:
+    """
+    A class to represent the load statistics of a CV.
+
+    Attributes:
+    sections (dict): Section name: SectionStats, in load order.
+    trace (callable): The hook called with a span dictionary at the end of
+        each section load and for each of its phases, or None.
+    memory (bool): Record the tracemalloc peak of each section load.
+    """
+
+    # The section loads being traced with tracemalloc, in any CV, and
+    # whether tracemalloc was started for them.
+    tracing_lock = threading.Lock()
+    tracing = 0
+    tracing_started = False
+
+    def __init__(self, trace=None, memory=False):
+        self.sections = {}
+        self.trace = trace
+        self.memory = memory
+
+    def section(self, name):
+        """
+        Get a context manager measuring the load of a section.
+        """
+        stats = self.sections.setdefault(name, SectionStats(name))
+        return SectionSpan(self, stats)
+
+    def emit(self, section, start):
+        """
+        Send the spans of a loaded section to the trace hook.
+        """
+        if self.trace is None:
+            return
+        span = {"name": "section", "section": section.name, "start": start,
+                "duration": section.seconds, "rows": section.rows,
+                "sheets": list(section.sheets)}
+        if section.peak is not None:
+            span["peak"] = section.peak
+        self.trace(span)
+        for name in list(section.phases) + ["decode"]:
+            count = section.phases.get(name, [0.0, 1])[1]
+            self.trace({"name": name, "section": section.name, "start": start,
+                        "duration": section.get_phase(name), "count": count})
+
+    def get_section(self, name):
+        """
+        Get the statistics of a section, None if it was not loaded.
+        """
+        return self.sections.get(name)
+
+    def get_seconds(self):
+        """
+        Get the total wall time of the section loads.
+        """
+        return sum(section.seconds for section in self.sections.values())
+
+    def get_slowest(self, count=5):
+        """
+        Get the statistics of the slowest sections, slowest first.
+        """
+        return sorted(self.sections.values(), key=lambda section: section.seconds,
+                      reverse=True)[:count]
+
+    def format(self):
+        """
+        Format the statistics as a table, one line per section.
+        """
+        header = "section\trows\tms\trows/s\tread ms\tdates ms\tsort ms\tdecode ms"
+        lines = [header + "\tpeak KiB" if self.memory else header]
+        for section in self.sections.values():
+            columns = [section.name, str(section.rows), f"{section.seconds * 1000:.1f}",
+                       f"{section.get_rows_per_second():.0f}",
+                       *(f"{section.get_phase(name) * 1000:.1f}"
+                         for name in ("read", "dates", "sort", "decode"))]
+            if self.memory:
+                columns.append(f"{(section.peak or 0) / 1024:.1f}")
+            lines.append("\t".join(columns))
+        lines.append(f"total\t{sum(s.rows for s in self.sections.values())}\t"
+                     f"{self.get_seconds() * 1000:.1f}")
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["trace"] = None
+        return state
+
+    def __repr__(self):
+        return (f"LoadStats(seconds={self.get_seconds():.6f}, "
+                f"sections={list(self.sections.values())})")
+
+
+class TimingReader(Reader):
+    """
+    The TimingReader class wraps a reader, counting the sheet reads in the
+    "read" phase and the rows of the section loaded in this thread.
+
+    Attributes:
+    reader (Reader): The wrapped reader.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.thread_safe = reader.thread_safe
+        self.timestamps = reader.timestamps
+
+    def get_sheet_names(self):
+        return self.reader.get_sheet_names()
+
+    def read_rows(self, sheet_name):
+        with phase("read"):
+            rows = self.reader.read_rows(sheet_name)
+        section = getattr(_local, "section", None)
+        if section is not None:
+            section.add_rows(sheet_name, len(rows))
+        return rows
+
+    def close(self):
+        self.reader.close()
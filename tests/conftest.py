@@ -0,0 +1,56 @@
+"""
+Fixtures of the tests: the sample cv.xlsx of the repository, which has
+every sheet but Presentations.
+"""
+import contextlib
+import json
+import os
+
+import pytest
+
+from cvprocessor.cv import SECTIONS
+from cvprocessor.reader.reader import isna, open_reader
+
+CV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cv.xlsx")
+
+# The sections of the sample CV.
+CV_SECTIONS = [name for name in SECTIONS if name != "presentations"]
+
+
+@pytest.fixture
+def cv_file():
+    """
+    The path of the sample CV.
+    """
+    return CV_FILE
+
+
+@pytest.fixture
+def cv_sections():
+    """
+    The sections of the sample CV.
+    """
+    return list(CV_SECTIONS)
+
+
+@pytest.fixture
+def cv_sheets():
+    """
+    The rows of each sheet of the sample CV, to be changed by a test.
+    """
+    with contextlib.closing(open_reader(CV_FILE)) as reader:
+        return {name: reader.read_rows(name) for name in reader.get_sheet_names()}
+
+
+@pytest.fixture
+def to_document():
+    """
+    A function writing sheets as a document of the json engine.
+    """
+    def write(sheets):
+        return json.dumps({name: [{column: None if isna(value) else value
+                                   for column, value in row.items()}
+                                  for row in rows]
+                           for name, rows in sheets.items()},
+                          default=lambda value: value.isoformat()).encode()
+    return write
@@ -0,0 +1,76 @@
+"""
+Tests of the asyncio loading.
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+
+from cvprocessor.cv import CV
+from cvprocessor.export import to_dict
+from cvprocessor.reader.reader import PandasReader
+
+# The ISO 8601 timestamps with microseconds: the ends of the open-ended
+# dates, the load time of each CV.
+NOW = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+")
+
+
+def to_json(cv):
+    """
+    Get the JSON export of a CV, without its load times.
+    """
+    return NOW.sub("NOW", json.dumps(to_dict(cv)))
+
+
+def test_aload_matches_load(cv_file, cv_sections):
+    """
+    CV.aload loads the same CV as CV.
+    """
+    cv = asyncio.run(CV.aload(cv_file, sections=cv_sections))
+    assert to_json(cv) == to_json(CV(cv_file, sections=cv_sections))
+
+
+def test_cancelled_aload_stops(cv_file, cv_sections):
+    """
+    Cancelling CV.aload stops it, shutting its executor down without an
+    error.
+    """
+    async def cancel():
+        task = asyncio.ensure_future(CV.aload(cv_file, sections=cv_sections))
+        await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(cancel())
+
+
+def test_aload_reads_sheets_concurrently(cv_file, cv_sections, monkeypatch):
+    """
+    With the default engine, pandas, CV.aload reads several sheets at once.
+    """
+    lock = threading.Lock()
+    active = [0]
+    most = [0]
+    read_rows = PandasReader.read_rows
+
+    def counted_read_rows(self, sheet_name):
+        with lock:
+            active[0] += 1
+            most[0] = max(most[0], active[0])
+        try:
+            # Long enough for the other loads to start reading their sheets.
+            time.sleep(0.05)
+            return read_rows(self, sheet_name)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(PandasReader, "read_rows", counted_read_rows)
+    cv = asyncio.run(CV.aload(cv_file, sections=cv_sections))
+    assert most[0] > 1
+    assert to_json(cv) == to_json(CV(cv_file, sections=cv_sections))
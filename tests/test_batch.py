@@ -0,0 +1,55 @@
+"""
+Tests of the batch loading of CV files.
+"""
+import hashlib
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from cvprocessor import batch
+from cvprocessor.batch import expand_paths
+from cvprocessor.cv import CV
+
+
+def test_expand_paths_finds_every_engine(tmp_path):
+    """
+    A directory is searched for the workbooks of every reader engine.
+    """
+    (tmp_path / "sub" / "csv_cv").mkdir(parents=True)
+    for name in ("a.xlsx", "sub/b.json", "sub/c.ods", "sub/csv_cv/Publications.csv",
+                 "notes.txt"):
+        (tmp_path / name).touch()
+    assert expand_paths(tmp_path) == [str(tmp_path / name) for name in (
+        "a.xlsx", "sub/b.json", "sub/c.ods", "sub/csv_cv")]
+    assert expand_paths(tmp_path, "*.xlsx") == [str(tmp_path / "a.xlsx")]
+
+
+
+def load_or_block(path, **kwargs):
+    """
+    Load a CV, or block in C code for minutes on a path named stuck: the
+    key derivation never returns to the interpreter, so no signal handler
+    can run until it is done.
+    """
+    if os.path.basename(path).startswith("stuck"):
+        hashlib.pbkdf2_hmac("sha256", b"cv", b"salt", 10 ** 9)
+    return CV(path, **kwargs)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="the workers must inherit the patched loader")
+def test_stuck_file_is_killed(cv_file, cv_sections, monkeypatch):
+    """
+    A file whose load blocks in C code fails at its deadline without
+    stalling the batch: its worker is killed and replaced for the next file.
+    """
+    monkeypatch.setattr(batch, "CV", load_or_block)
+    start = time.monotonic()
+    results = list(batch.load_cvs(["stuck.xlsx", cv_file], workers=1, timeout=5,
+                                  sections=cv_sections))
+    assert time.monotonic() - start < 30
+    assert [result.path for result in results] == ["stuck.xlsx", cv_file]
+    assert results[0].error.startswith("TimeoutError")
+    assert results[1].is_ok(), results[1].error
@@ -0,0 +1,488 @@
+"""
+Tests of the indexes against brute-force scans of the same items.
+"""
+import datetime
+import itertools
+import random
+
+import pytest
+
+from cvprocessor.cv import CV
+from cvprocessor.index.index import BitmapIndex, IntervalIndex, SortedIndex
+from cvprocessor.reader.reader import isna, notna
+
+EPOCH = datetime.datetime(2000, 1, 1)
+
+DOCUMENT_TYPES = ("Journal Article", "Conference Paper", "Preprint", None)
+
+VENUES = ("IEEE Access", "arXiv", "Sensors", None)
+
+DATES = ("2019", "Mar 2018 - Jun 2020", "2021;2015", "2022;", "Nov 2019")
+
+KEYWORDS = ("Routing", "IoT", "machine learning", "Energy", "TSCH")
+
+
+def day(number):
+    """
+    Get the date number days after the epoch.
+    """
+    return EPOCH + datetime.timedelta(days=number)
+
+
+def random_intervals(seed, size):
+    """
+    Get size random (start, end, position) intervals on whole days: some
+    without a start, some open ended, several for some positions.
+    """
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(size):
+        start = rng.randrange(400)
+        end = None if rng.random() < 0.1 else start + rng.randrange(60)
+        if rng.random() < 0.05:
+            start = None
+        intervals.append((None if start is None else day(start),
+                          None if end is None else day(end),
+                          rng.randrange(max(1, size * 3 // 4))))
+    return intervals
+
+
+def as_closed(intervals):
+    """
+    Get the intervals with a start, the open ended ones ending at the end
+    of time.
+    """
+    return [(start, datetime.datetime.max if isna(end) else end, position)
+            for start, end, position in intervals if not isna(start)]
+
+
+def scan_overlap(intervals, start, end):
+    """
+    Get the positions of the intervals overlapping [start, end], newest
+    start first, ties in the order of the intervals, each position once.
+    """
+    found = sorted(((interval_start, -number, position) for number, (
+        interval_start, interval_end, position) in enumerate(as_closed(intervals))
+                    if interval_start <= end and interval_end >= start), reverse=True)
+    return list(dict.fromkeys(position for _, _, position in found))
+
+
+def scan_pairs(intervals):
+    """
+    Get the pairs of distinct positions with overlapping intervals.
+    """
+    return {tuple(sorted((first[2], second[2])))
+            for first, second in itertools.combinations(as_closed(intervals), 2)
+            if first[2] != second[2] and first[0] <= second[1] and second[0] <= first[1]}
+
+
+def is_covered(intervals, moment):
+    """
+    Check whether a moment is within any interval.
+    """
+    return any(start <= moment <= end for start, end, _ in as_closed(intervals))
+
+
+def check_intervals(intervals, moments):
+    """
+    Check the stabbing, overlap, gap and pair queries of an IntervalIndex
+    loaded with intervals against scans of the intervals.
+    """
+    index = IntervalIndex()
+    index.load(intervals)
+    assert len(index) == len(as_closed(intervals))
+    for moment in moments:
+        assert index.stab(moment) == scan_overlap(intervals, moment, moment)
+    for start, end in zip(moments, moments[1:]):
+        start, end = min(start, end), max(start, end)
+        assert index.overlap(start, end) == scan_overlap(intervals, start, end)
+    assert set(index.overlapping_pairs()) == scan_pairs(intervals)
+    assert len(index.overlapping_pairs()) == len(scan_pairs(intervals))
+    check_gaps(intervals)
+
+
+def check_gaps(intervals):
+    """
+    Check the gaps of an IntervalIndex loaded with intervals on whole days
+    against the days a scan of the intervals finds uncovered.
+    """
+    index = IntervalIndex()
+    index.load(intervals)
+    closed = as_closed(intervals)
+    if not closed:
+        assert not index.gaps()
+        return
+    first = min(start for start, _, _ in closed)
+    last = max(date for start, end, _ in closed for date in (start, end)
+               if date != datetime.datetime.max)
+    span = last - first
+    days = [first + datetime.timedelta(days=number, hours=12)
+            for number in range(-40, span.days + 40)]
+    for start, end in ((None, None), (first - datetime.timedelta(days=30), last + span),
+                       (first + span / 4, first + span / 2)):
+        check_window(intervals, index.gaps(start, end), start or first,
+                     end or max(interval[1] for interval in closed), days)
+
+
+def check_window(intervals, gaps, low, high, days):
+    """
+    Check the gaps found between low and high: every gap holds the middle
+    of the days it spans, and no other middle of a day is uncovered.
+    """
+    assert gaps == sorted(gaps)
+    for gap_start, gap_end in gaps:
+        assert low <= gap_start < gap_end <= high
+    for moment in days:
+        in_gap = any(gap_start < moment < gap_end for gap_start, gap_end in gaps)
+        if low <= moment <= high:
+            assert in_gap == (not is_covered(intervals, moment)), moment
+        else:
+            assert not in_gap
+
+
+@pytest.mark.parametrize("seed, size", [(0, 0), (1, 1), (2, 5), (3, 40), (4, 200)])
+def test_interval_index_matches_scan(seed, size):
+    """
+    The interval index gives the items a scan finds, on random intervals
+    with open ends, missing starts and items with several intervals.
+    """
+    rng = random.Random(seed)
+    moments = [day(rng.randrange(-20, 480)) for _ in range(30)] + [day(0), day(399)]
+    check_intervals(random_intervals(seed, size), moments)
+
+
+def test_interval_index_edges():
+    """
+    Intervals touching at a date overlap, an open-ended interval covers
+    every later date and has no gap after it, and an index without
+    intervals finds nothing.
+    """
+    intervals = [(day(0), day(10), 0), (day(10), day(20), 1), (day(30), None, 2),
+                 (None, day(5), 3)]
+    check_intervals(intervals, [day(number) for number in range(-5, 60, 5)])
+    index = IntervalIndex()
+    index.load(intervals)
+    assert index.stab(day(10)) == [1, 0]
+    assert index.stab(day(10000)) == [2]
+    assert index.gaps(day(-5), day(100)) == [(day(-5), day(0)), (day(20), day(30))]
+    index.load([])
+    assert (index.stab(day(0)), index.overlap(day(0), day(9)), index.gaps(),
+            index.overlapping_pairs()) == ([], [], [], [])
+
+
+def test_timeline_matches_scan(cv_file, cv_sections):
+    """
+    The timeline of the sample CV, whose grants and memberships run to
+    the time of loading, finds the items a scan of their dates finds.
+    """
+    cv = CV(cv_file, sections=cv_sections)
+    timeline = cv.timeline
+    intervals = [(date.get_start(), date.get_end(), position)
+                 for position, item in enumerate(timeline.items) for date in item.dates]
+    assert len(timeline.items) == sum(len(list(section)) for section in (
+        cv.professional.experience, cv.academic.education, cv.academic.grants_awards,
+        cv.professional.memberships))
+    moments = [day(number) for number in range(0, 10000, 90)]
+    check_intervals(intervals, moments)
+    for moment in moments:
+        assert timeline.active_on(moment) == [
+            timeline.items[i] for i in scan_overlap(intervals, moment, moment)]
+    assert {(id(first), id(second)) for first, second in timeline.overlapping_pairs()} == {
+        (id(timeline.items[i]), id(timeline.items[j])) for i, j in scan_pairs(intervals)}
+
+
+def test_timeline_without_sections(cv_file):
+    """
+    A CV without the dated sections has an empty timeline.
+    """
+    cv = CV(cv_file, sections=["intro"])
+    assert not cv.timeline.items
+    assert (cv.timeline.active_on(day(0)), cv.timeline.gaps(),
+            cv.timeline.overlapping_pairs()) == ([], [], [])
+
+
+def random_publications(sheets, seed, size):
+    """
+    Get the sheets with size random publications built from the first one:
+    missing types, venues and keywords, keywords in any case, several and
+    open-ended date ranges, and the authors of the sample CV.
+    """
+    rng = random.Random(seed)
+    first = sheets["Publications"][0]
+    sheets["Publications"] = [dict(
+        first, Title=f"Paper {number}", Dates=rng.choice(DATES),
+        Authors=",".join(str(author) for author in rng.sample(range(1, 14), rng.randrange(1, 4))),
+        Source=rng.choice(VENUES), **{
+            "Document Type": rng.choice(DOCUMENT_TYPES),
+            "Keywords": "; ".join(rng.choice((keyword, keyword.upper()))
+                                  for keyword in rng.sample(KEYWORDS, rng.randrange(4))) or None})
+                              for number in range(size)]
+    return sheets
+
+
+def load_publications(source, columnar, engine=None):
+    """
+    Load the publications of a CV.
+    """
+    return CV(source, engine=engine, sections=["authors", "publications"],
+              columnar=columnar).academic.publications
+
+
+def as_values(value):
+    """
+    Get the values of a criterion, a single value or a list of values.
+    """
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def scan_query(publications, criteria):
+    """
+    Get the publications matching the criteria, scanning them in order.
+    """
+    def matches(publication):
+        details = publication.details
+        start = details.dates.get_start()
+        year = start.year if notna(start) else None
+        year_range = criteria.get("year")
+        keywords = details.get_keywords()
+        keywords = ({keyword.strip().lower() for keyword in keywords.split(";")}
+                    if isinstance(keywords, str) else set())
+        return all((
+            "doc_type" not in criteria
+            or details.get_type() in as_values(criteria["doc_type"]),
+            "venue" not in criteria or details.venue.get_venue() in as_values(criteria["venue"]),
+            "author" not in criteria or bool(
+                {ids.get_author_id() for ids in publication.get_auth_id_aff_id()}
+                & set(as_values(criteria["author"]))),
+            "keyword" not in criteria or bool(
+                keywords & {keyword.lower() for keyword in as_values(criteria["keyword"])}),
+            "year" not in criteria or year is not None and (
+                year == year_range if not isinstance(year_range, tuple) else
+                (year_range[0] is None or year >= year_range[0])
+                and (year_range[1] is None or year <= year_range[1]))))
+    return [publication for publication in publications if matches(publication)]
+
+
+def get_criteria(publications, seed):
+    """
+    Get query criteria over the values of the publications: every single
+    value, lists, year ranges open on either side, unknown values and
+    random combinations.
+    """
+    values = {
+        "doc_type": {publication.details.get_type() for publication in publications},
+        "venue": {publication.details.venue.get_venue() for publication in publications},
+        "author": {ids.get_author_id() for publication in publications
+                   for ids in publication.get_auth_id_aff_id()},
+        "keyword": set(KEYWORDS) | {keyword.upper() for keyword in KEYWORDS},
+        "year": set(range(2014, 2026)),
+    }
+    values = {name: sorted((value for value in found if notna(value)), key=str)
+              for name, found in values.items()}
+    criteria = [{}, {"doc_type": "Unknown"}, {"author": 999}, {"year": 1990},
+                {"year": (2019, None)}, {"year": (None, 2019)}, {"year": (2016, 2021)},
+                {"year": (2021, 2016)}, {"keyword": ["routing", "TSCH"]}]
+    criteria += [{name: value} for name, found in values.items() for value in found]
+    rng = random.Random(seed)
+    for _ in range(50):
+        names = rng.sample(sorted(values), rng.randrange(1, 4))
+        criteria.append({name: rng.sample(values[name], min(len(values[name]), 2))
+                         if name != "year" and rng.random() < 0.3 else rng.choice(values[name])
+                         for name in names if values[name]})
+    return criteria
+
+
+def check_query(publications, seed=0):
+    """
+    Check Publications.query against a scan of the publications.
+    """
+    for criteria in get_criteria(publications, seed):
+        expected = scan_query(publications, criteria)
+        found = publications.query(**criteria)
+        assert [id(publication) for publication in found] == [
+            id(publication) for publication in expected], criteria
+
+
+@pytest.mark.parametrize("seed, size", [(0, 0), (1, 1), (2, 10), (3, 150)])
+def test_bitmap_index_matches_scan(seed, size):
+    """
+    The bitmaps of a BitmapIndex hold the positions a scan of the keys
+    finds, items without keys included.
+    """
+    rng = random.Random(seed)
+    values = [set(rng.sample(range(12), rng.randrange(4))) for _ in range(size)]
+    index = BitmapIndex()
+    index.load(values)
+    assert index.get_all() == (1 << size) - 1
+    assert set(index.get_keys()) == set().union(*values)
+    for key in range(14):
+        assert BitmapIndex.positions(index.get(key)) == [
+            position for position, keys in enumerate(values) if key in keys]
+    for keys in ([], [1, 2], [0, 13], list(range(12))):
+        assert BitmapIndex.positions(index.get_any(keys)) == [
+            position for position, found in enumerate(values) if found & set(keys)]
+    positions = sorted(rng.sample(range(size), size // 2))
+    assert BitmapIndex.positions(index.to_bitmap(positions)) == positions
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_query_matches_scan(cv_file, cv_sections, columnar):
+    """
+    Publications.query gives the publications of the sample CV a scan
+    finds, in list and columnar modes.
+    """
+    check_query(CV(cv_file, sections=cv_sections, columnar=columnar).academic.publications)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("seed, size", [(0, 0), (1, 1), (2, 60)])
+def test_query_matches_scan_on_random_publications(cv_sheets, to_document, columnar, seed,
+                                                   size):
+    """
+    Publications.query gives the random publications a scan finds, with
+    missing types, venues and keywords and open-ended dates.
+    """
+    document = to_document(random_publications(cv_sheets, seed, size))
+    check_query(load_publications(document, columnar, "json"), seed)
+
+
+def scan_dates(dates, low=None, high=None, strict=False):
+    """
+    Get the positions of the dates between low and high, inclusive but for
+    a strict high, newest first, ties in the order of the dates.
+    """
+    found = [(date, -position) for position, date in enumerate(dates) if notna(date)
+             and (low is None or date >= low)
+             and (high is None or (date < high if strict else date <= high))]
+    return [-position for _, position in sorted(found, reverse=True)]
+
+
+def check_dates(index, dates, bounds):
+    """
+    Check the between, latest and before queries of a SortedIndex loaded
+    with dates against scans of the dates.
+    """
+    assert len(index) == sum(notna(date) for date in dates)
+    for low in [None] + bounds:
+        for high in [None] + bounds:
+            assert index.between(low, high) == scan_dates(dates, low, high), (low, high)
+    for high in bounds:
+        assert index.before(high) == scan_dates(dates, high=high, strict=True), high
+    for num in range(len(dates) + 2):
+        assert index.latest(num) == scan_dates(dates)[:num], num
+
+
+@pytest.mark.parametrize("seed, size", [(0, 0), (1, 1), (2, 10), (3, 300)])
+def test_sorted_index_matches_scan(seed, size):
+    """
+    The sorted index gives the positions a scan of the dates finds, with
+    missing dates and dates shared by several items.
+    """
+    rng = random.Random(seed)
+    dates = [None if rng.random() < 0.1 else day(rng.randrange(60)) for _ in range(size)]
+    index = SortedIndex()
+    index.load(dates)
+    check_dates(index, dates, [day(number) for number in (-1, 0, 10, 30, 59, 60)])
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("seed, size", [(None, None), (0, 0), (2, 60)])
+def test_date_queries_match_scan(cv_sheets, to_document, columnar, seed, size):
+    """
+    The date queries of the publications, of the sample CV and of random
+    ones, and of the news give the items a scan of their dates finds.
+    """
+    if seed is not None:
+        cv_sheets = random_publications(cv_sheets, seed, size)
+    cv = CV(to_document(cv_sheets), engine="json", columnar=columnar,
+            sections=["authors", "publications", "news"])
+    bounds = [datetime.datetime(year, month, 1) for year in range(2013, 2027, 3)
+              for month in (1, 3, 11)]
+    for items, dates in (
+            (cv.academic.publications, [publication.details.dates.get_start()
+                                        for publication in cv.academic.publications]),
+            (cv.news, [news.get_timestamp() for news in cv.news.news])):
+        check_dates(items.date_index, dates, bounds)
+        listed = list(items)
+        assert [repr(item) for item in items.between(bounds[3], bounds[-3])] == [
+            repr(listed[position]) for position in scan_dates(dates, bounds[3], bounds[-3])]
+
+
+def get_joined_records(cv):
+    """
+    Get the records of the sections joined to the institutes, by section.
+    """
+    return {
+        "Education": list(cv.academic.education),
+        "Experience": list(cv.professional.experience),
+        "Teaching": [teaching.education for teaching in cv.academic.teaching],
+        "Supervision": [supervision.education for supervision in cv.academic.supervision],
+        "Grants_awards": list(cv.academic.grants_awards),
+        "Presentations": list(cv.professional.presentations),
+    }
+
+
+def scan_misses(cv, institute_ids):
+    """
+    Get the (section, record, institution id) of the records whose id is
+    not one of the institute ids, and the number of records whose id is.
+    """
+    misses = []
+    resolved = 0
+    for section, records in get_joined_records(cv).items():
+        for record in records:
+            institution_id = record.get_institution_id()
+            if isna(institution_id) or institution_id == "":
+                assert record.institute is None
+                continue
+            try:
+                found = int(institution_id) in institute_ids
+            except ValueError:
+                found = False
+            if found:
+                resolved += 1
+                assert record.institute.get_id() == int(institution_id)
+            else:
+                misses.append((section, record, institution_id))
+                assert record.institute is None
+    return misses, resolved
+
+
+@pytest.mark.parametrize("changes", [
+    {},
+    {("Education", 0): 99, ("Experience", 1): None, ("Teaching", 3): "x",
+     ("Supervision", 0): "2", ("Grants_awards", 8): 15},
+    {("Grants_awards", number): 100 + number for number in range(9)},
+])
+def test_institute_misses_match_scan(cv_sheets, cv_sections, to_document, changes):
+    """
+    The institute joins resolve the records a scan of the institute ids
+    finds and report the others, with unknown, missing and malformed ids.
+    """
+    for (sheet, number), institution_id in changes.items():
+        cv_sheets[sheet][number]["Institution id"] = institution_id
+    check_joins(CV(to_document(cv_sheets), engine="json", sections=cv_sections),
+                {row["id"] for row in cv_sheets["Institutes"]})
+
+
+def check_joins(cv, institute_ids):
+    """
+    Check the institute joins of a CV against a scan of its records.
+    """
+    misses, resolved = scan_misses(cv, institute_ids)
+    assert cv.institute_joins.resolved == resolved
+    assert [(section, id(record), institution_id)
+            for section, record, institution_id in cv.institute_joins.get_misses()] == [
+                (section, id(record), institution_id) for section, record, institution_id in misses]
+
+
+def test_institute_misses_without_institutes(cv_sheets, cv_sections, to_document):
+    """
+    Every id misses when the institutes sheet has no rows.
+    """
+    cv_sheets["Institutes"] = []
+    cv = CV(to_document(cv_sheets), engine="json", sections=cv_sections)
+    check_joins(cv, set())
+    assert cv.institute_joins.resolved == 0
+    assert len(cv.institute_joins.get_misses()) == sum(
+        len(records) for records in get_joined_records(cv).values())
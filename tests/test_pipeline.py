@@ -0,0 +1,116 @@
+"""
+Tests of the single-pass export pipeline.
+"""
+import collections
+import html
+import io
+import re
+
+from cvprocessor import pipeline
+from cvprocessor.cv import CV
+from cvprocessor.export import write_ndjson
+from cvprocessor.pipeline import (BibtexSink, ExportRecord, HtmlSink, NdjsonSink, TextSink,
+                                  export)
+from cvprocessor.reader.reader import isna
+
+TITLE = 'Routing <fast> & "safe": 100% of the_nodes'
+
+
+def with_publications(sheets, titles):
+    """
+    Get the sheets with every publication a copy of the first one, dated
+    March 2021, under each of the given titles.
+    """
+    first = sheets["Publications"][0]
+    sheets["Publications"] = [dict(first, Title=title, Dates="Mar 2021") for title in titles]
+    return sheets
+
+
+def run(cv, *sinks):
+    """
+    Export a CV to sinks writing to text buffers, and return the texts.
+    """
+    files = [io.StringIO() for _ in sinks]
+    export(cv, [sink(file) for sink, file in zip(sinks, files)])
+    return [file.getvalue() for file in files]
+
+
+def test_ndjson_matches_write_ndjson(cv_file, cv_sections):
+    """
+    The NDJSON sink writes the same lines as export.write_ndjson.
+    """
+    cv = CV(cv_file, sections=cv_sections)
+    expected = io.StringIO()
+    write_ndjson(cv, expected)
+    assert run(cv, NdjsonSink) == [expected.getvalue()]
+
+
+def test_bibtex_keys_are_unique_and_escaped(cv_sheets, cv_sections, to_document):
+    """
+    Publications with the same first author, year and first word get
+    suffixed keys, and the LaTeX special characters of the fields are
+    escaped.
+    """
+    cv = CV(to_document(with_publications(cv_sheets, ["Energy routing", "Energy nodes", TITLE])),
+            engine="json", sections=cv_sections)
+    [bibtex] = run(cv, BibtexSink)
+    assert sorted(re.findall(r"^@\w+\{(\w+),$", bibtex, re.MULTILINE)) == [
+        "JuradoLasso2021Energy", "JuradoLasso2021Energya", "JuradoLasso2021Routing"]
+    assert 'title = {Routing <fast> \\& "safe": 100\\% of the\\_nodes},' in bibtex
+
+
+def test_html_is_escaped(cv_sheets, cv_sections, to_document):
+    """
+    The HTML sink escapes the text of the records.
+    """
+    cv = CV(to_document(with_publications(cv_sheets, [TITLE])), engine="json",
+            sections=cv_sections)
+    [page] = run(cv, HtmlSink)
+    assert html.escape(TITLE) in page
+    assert "<fast>" not in page
+    assert "<a target" not in page
+
+
+def test_every_author_has_a_line(cv_file, cv_sections):
+    """
+    The authors with neither a preferred name nor an alias are written as
+    "Author <id>", without blank lines or empty list items.
+    """
+    cv = CV(cv_file, sections=cv_sections)
+    text, page = run(cv, TextSink, HtmlSink)
+    assert "  \n" not in text
+    assert "<li></li>" not in page
+    for author in cv.personal.authors:
+        personal = author.personal
+        if isna(personal.get_preferred_name()) and isna(personal.get_alias()):
+            assert f"  Author {author.get_id()}\n" in text
+
+
+def test_derived_values_are_computed_once(cv_file, cv_sections, monkeypatch):
+    """
+    Each value derived from a record is computed once, however many sinks
+    use it, and the author aliases once for the export.
+    """
+    computed = collections.Counter()
+    get = vars(ExportRecord)["_get"]
+
+    def counting_get(record, name, compute):
+        def counted():
+            computed[record, name] += 1
+            return compute()
+        return get(record, name, counted)
+
+    aliases = []
+    get_aliases = pipeline.Exporter.get_aliases
+
+    def counting_get_aliases(exporter):
+        aliases.append(get_aliases(exporter))
+        return aliases[-1]
+
+    monkeypatch.setattr(ExportRecord, "_get", counting_get)
+    monkeypatch.setattr(pipeline.Exporter, "get_aliases", counting_get_aliases)
+    cv = CV(cv_file, sections=cv_sections)
+    run(cv, NdjsonSink, BibtexSink, HtmlSink, TextSink, HtmlSink, TextSink)
+    assert computed and set(computed.values()) == {1}
+    assert {name for _, name in computed} >= {"data", "authors", "citation", "title", "dates"}
+    assert aliases and all(found is aliases[0] for found in aliases)
@@ -0,0 +1,114 @@
+"""
+Tests of the publications, in list and columnar modes.
+"""
+import io
+import json
+import re
+
+import pandas as pd
+
+from cvprocessor.cv import CV
+from cvprocessor.export import to_dict, write_json
+from cvprocessor.reader.reader import isna, unique
+
+# The ISO 8601 timestamps with microseconds: the ends of the open-ended
+# dates, the load time of each mode.
+NOW = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+")
+
+
+def load_modes(cv_file, cv_sections):
+    """
+    Load the sample CV in list and columnar modes.
+    """
+    return (CV(cv_file, sections=cv_sections),
+            CV(cv_file, sections=cv_sections, columnar=True))
+
+
+def test_columnar_accessors_match_list_mode(cv_file, cv_sections):
+    """
+    The columnar accessors return the same values and types as list mode.
+    """
+    listed, columnar = load_modes(cv_file, cv_sections)
+    listed, columnar = listed.academic.publications, columnar.academic.publications
+    for method in ("get_publications_count", "get_unique_sources", "get_types",
+                   "get_types_ordered", "get_publications_date_range"):
+        expected = getattr(listed, method)()
+        value = getattr(columnar, method)()
+        assert value == expected, method
+        assert type(value) is type(expected), method
+    low, high = columnar.get_publications_date_range()
+    assert type(low) is type(listed.get_publications_date_range()[0])
+    assert type(high) is type(listed.get_publications_date_range()[1])
+    for author_id in (1, 2, 3):
+        assert (columnar.get_num_publications_by_author(author_id)
+                == listed.get_num_publications_by_author(author_id))
+        assert (columnar.get_first_author_num_publications(author_id)
+                == listed.get_first_author_num_publications(author_id))
+
+
+def test_columnar_export_matches_list_mode(cv_file, cv_sections):
+    """
+    Both modes export the same data.
+    """
+    listed, columnar = load_modes(cv_file, cv_sections)
+    assert (NOW.sub("NOW", json.dumps(to_dict(columnar)))
+            == NOW.sub("NOW", json.dumps(to_dict(listed))))
+
+
+def test_columnar_views_are_stable(cv_file, cv_sections):
+    """
+    The views materialized again have the same dates, so that the streamed
+    export is the same as the whole one, and the raw rows are not kept.
+    """
+    columnar = CV(cv_file, sections=cv_sections, columnar=True)
+    file = io.StringIO()
+    write_json(columnar, file)
+    assert file.getvalue() == json.dumps(to_dict(columnar), ensure_ascii=False)
+    publications = columnar.academic.publications.publications
+    ends = [[date.get_end() for date in publication.details.dates]
+            for publication in publications]
+    assert ends == [[date.get_end() for date in publication.details.dates]
+                    for publication in publications]
+    assert not hasattr(columnar.academic.publications.columns, "rows")
+
+
+def test_empty_sheet_in_both_modes(cv_sheets, to_document):
+    """
+    A publications sheet without rows loads in both modes, with nothing
+    to query.
+    """
+    cv_sheets["Publications"] = []
+    for columnar in (False, True):
+        publications = CV(to_document(cv_sheets), engine="json",
+                          sections=["authors", "publications"],
+                          columnar=columnar).academic.publications
+        assert publications.get_publications_count() == 0
+        assert publications.get_types_ordered() == []
+        assert (publications.query(), publications.between(),
+                publications.latest(3)) == ([], [], [])
+
+
+def test_missing_types_are_those_of_unique(cv_sheets, tmp_path):
+    """
+    The missing document types are given once, as the first of them, the
+    same object as unique gives in list mode, so that it is found in the
+    types, with the pandas engine whose missing cells are distinct NaNs.
+    """
+    for number in (1, 4, 5):
+        cv_sheets["Publications"][number]["Document Type"] = None
+    path = tmp_path / "cv.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        for name, rows in cv_sheets.items():
+            pd.DataFrame(rows).to_excel(writer, sheet_name=name, index=False)
+    for columnar in (False, True):
+        publications = CV(str(path), sections=["authors", "publications"],
+                          columnar=columnar).academic.publications
+        types = [publication.details.type for publication in publications]
+        expected = unique(types)
+        ordered = publications.get_types_ordered()
+        assert len(ordered) == len(expected)
+        assert all(value is other or value == other for value, other in zip(ordered, expected))
+        missing = [value for value in types if isna(value)]
+        assert len(missing) == 3
+        assert missing[0] in ordered and missing[0] in publications.get_types()
+        assert len(publications.get_types()) == len(expected)
@@ -0,0 +1,122 @@
+"""
+Tests of the reader engines.
+"""
+import csv
+import datetime
+import json
+import zipfile
+
+import pandas as pd
+import pytest
+
+from cvprocessor.cv import CV
+from cvprocessor.reader.reader import isna, open_reader
+
+
+def read_sheets(source, engine):
+    """
+    Read every sheet of a workbook with an engine.
+    """
+    reader = open_reader(source, engine)
+    try:
+        return {name: reader.read_rows(name) for name in reader.get_sheet_names()}
+    finally:
+        reader.close()
+
+
+def to_cell(value):
+    """
+    Get a cell as the text formats write it: missing cells are None and the
+    dates ISO 8601 strings.
+    """
+    if isna(value):
+        return None
+    return value.isoformat() if isinstance(value, datetime.datetime) else value
+
+
+def to_json(sheets):
+    """
+    Write sheets as the JSON document of the json engine.
+    """
+    return json.dumps({name: [{column: to_cell(value) for column, value in row.items()}
+                              for row in rows]
+                       for name, rows in sheets.items()}).encode()
+
+
+def to_csv(sheets, directory):
+    """
+    Write sheets as the CSV files of the csv engine.
+    """
+    for name, rows in sheets.items():
+        with open(directory / f"{name}.csv", "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(list(rows[0]))
+            for row in rows:
+                writer.writerow(["" if to_cell(value) is None else to_cell(value)
+                                 for value in row.values()])
+    return str(directory)
+
+
+def test_engines_give_the_same_values(cv_file):
+    """
+    Every engine gives the same values for the cells, of the same types but
+    for the dates: pandas Timestamps (NaT when missing) with the pandas
+    engine, datetimes (None when missing) with the others.
+    """
+    expected = read_sheets(cv_file, "pandas")
+    for sheets in (read_sheets(cv_file, "xlsx"), read_sheets(to_json(expected), "json")):
+        assert list(sheets) == list(expected)
+        for name, rows in expected.items():
+            assert len(sheets[name]) == len(rows), name
+            for row, other in zip(rows, sheets[name]):
+                assert list(other) == list(row), name
+                for column, value in row.items():
+                    if isinstance(value, pd.Timestamp) or value is pd.NaT:
+                        assert {type(other[column])} <= {type(None), datetime.datetime}
+                    else:
+                        assert type(other[column]) is type(value), (name, column)
+                    assert isna(value) and isna(other[column]) or other[column] == value
+
+
+def get_dates(cv):
+    """
+    Get the dates of the loaded sections of a CV: the news timestamps, and
+    the starts and ends of the publications and the education.
+    """
+    dates = [news.get_timestamp() for news in cv.news.news]
+    for record in list(cv.academic.publications) + list(cv.academic.education):
+        for date in getattr(record, "details", record).dates:
+            dates += [date.start, date.end]
+    dates += cv.academic.publications.get_publications_date_range()
+    return dates
+
+
+def test_loaded_dates_follow_the_engine(cv_file, cv_sections, tmp_path):
+    """
+    The dates of the loaded sections are pandas Timestamps with the pandas
+    engine, as pandas.to_datetime gave them, and datetimes with the engines
+    which do not import pandas, in list and columnar modes.
+    """
+    sheets = read_sheets(cv_file, "pandas")
+    sources = {"pandas": cv_file, "xlsx": cv_file, "json": to_json(sheets),
+               "csv": to_csv(sheets, tmp_path)}
+    for engine, source in sources.items():
+        expected = pd.Timestamp if engine == "pandas" else datetime.datetime
+        for columnar in (False, True):
+            cv = CV(source, sections=cv_sections, engine=engine, columnar=columnar)
+            dates = [date for date in get_dates(cv) if date is not None]
+            assert dates
+            assert {type(date) for date in dates} == {expected}, (engine, columnar)
+
+
+def test_short_buffer_is_not_an_archive():
+    """
+    Content too short to be an xlsx archive is reported as a BadZipFile, as
+    the same file on disk would be.
+    """
+    reader = open_reader(b"PK\x03\x04", "xlsx")
+    try:
+        with pytest.raises(zipfile.BadZipFile):
+            reader.get_sheet_names()
+    finally:
+        reader.close()
@@ -0,0 +1,61 @@
+"""
+Tests of the shared numeric columns of CVs.
+"""
+import numpy as np
+import pytest
+
+from cvprocessor.cv import CV
+from cvprocessor.shared import attach_columns, publish_columns
+
+
+@pytest.fixture(name="shared")
+def shared_fixture(cv_file, cv_sections):
+    """
+    The sample CV, with columnar publications, published in shared memory.
+    """
+    shared_cv = publish_columns(CV(cv_file, columnar=True, sections=cv_sections))
+    yield shared_cv
+    shared_cv.unlink()
+
+
+def in_segment(array):
+    """
+    Check whether an array reads its data in place from a buffer, rather
+    than holding its own copy.
+    """
+    while isinstance(array, np.ndarray):
+        if array.flags.owndata:
+            return False
+        array = array.base
+    return isinstance(array, memoryview)
+
+
+def test_numeric_arrays_are_shared(shared):
+    """
+    The numeric and date arrays of an attached CV are read in place from
+    the segment; the object arrays of the cells are private copies.
+    """
+    with attach_columns(shared.get_name()) as attached:
+        publications = attached.get_cv().academic.publications
+        columns = publications.columns
+        for array in (columns.year, columns.start, columns.author_ids,
+                      columns.author_offsets, publications.date_index.keys):
+            assert in_segment(array)
+            assert not array.flags.writeable
+        assert not in_segment(columns.get_field("title"))
+        assert columns.start.dtype == shared.get_cv().academic.publications.columns.start.dtype
+
+
+def test_attached_cv_outlives_the_block(shared):
+    """
+    The CV of an attachment stays usable after it is closed.
+    """
+    expected = shared.get_cv().academic.publications
+    with attach_columns(shared.get_name()) as attached:
+        cv = attached.get_cv()
+    assert attached.get_cv() is None
+    publications = cv.academic.publications
+    assert publications.get_publications_date_range() == expected.get_publications_date_range()
+    assert publications.get_num_publications_by_author(1) == \
+        expected.get_num_publications_by_author(1)
+    attached.close()
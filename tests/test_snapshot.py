@@ -0,0 +1,55 @@
+"""
+Tests of the frozen snapshots.
+"""
+import pickle
+
+import pytest
+
+from cvprocessor.cache import CVCache
+from cvprocessor.snapshot import SnapshotStore, is_frozen
+
+
+def assert_read_only(publication):
+    """
+    Assigning to a publication, or to its details, raises.
+    """
+    assert is_frozen(publication)
+    assert is_frozen(publication.details)
+    with pytest.raises(TypeError):
+        publication.details = None
+    with pytest.raises(TypeError):
+        publication.details.title = "x"
+    with pytest.raises(TypeError):
+        publication.auth_id_aff_id.append(None)
+
+
+def test_snapshot_is_read_only(cv_file, cv_sections):
+    """
+    The sections and publications of a snapshot refuse changes.
+    """
+    cv = SnapshotStore(cv_file, sections=cv_sections).get_cv()
+    assert_read_only(cv.academic.publications.publications[0])
+    with pytest.raises(TypeError):
+        cv.academic.publications.publications.append(None)
+
+
+def test_columnar_snapshot_is_read_only(cv_file, cv_sections):
+    """
+    The publications materialized from the columns of a snapshot are frozen,
+    as are those of a copy of it.
+    """
+    cv = SnapshotStore(cv_file, columnar=True, sections=cv_sections).get_cv()
+    publications = cv.academic.publications.publications
+    for publication in (publications[0], publications[-1]):
+        assert_read_only(publication)
+    copy = pickle.loads(pickle.dumps(cv))
+    assert_read_only(copy.academic.publications.publications[0])
+
+
+def test_columnar_cache_is_read_only(cv_file, cv_sections):
+    """
+    The frozen CVs of a cache freeze their materialized publications too.
+    """
+    cvs = CVCache(frozen=True)
+    cv = cvs.get(cv_file, columnar=True, sections=cv_sections)
+    assert_read_only(cv.academic.publications.publications[0])
@@ -0,0 +1,69 @@
+"""
+Tests of the SQLite store.
+"""
+import json
+import re
+
+from cvprocessor.cv import CV
+from cvprocessor.export import to_dict
+from cvprocessor.reader.reader import isna, open_reader
+from cvprocessor.store import CVStore
+
+NOW = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+")
+
+
+def to_json(cv):
+    """
+    Get the JSON of a CV, with the open-ended dates, which end at the time
+    of loading, replaced.
+    """
+    return NOW.sub("NOW", json.dumps(to_dict(cv)))
+
+
+def to_document(cv_file, dates):
+    """
+    Get the title of the first publication of the sample CV and the CV as
+    a JSON document, with the dates of that publication replaced.
+    """
+    reader = open_reader(cv_file)
+    try:
+        sheets = {name: reader.read_rows(name) for name in reader.get_sheet_names()}
+    finally:
+        reader.close()
+    sheets["Publications"][0]["Dates"] = dates
+    document = json.dumps({name: [{column: None if isna(value) else value
+                                   for column, value in row.items()}
+                                  for row in rows]
+                           for name, rows in sheets.items()},
+                          default=lambda value: value.isoformat())
+    return sheets["Publications"][0]["Title"], document.encode()
+
+
+def test_add_sections(cv_file, cv_sections, tmp_path):
+    """
+    A workbook lacking a sheet is stored with its sections, and loaded back
+    with them.
+    """
+    with CVStore(str(tmp_path / "cvs.db")) as store:
+        cv = store.add(cv_file, sections=cv_sections)
+        assert store.get_names() == ["cv"]
+        assert list(store.get_cv("cv").sections) == list(cv.sections)
+        assert to_json(store.get_cv("cv")) == to_json(cv)
+
+
+def test_years_match_get_start(cv_file, cv_sections, tmp_path):
+    """
+    The stored years are those of the earliest start of each publication.
+    """
+    title, document = to_document(cv_file, "2019;2021")
+    cv = CV(document, engine="json", sections=cv_sections)
+    expected = [publication.details.dates.get_start().year
+                for publication in cv.academic.publications]
+    assert cv.academic.publications.get_publication_by_title(
+        title).details.dates.get_start().year == 2019
+    with CVStore(str(tmp_path / "cvs.db")) as store:
+        store.add(document, name="cv", engine="json", sections=cv_sections)
+        rows = store.execute("SELECT year FROM publications ORDER BY publication_id")
+        assert [row["year"] for row in rows] == expected
+        assert len(store.query_publications(year=(None, 2019))) == sum(
+            year <= 2019 for year in expected)